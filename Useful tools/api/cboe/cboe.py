@@ -64,7 +64,8 @@ class CboeApi(BaseExtractor):
             ticker (str): Stock ticker symbol (default: "AAPL")
             
         Returns:
-            pandas.DataFrame: Options data with parsed fields
+            pandas.DataFrame: Options data with parsed fields, and the underlying spot in
+                "current_price"
             
         Raises:
             Warning: If no data is returned for the ticker
@@ -81,6 +82,8 @@ class CboeApi(BaseExtractor):
         
         # Process option data
         df["ticker"] = ticker
+        # Spot of the underlying at the snapshot, the same for every row
+        df["current_price"] = response["data"].get("current_price")
         df["time"] = extract_time.strftime(format="%Y-%m-%d %H:%M:%S")
         df.rename(columns={"iv": "implied_vol", "option": "option_name", "theo": "theo_price"}, inplace=True)
         
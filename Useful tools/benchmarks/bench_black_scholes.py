@@ -0,0 +1,84 @@
+"""
+Benchmarks for the Black-Scholes template.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_black_scholes
+"""
+import timeit
+import numpy as np
+from templates.black_scholes import BlackScholes
+
+
+def make_chain(n_contracts, seed=0):
+    """
+    Build a random option chain.
+
+    Args:
+        n_contracts (int): Number of contracts
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: Keyword arguments for BlackScholes plus 'option_type' and 'option_position' flags
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'S0': np.full(n_contracts, 100.0),
+        'K': rng.uniform(50, 150, n_contracts),
+        'r': np.full(n_contracts, 0.05),
+        'sigma': rng.uniform(0.05, 0.8, n_contracts),
+        'T': rng.uniform(1 / 365, 2, n_contracts),
+        'option_type': rng.integers(0, 2, n_contracts),
+        'option_position': rng.integers(0, 2, n_contracts),
+    }
+
+
+def per_method_greeks(bs, option_type, option_position):
+    """Price and Greeks through the individual methods, one call per output."""
+    return {
+        'price': bs.price(option_type, option_position),
+        'delta': bs.delta(option_type, option_position),
+        'gamma': bs.gamma(option_position),
+        'theta': bs.theta(option_type, option_position),
+        'vega': bs.vega(option_position),
+        'rho': bs.rho(option_type, option_position),
+        'charm': bs.charm(option_type, option_position),
+        'vanna': bs.vanna(option_position),
+        'volga': bs.volga(option_position),
+        'veta': bs.veta(option_position),
+    }
+
+
+def bench(func, repeat=5, number=None):
+    """Return the best time per call of func in seconds."""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_fused_greeks_benchmark(sizes=(1, 100, 5_000, 100_000)):
+    """
+    Compare the fused price_and_greeks kernel with the per-method path.
+
+    Args:
+        sizes (tuple): Chain sizes to benchmark
+    """
+    print(f"{'contracts':>10} {'per-method (ms)':>16} {'fused (ms)':>11} {'speedup':>8}")
+    for n_contracts in sizes:
+        chain = make_chain(n_contracts)
+        option_type = chain.pop('option_type')
+        option_position = chain.pop('option_position')
+        bs = BlackScholes(**chain)
+
+        # Both paths must agree before their timings are compared
+        fused = bs.price_and_greeks(option_type, option_position)
+        for name, value in per_method_greeks(bs, option_type, option_position).items():
+            np.testing.assert_allclose(fused[name], value, rtol=1e-10, atol=1e-12)
+
+        t_methods = bench(lambda: per_method_greeks(bs, option_type, option_position))
+        t_fused = bench(lambda: bs.price_and_greeks(option_type, option_position))
+        print(f"{n_contracts:>10} {t_methods * 1e3:>16.3f} {t_fused * 1e3:>11.3f} {t_methods / t_fused:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run_fused_greeks_benchmark()
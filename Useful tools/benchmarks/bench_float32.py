@@ -0,0 +1,86 @@
+"""
+Validation and benchmark of the float32 pricing mode against float64.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_float32
+"""
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from benchmarks.bench_scenario import make_grid, make_portfolio
+from templates.asain_option_monthly_avg import simulate_prices
+from templates.black_scholes import FLOAT32_TOLERANCES, BlackScholes
+from templates.pricing_kernels import window_average
+from templates.scenario import run_scenarios
+
+
+def check_float32_tolerances(n_contracts=1_000_000, seed=0):
+    """
+    Assert the documented FLOAT32_TOLERANCES on random contracts, expired ones included.
+
+    Inputs are rounded to float32 first so only the error of the computation is measured.
+
+    Args:
+        n_contracts (int): Number of contracts
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: Output name -> observed error in units of its tolerance scale
+    """
+    rng = np.random.default_rng(seed)
+    S0, K, sigma, T = (rng.uniform(low, high, n_contracts).astype(np.float32).astype(np.float64)
+                       for low, high in ((50, 150), (50, 150), (0.05, 0.8), (-0.01, 2.0)))
+    r = np.float64(np.float32(0.03))
+    option_type = rng.integers(0, 2, n_contracts)
+    option_position = rng.integers(0, 2, n_contracts)
+
+    exact = BlackScholes(S0, K, r, sigma, T).price_and_greeks(option_type, option_position)
+    single = BlackScholes(S0, K, r, sigma, T, dtype=np.float32).price_and_greeks(option_type, option_position)
+
+    errors = {}
+    for name, reference in exact.items():
+        assert single[name].dtype == np.float32, name
+        error = np.abs(single[name] - reference)
+        if name == 'price':
+            errors[name] = np.max(error / S0)
+            assert errors[name] < FLOAT32_TOLERANCES['price'], (name, errors[name])
+        else:
+            errors[name] = np.max(error) / np.max(np.abs(reference))
+            assert errors[name] < FLOAT32_TOLERANCES['greeks'], (name, errors[name])
+    return errors
+
+
+def run_float32_benchmark(n_contracts=10_000, n_paths=200_000, n_steps=252):
+    """
+    Compare time, memory and accuracy of float32 and float64 on a scenario run and a path set.
+
+    Args:
+        n_contracts (int): Contracts of the scenario portfolio
+        n_paths (int): Number of simulated paths
+        n_steps (int): Observations per path
+    """
+    for name, error in check_float32_tolerances().items():
+        print(f"{name:>6}: float32 error {error:.1e} (tolerance "
+              f"{FLOAT32_TOLERANCES['price' if name == 'price' else 'greeks']:.0e})")
+
+    portfolio = make_portfolio(n_contracts)
+    grid = make_grid()
+    results = {}
+    for dtype in (np.float64, np.float32):
+        elapsed = bench(lambda: run_scenarios(portfolio, grid, dtype=dtype), repeat=1, number=1)
+        results[dtype] = run_scenarios(portfolio, grid, dtype=dtype)
+        print(f"scenarios {np.dtype(dtype).name}: {elapsed:.2f} s")
+    pnl_error = np.max(np.abs(results[np.float32].pnl - results[np.float64].pnl))
+    print(f"max |P&L difference|: {pnl_error:.2e} (P&L range {np.ptp(results[np.float64].pnl):.0f})")
+
+    averages = {}
+    for dtype in (np.float64, np.float32):
+        np.random.seed(0)
+        paths = simulate_prices(100, n_steps, volatility=1, n_paths=n_paths, dtype=dtype)
+        elapsed = bench(lambda: window_average(paths, n_steps), repeat=3)
+        averages[dtype] = window_average(paths, n_steps)
+        print(f"paths {np.dtype(dtype).name}: {paths.nbytes / 1e6:.0f} MB, arithmetic average {elapsed * 1e3:.1f} ms")
+    print(f"max relative average difference: {np.max(np.abs(averages[np.float32] / averages[np.float64] - 1)):.1e}")
+
+
+if __name__ == '__main__':
+    run_float32_benchmark()
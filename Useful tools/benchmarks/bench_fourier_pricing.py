@@ -0,0 +1,48 @@
+"""
+Fourier pricers (COS and Carr-Madan FFT) against the closed-form Black-Scholes and the Lewis
+Heston prices: accuracy, truncation-error reports and the time to price a full chain.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_fourier_pricing
+"""
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from benchmarks.bench_heston_calibration import TRUE_PARAMS, make_book
+from templates.black_scholes import BlackScholes
+from templates.fourier_pricing import carr_madan, cos_method, fourier_price
+from templates.heston import HestonModel
+
+
+def run_fourier_benchmark(S0=100.0, r=0.03, sigma=0.2, strikes=np.linspace(50, 200, 61)):
+    """
+    Args:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        sigma (float): Volatility of the Black-Scholes checks
+        strikes (numpy.ndarray): Strikes of the accuracy checks
+    """
+    heston = HestonModel(S0, r, **TRUE_PARAMS)
+    for T in (0.04, 0.25, 1.0, 5.0):
+        black_scholes = BlackScholes(S0, strikes, r, sigma, T)
+        for name, model, exact in (('Black-Scholes', black_scholes, black_scholes.price('call')),
+                                   ('Heston', heston, heston.call_price(strikes, T, n_nodes=1024))):
+            cos, fft = cos_method(model, T, strikes), carr_madan(model, T)
+            print(f"T={T:<5} {name:<14} COS error {np.abs(cos.calls - exact).max():.1e} "
+                  f"(estimated {sum(cos.errors.values()):.1e}), Carr-Madan error "
+                  f"{np.abs(fft.call(strikes) - exact).max():.1e} (estimated {sum(fft.errors.values()):.1e})")
+    print(cos_method(heston, 1.0, strikes).report())
+    print(carr_madan(heston, 1.0).report())
+
+    book = make_book(S0, r)
+    K, T, option_type = book.strike, book.time_to_maturity(book.as_of), book.option_type
+    print(f"\n{K.size} quotes on {np.unique(T).size} expiries:")
+    lewis = heston.price(K, T, option_type)
+    for name, price in (('Lewis', lambda: heston.price(K, T, option_type)),
+                        ('COS', lambda: fourier_price(heston, K, T, option_type)),
+                        ('Carr-Madan', lambda: fourier_price(heston, K, T, option_type, method='carr-madan'))):
+        print(f"{name:<11} {bench(price, repeat=3) * 1e3:6.1f} ms, max difference to Lewis "
+              f"{np.abs(price() - lewis).max():.1e}")
+
+
+if __name__ == '__main__':
+    run_fourier_benchmark()
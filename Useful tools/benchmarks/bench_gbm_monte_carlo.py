@@ -0,0 +1,74 @@
+"""
+GBM Monte Carlo engine: checks against the closed-form European and discrete geometric Asian
+calls, then a book of the Asian templates priced on the same paths.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_gbm_monte_carlo
+"""
+import time
+import numpy as np
+from templates.asain_option_monthly_avg import MonthlyAveragePayoff
+from templates.asian_option_avg_return import AsianOptionAverageReturn
+from templates.asian_option_fix_average import AsianOptionPayoff
+from templates.asian_option_fixed_strike import OptionAsianFixedStrike
+from templates.asian_option_floating_strike import OptionAsianFloatingStrike
+from templates.black_scholes import BlackScholes
+from templates.gbm_monte_carlo import GBMMonteCarlo
+from templates.normal_distribution import norm_cdf
+
+
+def geometric_asian_call(S0, r, sigma, T, n_steps, strike):
+    """Closed-form call on the geometric average of the n_steps fixings after S0."""
+    t = T / n_steps * np.arange(1, n_steps + 1)
+    mean = np.log(S0) + (r - 0.5 * sigma * sigma) * t.mean()
+    variance = sigma * sigma * np.minimum.outer(t, t).mean()
+    d1 = (mean - np.log(strike) + variance) / np.sqrt(variance)
+    d2 = d1 - np.sqrt(variance)
+    return np.exp(-r * T) * (np.exp(mean + 0.5 * variance) * norm_cdf(d1) - strike * norm_cdf(d2))
+
+
+def run_gbm_monte_carlo_benchmark(n_paths=1_000_000, n_steps=252, S0=100.0, r=0.05, sigma=0.2, strike=100.0):
+    """
+    Args:
+        n_paths (int): Number of paths
+        n_steps (int): Daily steps over one year
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        sigma (float): Volatility
+        strike (float): Strike of the fixed-strike options
+    """
+    engine = GBMMonteCarlo(S0, r, sigma, 1.0, n_steps, seed=2024)
+    print(f"{n_paths} paths x {n_steps} steps")
+
+    def returns(paths):
+        return paths[:, 1:] / paths[:, :-1] - 1
+
+    book = {
+        "European call": lambda paths: np.maximum(paths[:, -1] - strike, 0),
+        "Geometric Asian call": lambda paths: OptionAsianFixedStrike(paths[:, 1:], strike, window=n_steps,
+                                                                     avg_type='geometric').payoff(),
+        "Fixed strike, 21-day arithmetic": lambda paths: OptionAsianFixedStrike(paths, strike, window=21).payoff(),
+        "Floating strike, 63-day median": lambda paths: OptionAsianFloatingStrike(paths, window=63,
+                                                                                  avg_type='median').payoff(),
+        "Floating strike, last 6 months": lambda paths: AsianOptionPayoff(paths, n_steps // 2,
+                                                                          n_steps).compute_payoff(),
+        "Monthly average": lambda paths: MonthlyAveragePayoff(paths, days_per_month=21).compute_payoff(),
+        "Average return": lambda paths: AsianOptionAverageReturn(returns(paths), averaging_days=21, strike_start=0,
+                                                                 strike_end=21).compute_payoff(),
+    }
+    start = time.perf_counter()
+    results = engine.price_book(book, n_paths)
+    print(f"book of {len(book)} payoffs on the same paths: {time.perf_counter() - start:.1f} s")
+    for name, result in results.items():
+        low, high = result.confidence_interval
+        print(f"{name:<34} {result.price:10.5f} +/- {result.stderr:.5f}  95% CI [{low:.5f}, {high:.5f}]")
+
+    exact = {"European call": BlackScholes(S0, strike, r, sigma, 1.0).price('call'),
+             "Geometric Asian call": geometric_asian_call(S0, r, sigma, 1.0, n_steps, strike)}
+    for name, value in exact.items():
+        result = results[name]
+        print(f"{name}: closed form {value:.5f}, {(result.price - value) / result.stderr:+.1f} std errors")
+
+
+if __name__ == '__main__':
+    run_gbm_monte_carlo_benchmark()
@@ -0,0 +1,43 @@
+"""
+Accuracy and timing of the semi-analytic Heston pricer.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_heston
+"""
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from templates.black_scholes import BlackScholes
+from templates.heston import HestonModel
+
+# Albrecher et al. (2007) test case: S0=100, K=100, T=1, r=0
+REFERENCE_PARAMS = dict(S0=100, r=0.0, kappa=1.5768, theta=0.0398, xi=0.5751, rho=-0.5711, v0=0.0175)
+REFERENCE_CALL = 5.785155434
+
+
+def run_heston_benchmark(n_strikes=200, n_expiries=10):
+    """
+    Check the pricer against a reference value and the Black-Scholes limit, then time a grid.
+
+    Args:
+        n_strikes (int): Strikes of the grid
+        n_expiries (int): Expiries of the grid
+    """
+    error = HestonModel(**REFERENCE_PARAMS).price(100, 1, 'call') - REFERENCE_CALL
+    print(f"reference call error: {error:.1e}")
+
+    K = np.linspace(50, 200, n_strikes)[np.newaxis, :]
+    T = np.linspace(1 / 52, 5, n_expiries)[:, np.newaxis]
+    # With a vanishing vol of vol and v0 = theta the variance is constant: Black-Scholes
+    heston = HestonModel(100, 0.03, 2.0, 0.04, 1e-6, -0.5, 0.04).price(K, T, 'put')
+    limit = BlackScholes(100, K, 0.03, 0.2, T).price('put')
+    print(f"max |Heston - Black-Scholes| for xi -> 0: {np.max(np.abs(heston - limit)):.1e}")
+
+    model = HestonModel(100, 0.03, 1.5, 0.04, 0.5, -0.7, 0.04)
+    converged = model.price(K, T, 'call', n_nodes=1024)
+    print(f"max |default nodes - 1024 nodes|: {np.max(np.abs(model.price(K, T, 'call') - converged)):.1e}")
+    elapsed = bench(lambda: model.price(K, T, 'call'), repeat=5)
+    print(f"{n_strikes} strikes x {n_expiries} expiries: {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    run_heston_benchmark()
@@ -0,0 +1,71 @@
+"""
+Heston calibration on synthetic chain snapshots: cold start, warm start and multi-start pool.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_heston_calibration
+"""
+import numpy as np
+from templates.heston import HestonModel
+from templates.heston_calibration import HestonCalibrator, calibrate_heston, calibration_inputs
+from templates.implied_volatility import implied_volatility
+from templates.option_book import OptionBook
+
+TRUE_PARAMS = {'kappa': 1.8, 'theta': 0.05, 'xi': 0.7, 'rho': -0.65, 'v0': 0.03}
+AS_OF = np.datetime64('2026-01-02T16:00:00')
+
+
+def make_book(S0=100.0, r=0.03, params=TRUE_PARAMS, as_of=AS_OF, days=(14, 30, 60, 91, 120, 182, 273, 365, 548, 730),
+              strikes=np.arange(50, 151, 2.5), noise=0.0, seed=0):
+    """
+    Chain snapshot priced with the Heston model, calls and puts on every strike and expiry.
+
+    Args:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        params (dict): Heston parameters
+        as_of (numpy.datetime64): Snapshot time
+        days (tuple): Days to expiry
+        strikes (numpy.ndarray): Strikes
+        noise (float): Relative price noise
+        seed (int): Seed of the noise
+
+    Returns:
+        OptionBook: Single-underlying book ("SYN") with mid prices and implied volatilities
+    """
+    expiry = np.datetime64(as_of, 'D') + np.repeat(np.array(days), 2 * strikes.size)
+    K = np.tile(np.repeat(strikes, 2), len(days))
+    option_type = np.tile([0, 1], K.size // 2)
+    T = (expiry.astype('datetime64[s]') - as_of) / np.timedelta64(365 * 86400, 's')
+    price = HestonModel(S0, r, **params).price(K, T, option_type)
+    price *= 1 + noise * np.random.default_rng(seed).standard_normal(price.size)
+    sigma = implied_volatility(price, S0 * np.exp(r * T), K, T, option_type, r).sigma
+    return OptionBook(['SYN'], np.zeros(K.size), expiry, option_type, K, price, price, price, sigma, as_of=as_of)
+
+
+def run_calibration_benchmark(S0=100.0, r=0.03, n_workers=4):
+    """
+    Calibrate a cold snapshot, then warm-start the next ones, printing time, iterations and RMSE.
+
+    Args:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        n_workers (int): Processes of the multi-start pool
+    """
+    book = make_book(S0, r, noise=0.002)
+    inputs = calibration_inputs(book, S0, r)
+    print(f"{len(inputs['K'])} out-of-the-money quotes")
+    print(f"{'cold, 1 start:':<22}", calibrate_heston(S0, r, **inputs, n_starts=1))
+
+    with HestonCalibrator(n_workers=n_workers) as calibrator:
+        print(f"{f'cold, {calibrator.n_starts} starts pool:':<22}", calibrator.calibrate(book, 'SYN', S0, r))
+        # Next snapshots: the market drifts a little, the previous fit warm-starts the next one
+        params = dict(TRUE_PARAMS)
+        for step in range(1, 4):
+            params['v0'] *= 1.02
+            params['rho'] -= 0.005
+            snapshot = make_book(S0, r, params, AS_OF + np.timedelta64(5 * step, 'm'), noise=0.002, seed=step)
+            print(f"{f'warm, +{5 * step} min:':<22}", calibrator.calibrate(snapshot, 'SYN', S0, r))
+
+
+if __name__ == '__main__':
+    run_calibration_benchmark()
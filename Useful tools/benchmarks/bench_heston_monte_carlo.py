@@ -0,0 +1,48 @@
+"""
+Heston QE Monte Carlo: check against the semi-analytic price, then price Asian payoffs.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_heston_monte_carlo
+"""
+import time
+import numpy as np
+from templates.asian_option_fix_average import AsianOptionPayoff
+from templates.asian_option_fixed_strike import OptionAsianFixedStrike
+from templates.heston import HestonModel
+from templates.heston_monte_carlo import HestonMonteCarlo
+from templates.pricing_kernels import get_backend
+
+
+def run_heston_monte_carlo_benchmark(n_paths=1_000_000, n_steps=252, strike=100.0):
+    """
+    Price a European call, a fixed-strike and a floating-strike Asian option on QE paths.
+
+    Args:
+        n_paths (int): Number of paths
+        n_steps (int): Daily steps over one year
+        strike (float): Strike of the European and fixed-strike options
+    """
+    model = HestonModel(100, 0.03, kappa=1.5, theta=0.04, xi=0.8, rho=-0.7, v0=0.04)
+    simulator = HestonMonteCarlo(model, T=1.0, n_steps=n_steps, seed=2024)
+    print(f"backend: {get_backend()}, {n_paths} paths x {n_steps} steps")
+
+    start = time.perf_counter()
+    result = simulator.price(lambda paths: np.maximum(paths[:, -1] - strike, 0), n_paths, observe=[n_steps])
+    exact = model.price(strike, 1.0, 'call')
+    print(f"European call: {result.price:.4f} +/- {result.stderr:.4f} (semi-analytic {exact:.4f}, "
+          f"{(result.price - exact) / result.stderr:+.1f} std errors), {time.perf_counter() - start:.1f} s")
+
+    payoffs = {
+        "Asian fixed strike, 21-day arithmetic": lambda paths: OptionAsianFixedStrike(paths, strike, window=21).payoff(),
+        "Asian floating strike, last 6 months": lambda paths: AsianOptionPayoff(paths, n_steps // 2, n_steps).compute_payoff(),
+    }
+    for name, payoff in payoffs.items():
+        start = time.perf_counter()
+        result = simulator.price(payoff, n_paths, dtype=np.float32)
+        low, high = result.confidence_interval
+        print(f"{name}: {result.price:.4f} +/- {result.stderr:.4f}, 95% CI [{low:.4f}, {high:.4f}], "
+              f"{time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    run_heston_monte_carlo_benchmark()
@@ -0,0 +1,142 @@
+"""
+Benchmarks for the chain implied-volatility solver.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_implied_volatility
+"""
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from templates.black_scholes import BlackScholes
+from templates.implied_volatility import METHODS, TIME_VALUE_LOST, implied_volatility
+from templates.rational_implied_volatility import normalized_black_call
+
+
+def make_priced_chain(n_contracts, spot=100.0, rate=0.03, seed=0):
+    """
+    Build a random option chain priced with Black-Scholes.
+
+    Args:
+        n_contracts (int): Number of contracts
+        spot (float): Spot price
+        rate (float): Risk-free interest rate
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: 'price', 'forward', 'strike', 'maturity', 'option_type', 'rate' and the true 'sigma'
+    """
+    rng = np.random.default_rng(seed)
+    strike = spot * np.exp(rng.uniform(-1.0, 1.0, n_contracts))
+    maturity = rng.choice([1 / 365, 7 / 365, 30 / 365, 0.25, 0.5, 1.0, 2.0], n_contracts)
+    sigma = rng.uniform(0.05, 1.0, n_contracts)
+    option_type = rng.integers(0, 2, n_contracts)
+    return {
+        'price': BlackScholes(spot, strike, rate, sigma, maturity).price(option_type),
+        'forward': spot * np.exp(rate * maturity),
+        'strike': strike,
+        'maturity': maturity,
+        'option_type': option_type,
+        'rate': rate,
+        'sigma': sigma,
+    }
+
+
+def run_chain_benchmark(sizes=(100, 10_000, 100_000)):
+    """
+    Time the solver on whole chains and report convergence and accuracy.
+
+    Args:
+        sizes (tuple): Chain sizes to benchmark
+    """
+    print(f"{'contracts':>10} {'time (ms)':>10} {'converged':>10} {'max iter':>9} {'max |dsigma|':>13}")
+    for n_contracts in sizes:
+        chain = make_priced_chain(n_contracts)
+        sigma = chain.pop('sigma')
+        result = implied_volatility(**chain)
+        elapsed = bench(lambda: implied_volatility(**chain), repeat=3)
+
+        # Deep in-the-money prices lose their time value to rounding, only compare the others
+        intrinsic = np.maximum(np.where(chain['option_type'] == 0, 1, -1) *
+                               (chain['forward'] - chain['strike']) * np.exp(-chain['rate'] * chain['maturity']), 0)
+        reliable = result.converged & (chain['price'] - intrinsic > 1e-6)
+        error = np.max(np.abs(result.sigma[reliable] - sigma[reliable]))
+        print(f"{n_contracts:>10} {elapsed * 1e3:>10.2f} {result.converged.mean():>10.2%} "
+              f"{result.iterations.max():>9} {error:>13.1e}")
+
+
+def make_scenario(name, n_contracts, seed=0):
+    """
+    Build contracts of one moneyness/maturity regime with prices from the accurate normalized Black formula.
+
+    Args:
+        name (str): 'at the money', 'deep out of the money', 'deep in the money' or 'short dated'
+        n_contracts (int): Number of contracts
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: Keyword arguments for implied_volatility plus the true 'sigma'
+    """
+    rng = np.random.default_rng(seed)
+    forward = 100.0
+    if name == 'at the money':
+        log_moneyness = rng.uniform(-0.05, 0.05, n_contracts)
+        maturity = rng.uniform(0.25, 2.0, n_contracts)
+    elif name == 'deep out of the money':
+        log_moneyness = rng.choice([-1.0, 1.0], n_contracts) * rng.uniform(1.0, 3.0, n_contracts)
+        maturity = rng.uniform(0.1, 1.0, n_contracts)
+    elif name == 'deep in the money':
+        log_moneyness = rng.choice([-1.0, 1.0], n_contracts) * rng.uniform(0.5, 1.5, n_contracts)
+        maturity = rng.uniform(0.1, 1.0, n_contracts)
+        # A quarter expires within days: their time value drowns in the rounding of the premium
+        short_dated = rng.random(n_contracts) < 0.25
+        maturity[short_dated] = rng.uniform(1 / 365, 3 / 365, short_dated.sum())
+    else:
+        log_moneyness = rng.uniform(-0.1, 0.1, n_contracts)
+        maturity = rng.uniform(1 / 365, 3 / 365, n_contracts)
+    sigma = rng.uniform(0.1, 0.6, n_contracts)
+    strike = forward * np.exp(-log_moneyness)
+
+    # Calls are out of the money for log(F/K) < 0
+    out_of_the_money_type = np.where(log_moneyness < 0, 0, 1)
+    option_type = 1 - out_of_the_money_type if name == 'deep in the money' else out_of_the_money_type
+    x = -np.abs(log_moneyness)
+    _, _, b, _, _ = normalized_black_call(x, sigma * np.sqrt(maturity))
+    intrinsic = np.maximum(np.where(option_type == 0, 1, -1) * (forward - strike), 0.0)
+    return {
+        'price': intrinsic + np.sqrt(forward * strike) * b,
+        'forward': forward,
+        'strike': strike,
+        'maturity': maturity,
+        'option_type': option_type,
+        'sigma': sigma,
+    }
+
+
+def run_method_comparison(n_contracts=10_000):
+    """
+    Compare the Newton and rational solvers on difficult regimes.
+
+    Args:
+        n_contracts (int): Number of contracts per regime
+    """
+    print(f"{'regime':>22} {'method':>9} {'time (ms)':>10} {'mean iter':>10} {'max iter':>9} {'max rel err':>12} "
+          f"{'lost':>6}")
+    for name in ('at the money', 'deep out of the money', 'deep in the money', 'short dated'):
+        chain = make_scenario(name, n_contracts)
+        sigma = chain.pop('sigma')
+        # Accuracy is only meaningful where the time value survives the rounding of the premium
+        intrinsic = np.maximum(np.where(chain['option_type'] == 0, 1, -1) * (chain['forward'] - chain['strike']), 0)
+        well_posed = chain['price'] - intrinsic > 1e-8 * chain['price']
+        for method in METHODS:
+            result = implied_volatility(**chain, method=method)
+            elapsed = bench(lambda: implied_volatility(**chain, method=method), repeat=3)
+            compared = result.converged & well_posed
+            error = np.max(np.abs(result.sigma[compared] / sigma[compared] - 1))
+            # Contracts whose time value is rounding noise are flagged instead of solved
+            lost = np.sum(result.status == TIME_VALUE_LOST)
+            print(f"{name:>22} {method:>9} {elapsed * 1e3:>10.2f} {result.iterations.mean():>10.2f} "
+                  f"{result.iterations.max():>9} {error:>12.1e} {lost:>6}")
+
+
+if __name__ == '__main__':
+    run_chain_benchmark()
+    run_method_comparison()
@@ -0,0 +1,49 @@
+"""
+Dupire local volatility surface: build time, cached reuse, lookup speed, and a check that
+Monte Carlo under the local vol reprices the chain it was built from.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_local_volatility
+"""
+import time
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from benchmarks.bench_heston_calibration import TRUE_PARAMS, make_book
+from templates.heston import HestonModel
+from templates.local_volatility import LocalVolatilitySurface
+
+
+def run_local_volatility_benchmark(S0=100.0, r=0.03, n_lookups=1_000_000, n_paths=100_000, n_steps=200):
+    """
+    Args:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        n_lookups (int): Random (S, t) points queried at once
+        n_paths (int): Paths of the local-vol Monte Carlo check
+        n_steps (int): Time steps over one year
+    """
+    book = make_book(S0, r)
+    start = time.perf_counter()
+    surface = LocalVolatilitySurface.from_book(book, S0, r)
+    print(f"build: {(time.perf_counter() - start) * 1e3:.1f} ms, "
+          f"cached: {bench(lambda: LocalVolatilitySurface.from_book(book, S0, r)) * 1e6:.1f} us")
+
+    rng = np.random.default_rng(0)
+    S, t = rng.uniform(50, 150, n_lookups), rng.uniform(0, 2, n_lookups)
+    print(f"{n_lookups} lookups: {bench(lambda: surface(S, t), repeat=3) * 1e3:.0f} ms")
+
+    # Log-Euler Monte Carlo with a surface lookup per step
+    dt = 1.0 / n_steps
+    S = np.full(n_paths, S0)
+    for i in range(n_steps):
+        sigma = surface(S, i * dt)
+        S = S * np.exp((r - 0.5 * sigma * sigma) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n_paths))
+    model = HestonModel(S0, r, **TRUE_PARAMS)
+    for K in (70, 85, 100, 115, 130):
+        payoff = np.exp(-r) * np.maximum(S - K, 0)
+        error = payoff.std() / np.sqrt(n_paths)
+        print(f"K={K}: local vol MC {payoff.mean():.4f} +/- {error:.4f}, chain {model.price(K, 1.0, 'call'):.4f}")
+
+
+if __name__ == '__main__':
+    run_local_volatility_benchmark()
@@ -0,0 +1,70 @@
+"""
+Benchmarks and accuracy check of the normal CDF/PDF backends against scipy.stats.norm.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_normal_distribution
+"""
+import numpy as np
+from scipy.stats import norm
+from benchmarks.bench_black_scholes import bench
+from templates import normal_distribution
+
+
+def check_accuracy(backend):
+    """
+    Assert the accuracy bounds documented in templates.normal_distribution for a backend.
+
+    Args:
+        backend (str): Backend name
+
+    Returns:
+        tuple: Largest relative CDF and PDF differences to scipy inside the documented ranges
+    """
+    normal_distribution.set_backend(backend)
+    try:
+        x = np.linspace(-40.0, 10.0, 200_001)
+        cdf = normal_distribution.norm_cdf(x)
+        pdf = normal_distribution.norm_pdf(x)
+    finally:
+        normal_distribution.set_backend('auto')
+
+    inside = (x >= -37.0) & (x <= 8.3)
+    cdf_error = np.max(np.abs(cdf[inside] / norm.cdf(x[inside]) - 1))
+    assert cdf_error < 5e-13, cdf_error
+    assert np.max(np.abs(cdf[~inside] - norm.cdf(x[~inside]))) < 1e-300
+
+    pdf_range = np.abs(x) <= 37.0
+    pdf_error = np.max(np.abs(pdf[pdf_range] / norm.pdf(x[pdf_range]) - 1))
+    assert pdf_error < 1e-13, pdf_error
+    return cdf_error, pdf_error
+
+
+def run_normal_backend_benchmark(sizes=(1, 5_000, 1_000_000)):
+    """
+    Time norm_cdf for every available backend against scipy.stats.norm.cdf.
+
+    Args:
+        sizes (tuple): Input sizes, 1 meaning a Python float
+    """
+    backends = ['scalar', 'numpy'] + (['numba'] if normal_distribution.numba is not None else [])
+    for backend in backends:
+        cdf_error, pdf_error = check_accuracy(backend)
+        print(f"{backend:>6}: max relative error cdf {cdf_error:.1e}, pdf {pdf_error:.1e}")
+
+    print(f"{'size':>10} {'scipy.stats (us)':>17}" + ''.join(f" {b + ' (us)':>12}" for b in backends))
+    for size in sizes:
+        x = 0.3 if size == 1 else np.random.default_rng(0).normal(size=size)
+        line = f"{size:>10} {bench(lambda: norm.cdf(x)) * 1e6:>17.2f}"
+        for backend in backends:
+            if backend == 'scalar' and size > 1:
+                line += f" {'-':>12}"
+                continue
+            normal_distribution.set_backend(backend)
+            normal_distribution.norm_cdf(x)  # Compile outside the timing for numba
+            line += f" {bench(lambda: normal_distribution.norm_cdf(x)) * 1e6:>12.2f}"
+        normal_distribution.set_backend('auto')
+        print(line)
+
+
+if __name__ == '__main__':
+    run_normal_backend_benchmark()
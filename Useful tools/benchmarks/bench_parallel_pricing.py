@@ -0,0 +1,66 @@
+"""
+Scaling benchmark of the multi-process pricer.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_parallel_pricing
+"""
+import os
+import time
+import numpy as np
+from templates.black_scholes import BlackScholes
+from templates.parallel_pricing import DEFAULT_CHUNK_SIZE, ParallelPricer
+
+
+def make_contracts(n_contracts, seed=0):
+    """
+    Build random contract parameters, including some expired ones.
+
+    Args:
+        n_contracts (int): Number of contracts
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: Keyword arguments for ParallelPricer.price
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'S0': rng.uniform(50, 150, n_contracts),
+        'K': rng.uniform(50, 150, n_contracts),
+        'r': 0.03,
+        'sigma': rng.uniform(0.05, 0.8, n_contracts),
+        'T': rng.uniform(-0.01, 2.0, n_contracts),
+        'option_type': rng.integers(0, 2, n_contracts),
+        'option_position': rng.integers(0, 2, n_contracts),
+    }
+
+
+def run_scaling_benchmark(n_contracts=10_000_000, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Time the pricer from 1 to os.cpu_count() workers and check the results are bit-identical.
+
+    Args:
+        n_contracts (int): Number of contracts
+        chunk_size (int): Contracts per chunk
+    """
+    contracts = make_contracts(n_contracts)
+    start = time.perf_counter()
+    reference = BlackScholes(*(contracts[name] for name in ('S0', 'K', 'r', 'sigma', 'T'))).price(
+        contracts['option_type'], contracts['option_position'])
+    single = time.perf_counter() - start
+    print(f"{n_contracts} contracts, single BlackScholes call: {single:.2f} s")
+
+    n_cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, 16, n_cpus} & set(range(1, n_cpus + 1))) or [1]
+    print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8} {'identical':>10}")
+    for n_workers in workers:
+        with ParallelPricer(n_workers, chunk_size) as pricer:
+            pricer.price(**make_contracts(n_workers * chunk_size))  # Start the worker processes
+            start = time.perf_counter()
+            prices = pricer.price(**contracts)
+            elapsed = time.perf_counter() - start
+        identical = np.array_equal(prices, reference, equal_nan=True)
+        print(f"{n_workers:>8} {elapsed:>9.2f} {single / elapsed:>8.2f} {str(identical):>10}")
+
+
+if __name__ == '__main__':
+    run_scaling_benchmark()
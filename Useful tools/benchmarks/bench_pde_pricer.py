@@ -0,0 +1,62 @@
+"""
+Crank-Nicolson PDE pricer: convergence against Black-Scholes, American put, strike ladder from
+one forward sweep against one backward sweep per strike, and local-vol prices against the chain.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_pde_pricer
+"""
+import time
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from benchmarks.bench_heston_calibration import TRUE_PARAMS, make_book
+from templates.black_scholes import BlackScholes
+from templates.heston import HestonModel
+from templates.local_volatility import LocalVolatilitySurface
+from templates.pde_pricer import CrankNicolsonPricer
+
+# Binomial (10,000 steps) value of the American put S0 = K = 100, r = 5%, sigma = 20%, T = 1
+AMERICAN_PUT_REFERENCE = 6.0904
+
+
+def run_pde_benchmark(S0=100.0, r=0.05, sigma=0.2, T=1.0):
+    """
+    Args:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        sigma (float): Constant volatility of the Black-Scholes checks
+        T (float): Maturity in years
+    """
+    exact = BlackScholes(S0, S0, r, sigma, T).price('put')
+    print("grid        european error   american error   time")
+    for n_space in (100, 200, 400, 800):
+        pricer = CrankNicolsonPricer(sigma, S0, r, n_space=n_space, n_time=n_space // 2)
+        european = pricer.price(S0, T, 'put') - exact
+        american = pricer.price(S0, T, 'put', exercise='american') - AMERICAN_PUT_REFERENCE
+        elapsed = bench(lambda: pricer.price(S0, T, 'put', exercise='american'), repeat=3)
+        print(f"{n_space:>4} x {n_space // 2:<4} {european:>+14.2e} {american:>+16.2e} {elapsed * 1e3:>6.1f} ms")
+
+    pricer = CrankNicolsonPricer(sigma, S0, r)
+    strikes = np.linspace(60, 160, 101)
+    ladder = bench(lambda: pricer.price_strikes(strikes, T, 'call'), repeat=3)
+    one_by_one = bench(lambda: [pricer.price(K, T, 'call') for K in strikes], repeat=1)
+    error = np.abs(pricer.price_strikes(strikes, T, 'call') - BlackScholes(S0, strikes, r, sigma, T).price('call'))
+    print(f"{strikes.size} strikes: forward sweep {ladder * 1e3:.1f} ms, one backward sweep per strike "
+          f"{one_by_one * 1e3:.0f} ms, max error {error.max():.1e}")
+
+    # Local volatility of a Heston chain: the PDE reprices the chain
+    rate = 0.03
+    surface = LocalVolatilitySurface.from_book(make_book(S0, rate), S0, rate)
+    pricer = CrankNicolsonPricer(surface, S0, rate)
+    model = HestonModel(S0, rate, **TRUE_PARAMS)
+    strikes = np.array([70.0, 85.0, 100.0, 115.0, 130.0])
+    start = time.perf_counter()
+    ladder = pricer.price_strikes(strikes, T, 'call')
+    elapsed = time.perf_counter() - start
+    for K, price in zip(strikes, ladder):
+        print(f"K={K:.0f}: local vol PDE {price:.4f}, chain {model.price(K, T, 'call'):.4f}")
+    print(f"local vol ladder: {elapsed * 1e3:.1f} ms, "
+          f"American put at the money {pricer.price(S0, T, 'put', exercise='american'):.4f}")
+
+
+if __name__ == '__main__':
+    run_pde_benchmark()
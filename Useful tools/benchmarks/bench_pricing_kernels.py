@@ -0,0 +1,56 @@
+"""
+Benchmark of the Numba pricing kernels against the NumPy expression chains.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_pricing_kernels
+"""
+import time
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from templates import pricing_kernels
+
+
+def run_kernel_benchmark(sizes=(1_000, 100_000, 1_000_000), n_paths=100_000, n_steps=252):
+    """
+    Time the Black-Scholes and averaging kernels on both backends.
+
+    Args:
+        sizes (tuple): Chain sizes for the Black-Scholes kernels
+        n_paths (int): Number of paths for the averaging kernels
+        n_steps (int): Observations per path
+    """
+    if pricing_kernels.numba is None:
+        print("Numba is not installed, only the numpy backend is available")
+        return
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    pricing_kernels.bs_price_and_greeks(100.0, 100.0, 0.03, 0.2, 1.0, 'call')
+    print(f"first call (compile or load from cache): {time.perf_counter() - start:.2f} s")
+
+    print(f"{'function':>20} {'size':>10} {'numpy (ms)':>11} {'numba (ms)':>11} {'speedup':>8}")
+    for size in sizes:
+        chain = dict(S0=100.0, K=rng.uniform(50, 150, size), r=0.03, sigma=rng.uniform(0.05, 0.8, size),
+                     T=rng.uniform(0.01, 2.0, size), option_type=rng.integers(0, 2, size))
+        for func in (pricing_kernels.bs_price, pricing_kernels.bs_price_and_greeks):
+            times = []
+            for backend in ('numpy', 'numba'):
+                pricing_kernels.set_backend(backend)
+                times.append(bench(lambda: func(**chain), repeat=3))
+            pricing_kernels.set_backend('auto')
+            print(f"{func.__name__:>20} {size:>10} {times[0] * 1e3:>11.2f} {times[1] * 1e3:>11.2f} "
+                  f"{times[0] / times[1]:>8.1f}")
+
+    paths = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_paths, n_steps)), axis=1))
+    for avg_type in pricing_kernels.AVERAGE_TYPES:
+        times = []
+        for backend in ('numpy', 'numba'):
+            pricing_kernels.set_backend(backend)
+            times.append(bench(lambda: pricing_kernels.window_average(paths, n_steps, avg_type), repeat=3))
+        pricing_kernels.set_backend('auto')
+        print(f"{'avg ' + avg_type:>20} {n_paths:>10} {times[0] * 1e3:>11.2f} {times[1] * 1e3:>11.2f} "
+              f"{times[0] / times[1]:>8.1f}")
+
+
+if __name__ == '__main__':
+    run_kernel_benchmark()
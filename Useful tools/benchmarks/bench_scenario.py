@@ -0,0 +1,75 @@
+"""
+Benchmark of the portfolio scenario engine.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_scenario
+"""
+import time
+import numpy as np
+from benchmarks.bench_black_scholes import bench
+from templates.black_scholes import BlackScholes
+from templates.scenario import Portfolio, ScenarioGrid, run_scenarios
+
+
+def make_portfolio(n_contracts, seed=0):
+    """
+    Build a random portfolio of long and short calls and puts on one underlying.
+
+    Args:
+        n_contracts (int): Number of contracts
+        seed (int): Seed of the random generator
+
+    Returns:
+        Portfolio: The portfolio
+    """
+    rng = np.random.default_rng(seed)
+    return Portfolio(
+        S0=100.0,
+        K=rng.uniform(60, 140, n_contracts),
+        r=0.03,
+        sigma=rng.uniform(0.1, 0.5, n_contracts),
+        T=rng.uniform(7 / 365, 2.0, n_contracts),
+        option_type=rng.integers(0, 2, n_contracts),
+        option_position=rng.integers(0, 2, n_contracts),
+        quantity=rng.integers(1, 50, n_contracts),
+    )
+
+
+def make_grid():
+    """Stress grid of 10 spot x 10 vol x 2 rate x 5 time shocks (1000 scenarios)."""
+    return ScenarioGrid(
+        spot_shocks=np.linspace(-0.3, 0.3, 10),
+        vol_shocks=np.linspace(-0.1, 0.2, 10),
+        rate_shocks=[0.0, 0.01],
+        time_shifts=[0, 1, 5, 21, 63],
+    )
+
+
+def run_scenario_benchmark(n_contracts=10_000):
+    """
+    Time the batched scenario engine against repricing one BlackScholes object per contract.
+
+    Args:
+        n_contracts (int): Number of contracts
+    """
+    portfolio = make_portfolio(n_contracts)
+    grid = make_grid()
+    elapsed = bench(lambda: run_scenarios(portfolio, grid), repeat=1, number=1)
+    print(f"{n_contracts} contracts x {len(grid)} scenarios: {elapsed:.2f} s batched")
+
+    # The object-per-price API, timed on a single scenario and extrapolated
+    start = time.perf_counter()
+    for i in range(n_contracts):
+        bs = BlackScholes(portfolio.S0[i] * 1.1, portfolio.K[i], portfolio.r[i], portfolio.sigma[i], portfolio.T[i])
+        bs.price(portfolio.option_type[i])
+    per_scenario = time.perf_counter() - start
+    print(f"object per price: {per_scenario * len(grid):.0f} s estimated ({per_scenario:.2f} s per scenario)")
+
+    result = run_scenarios(portfolio, grid)
+    print("worst scenarios (pnl, spot, vol, rate, days):")
+    for scenario in result.worst(3):
+        print("  " + ", ".join(f"{value:.4g}" for value in scenario))
+
+
+if __name__ == '__main__':
+    run_scenario_benchmark()
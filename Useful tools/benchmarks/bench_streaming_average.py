@@ -0,0 +1,55 @@
+"""
+Live marking of a book of averaging options: one new fixing per trade with the streaming
+accumulators, against rebuilding the Asian templates from the full price history.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.bench_streaming_average
+"""
+import json
+import time
+import numpy as np
+from templates.asian_option_fixed_strike import OptionAsianFixedStrike
+from templates.averaging import AVERAGE_TYPES
+from templates.streaming_average import AverageAccumulator
+
+
+def run_streaming_benchmark(n_trades=10_000, n_days=252, window=63, strike=100.0, seed=0):
+    """
+    Args:
+        n_trades (int): Live trades, their average types cycling through AVERAGE_TYPES
+        n_days (int): Fixings already received by every trade
+        window (int): Averaging window of the trades
+        strike (float): Fixed strike
+        seed (int): Seed of the simulated fixings
+    """
+    rng = np.random.default_rng(seed)
+    history = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_trades, n_days + 1)), axis=1))
+    avg_types = [AVERAGE_TYPES[i % len(AVERAGE_TYPES)] for i in range(n_trades)]
+
+    accumulators = [AverageAccumulator(window, avg_type) for avg_type in avg_types]
+    for accumulator, prices in zip(accumulators, history[:, :-1]):
+        accumulator.extend(prices)
+    state = json.dumps([accumulator.to_dict() for accumulator in accumulators])
+    print(f"{n_trades} trades, {n_days} fixings each, window {window}: state {len(state) / 1e6:.1f} MB of JSON")
+
+    start = time.perf_counter()
+    accumulators = [AverageAccumulator.from_dict(saved) for saved in json.loads(state)]
+    print(f"restore from JSON: {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    # New fixing of the day
+    start = time.perf_counter()
+    streamed = np.array([max(accumulator.update(price) - strike, 0.0)
+                         for accumulator, price in zip(accumulators, history[:, -1])])
+    elapsed = time.perf_counter() - start
+    print(f"streaming update: {elapsed * 1e3:.1f} ms ({elapsed / n_trades * 1e6:.2f} us per trade)")
+
+    start = time.perf_counter()
+    rebuilt = np.array([OptionAsianFixedStrike(prices, strike, window, avg_type).payoff()
+                        for prices, avg_type in zip(history, avg_types)])
+    elapsed = time.perf_counter() - start
+    print(f"templates rebuilt from the history: {elapsed * 1e3:.1f} ms ({elapsed / n_trades * 1e6:.2f} us per trade)")
+    print(f"max |payoff difference|: {np.abs(streamed - rebuilt).max():.1e}")
+
+
+if __name__ == '__main__':
+    run_streaming_benchmark()
@@ -0,0 +1,88 @@
+"""
+Import-time report of the Streamlit app start-up and of each page.
+
+Every target is imported in a fresh interpreter under `python -X importtime`; the report
+gives the total import time and the slowest top-level packages.
+
+Run from the "Useful tools" directory:
+    python -m benchmarks.import_time_report
+"""
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parents[2]
+
+# Report label -> module imported in a fresh interpreter
+TARGETS = {
+    "app start-up (main)": "main",
+    "Home": "windows.home",
+    "Black Scholes": "windows.blackscholes",
+    "Dupire": "windows.dupire",
+    "Heston": "windows.heston",
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter and parse the -X importtime output.
+
+    Args:
+        module (str): Module to import, resolved from the app root with "Useful tools" on the path
+
+    Returns:
+        list: (module name, self time in us, cumulative time in us, nesting level) tuples
+    """
+    code = (f"import sys; sys.path[:0] = [{str(APP_ROOT)!r}, {str(APP_ROOT / 'Useful tools')!r}]; "
+            f"import {module}")
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_ROOT,
+                               capture_output=True, text=True, check=True)
+    times = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return times
+
+
+def summarize(times, top=8):
+    """
+    Total import time and the packages that take the longest.
+
+    Args:
+        times (list): Output of import_times
+        top (int): Number of packages to keep
+
+    Returns:
+        tuple: Total time in ms and a list of (package, ms) sorted by decreasing time
+    """
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in times:
+        by_package[name.split('.')[0]] += self_us
+    total_ms = sum(by_package.values()) / 1e3
+    slowest = sorted(((package, us / 1e3) for package, us in by_package.items()), key=lambda item: -item[1])
+    return total_ms, slowest[:top]
+
+
+def run_import_time_report(targets=TARGETS, top=8):
+    """
+    Print the import-time summary of the app and of every page.
+
+    Args:
+        targets (dict): Report label -> module
+        top (int): Number of packages listed per target
+    """
+    for label, module in targets.items():
+        total_ms, slowest = summarize(import_times(module), top)
+        print(f"{label} ({module}): {total_ms:.0f} ms")
+        for package, ms in slowest:
+            print(f"    {package:<28} {ms:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    run_import_time_report()
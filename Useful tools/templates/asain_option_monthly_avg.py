@@ -5,37 +5,55 @@ class MonthlyAveragePayoff:
         """
         Initialize the payoff calculation based on monthly averages.
         
-        :param spot_prices: List or numpy array of spot prices over time.
+        :param spot_prices: List or numpy array of spot prices over time, or a (n_paths, n_steps)
+            array of simulated paths (one payoff per path).
         :param days_per_month: Number of days considered as one month.
         """
         self.spot_prices = np.array(spot_prices)
         self.days_per_month = days_per_month
         
-        if len(self.spot_prices) < 2 * self.days_per_month:
+        if self.spot_prices.shape[-1] < 2 * self.days_per_month:
             raise ValueError("Not enough data to compute two full months of averages.")
     
     def compute_average(self, start_day, end_day):
         """Compute the average price over the specified period."""
-        return np.mean(self.spot_prices[start_day:end_day])
+        return np.mean(self.spot_prices[..., start_day:end_day], axis=-1)
     
     def compute_payoff(self):
         """Compute the difference between the current month's average and the last month's average."""
         last_month_avg = self.compute_average(-2 * self.days_per_month, -self.days_per_month)
         current_month_avg = self.compute_average(-self.days_per_month, None)
         
-        return max(current_month_avg - last_month_avg, 0)
+        return np.maximum(current_month_avg - last_month_avg, 0)
         
 # Random price simulation
-def simulate_prices(initial_price, days, volatility=1, drift=0):
-    """Generate simulated price data using a simple random walk."""
-    prices = [initial_price]
-    for _ in range(days - 1):
-        prices.append(prices[-1] * (1 + np.random.normal(drift, volatility / 100)))
-    return prices
+def simulate_prices(initial_price, days, volatility=1, drift=0, n_paths=None, dtype=np.float64):
+    """
+    Generate simulated price data using a simple random walk.
 
-# Example Usage
-np.random.seed(48)  # For reproducibility
-spot_prices = simulate_prices(100, 60, volatility=0.2, drift=0.05)  # Simulated price data
-payoff_calc = MonthlyAveragePayoff(spot_prices, days_per_month=30)
-print("Monthly Average Payoff:", payoff_calc.compute_payoff())
+    :param initial_price: Price on the first day.
+    :param days: Number of prices per path.
+    :param volatility: Daily volatility in percent.
+    :param drift: Mean daily return.
+    :param n_paths: Number of independent paths, None for a single 1-D path.
+    :param dtype: Precision of the returned prices; the compounding is done in float64 and
+        np.float32 only halves the memory of the stored paths.
+    :return: Numpy array of shape (days,) or (n_paths, days).
+    """
+    shape = (1 if n_paths is None else n_paths, days)
+    prices = np.empty(shape, dtype=dtype)
+    rows_per_chunk = max(1, 2**20 // days)  # Bounds the float64 temporaries to ~8 MB
+    for start in range(0, shape[0], rows_per_chunk):
+        rows = slice(start, min(start + rows_per_chunk, shape[0]))
+        growth = np.empty((rows.stop - start, days))
+        growth[:, 0] = initial_price
+        growth[:, 1:] = 1 + np.random.normal(drift, volatility / 100, (rows.stop - start, days - 1))
+        prices[rows] = np.cumprod(growth, axis=1)
+    return prices[0] if n_paths is None else prices
 
+# Example Usage
+if __name__ == '__main__':
+    np.random.seed(48)  # For reproducibility
+    spot_prices = simulate_prices(100, 60, volatility=0.2, drift=0.05)  # Simulated price data
+    payoff_calc = MonthlyAveragePayoff(spot_prices, days_per_month=30)
+    print("Monthly Average Payoff:", payoff_calc.compute_payoff())
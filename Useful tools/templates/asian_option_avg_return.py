@@ -5,7 +5,8 @@ class AsianOptionAverageReturn:
         """
         Initialize the Asian option based on cumulative returns.
         
-        :param returns: List or numpy array of daily returns.
+        :param returns: List or numpy array of daily returns, or a (n_paths, n_days) array of
+            simulated returns (one payoff per path).
         :param averaging_days: Number of days used for averaging the spot return.
         :param strike_start: Start day for strike return calculation.
         :param strike_end: End day for strike return calculation.
@@ -15,26 +16,43 @@ class AsianOptionAverageReturn:
         self.strike_start = strike_start
         self.strike_end = strike_end
         
-        if len(self.returns) < max(self.averaging_days, self.strike_end):
+        if self.returns.shape[-1] < max(self.averaging_days, self.strike_end):
             raise ValueError("Not enough data to compute the required averages.")
     
     def compute_average_return(self, start, end):
-        """Compute the average return over the specified period."""
-        return np.mean(self.returns[start:end])
+        """Compute the average return over the specified period (one per path for 2-D returns)."""
+        return np.mean(self.returns[..., start:end], axis=-1)
     
     def compute_payoff(self):
         """Compute the Asian option payoff comparing spot and strike average returns."""
         avg_spot_return = self.compute_average_return(-self.averaging_days, None)
         avg_strike_return = self.compute_average_return(self.strike_start, self.strike_end)
-        return max(avg_spot_return - avg_strike_return, 0)
+        return np.maximum(avg_spot_return - avg_strike_return, 0)
 
 # Random return simulation
-def simulate_returns(days, volatility=1, drift=0):
-    """Generate simulated daily returns using a normal distribution."""
-    return np.random.normal(drift, volatility / 100, days)
+def simulate_returns(days, volatility=1, drift=0, n_paths=None, dtype=np.float64):
+    """
+    Generate simulated daily returns using a normal distribution.
+
+    :param days: Number of returns per path.
+    :param volatility: Daily volatility in percent.
+    :param drift: Mean daily return.
+    :param n_paths: Number of independent paths, None for a single 1-D path.
+    :param dtype: Precision of the returned returns (np.float32 halves the memory).
+    :return: Numpy array of shape (days,) or (n_paths, days).
+    """
+    if n_paths is None:
+        return np.random.normal(drift, volatility / 100, days).astype(dtype, copy=False)
+    returns = np.empty((n_paths, days), dtype=dtype)
+    rows_per_chunk = max(1, 2**20 // days)  # Bounds the float64 draws to ~8 MB
+    for start in range(0, n_paths, rows_per_chunk):
+        rows = slice(start, min(start + rows_per_chunk, n_paths))
+        returns[rows] = np.random.normal(drift, volatility / 100, (rows.stop - start, days))
+    return returns
 
 # Example Usage
-np.random.seed(42)  # For reproducibility
-returns = simulate_returns(60, volatility=2, drift=0.05)  # Simulated daily returns
-asian_option = AsianOptionAverageReturn(returns, averaging_days=30, strike_start=10, strike_end=20)
-print("Asian Option Payoff (Average Return):", asian_option.compute_payoff())
+if __name__ == '__main__':
+    np.random.seed(42)  # For reproducibility
+    returns = simulate_returns(60, volatility=2, drift=0.05)  # Simulated daily returns
+    asian_option = AsianOptionAverageReturn(returns, averaging_days=30, strike_start=10, strike_end=20)
+    print("Asian Option Payoff (Average Return):", asian_option.compute_payoff())
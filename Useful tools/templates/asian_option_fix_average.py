@@ -5,7 +5,8 @@ class AsianOptionPayoff:
         """
         Initialize the Asian option.
         
-        :param spot_prices: List or numpy array of spot prices over time.
+        :param spot_prices: List or numpy array of spot prices over time, or a (n_paths, n_steps)
+            array of simulated paths (one payoff per path).
         :param start_day: The first day included in the averaging period.
         :param end_day: The last day included in the averaging period (before maturity).
         :param option_type: 'call' or 'put'.
@@ -21,12 +22,12 @@ class AsianOptionPayoff:
             raise ValueError("Invalid option type. Must be 'call' or 'put'.")
         if self.strike_type not in ['floating_strike', 'floating_spot']:
             raise ValueError("Invalid strike type. Must be 'floating_strike' or 'floating_spot'.")
-        if not (0 <= self.start_day < self.end_day <= len(self.spot_prices)):
+        if not (0 <= self.start_day < self.end_day <= self.spot_prices.shape[-1]):
             raise ValueError("Invalid start and end day range.")
     
     def compute_average(self):
         """Compute the average price over the specified period."""
-        return np.mean(self.spot_prices[self.start_day:self.end_day])
+        return np.mean(self.spot_prices[..., self.start_day:self.end_day], axis=-1)
     
     def compute_payoff(self):
         """Compute the option payoff based on the strike price and averaging method."""
@@ -34,12 +35,12 @@ class AsianOptionPayoff:
         
         if self.strike_type == 'floating_strike':
             strike = average_price
-            spot = self.spot_prices[-1]  # Final spot price
+            spot = self.spot_prices[..., -1]  # Final spot price
         else:  # 'floating_spot'
-            strike = self.spot_prices[-1]  # Final spot price
+            strike = self.spot_prices[..., -1]  # Final spot price
             spot = average_price
         
         if self.option_type == 'call':
-            return max(spot - strike, 0)
+            return np.maximum(spot - strike, 0)
         elif self.option_type == 'put':
-            return max(strike - spot, 0)
\ No newline at end of file
+            return np.maximum(strike - spot, 0)
\ No newline at end of file
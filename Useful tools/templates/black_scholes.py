@@ -1,362 +1,419 @@
 import numpy as np
-from scipy.stats import norm
-import matplotlib.pyplot as plt
-from ipywidgets import interact, FloatSlider, Dropdown, fixed
+from templates.normal_distribution import norm_cdf, norm_pdf
+
+# Integer flags, same encoding as CONFIG.OPTION_TYPE and CONFIG.OPTION_POSITION
+CALL, PUT = 0, 1
+LONG, SHORT = 0, 1
+
+# Accuracy of dtype=np.float32 against float64 (checked by benchmarks/bench_float32.py):
+# |price error| <= tolerance * S0 and |Greek error| <= tolerance * max |Greek| over the batch
+FLOAT32_TOLERANCES = {'price': 2e-6, 'greeks': 2e-5}
+
+
+def _call_mask(option_type):
+    """
+    Convert an option type to a boolean mask that is True for calls.
+
+    Args:
+        option_type (str, int or array-like): 'call'/'put' strings (any case) or CALL/PUT flags
+
+    Returns:
+        numpy.ndarray: Boolean mask, True where the option is a call
+    """
+    option_type = np.asarray(option_type)
+    if option_type.dtype.kind in 'USO':
+        option_type = np.char.lower(option_type.astype(str))
+        if not np.isin(option_type, ['call', 'put']).all():
+            raise ValueError("option_type must be 'call' or 'put'")
+        return option_type == 'call'
+    if not np.isin(option_type, [CALL, PUT]).all():
+        raise ValueError("option_type flags must be CALL (0) or PUT (1)")
+    return option_type == CALL
+
+
+def _position_sign(option_position):
+    """
+    Convert an option position to a +1 (long) / -1 (short) multiplier.
+
+    Args:
+        option_position (str, int or array-like): 'long'/'short' strings (any case) or LONG/SHORT flags
+
+    Returns:
+        numpy.ndarray: +1 for long positions, -1 for short positions, as int8 so that
+            multiplying keeps the precision (float32 or float64) of the other operand
+    """
+    option_position = np.asarray(option_position)
+    if option_position.dtype.kind in 'USO':
+        option_position = np.char.lower(option_position.astype(str))
+        if not np.isin(option_position, ['long', 'short']).all():
+            raise ValueError("option_position must be 'long' or 'short'")
+        return np.where(option_position == 'long', 1, -1).astype(np.int8)
+    if not np.isin(option_position, [LONG, SHORT]).all():
+        raise ValueError("option_position flags must be LONG (0) or SHORT (1)")
+    return np.where(option_position == LONG, 1, -1).astype(np.int8)
+
+
+def _theta_sign(option_type):
+    """
+    Convert an option type to the +1 (call) / -1 (put) factor of the Black-Scholes formulas.
+
+    Args:
+        option_type (str, int or array-like): 'call'/'put' strings (any case) or CALL/PUT flags
+
+    Returns:
+        numpy.ndarray: int8 +1 for calls, -1 for puts
+    """
+    return np.where(_call_mask(option_type), 1, -1).astype(np.int8)
+
+
+def _output(value):
+    """Return a numpy scalar for 0-d results so scalar inputs keep giving scalar outputs."""
+    value = np.asarray(value)
+    return value[()] if value.ndim == 0 else value
+
 
 class BlackScholes:
     """
     A class for pricing options using the Black-Scholes model and calculating Greeks.
-    
+
+    Every parameter can be a scalar or a NumPy array; arrays are broadcast against each
+    other so a whole option chain is priced in a single call. Option types and positions
+    can likewise be given per contract, either as strings or as CALL/PUT and LONG/SHORT flags.
+
+    In float64, price and price_and_greeks run on the compiled kernels of
+    templates.pricing_kernels when its backend is 'numba' (the default whenever Numba is
+    installed), and on the NumPy expressions below otherwise.
+
     Attributes:
-        S0 (float): Current stock price (spot)
-        K (float): Strike price
-        r (float): Risk-free interest rate (annual)
-        sigma (float): Implied volatility (annualized)
-        T (float): Time to maturity (in years)
+        S0 (float or numpy.ndarray): Current stock price (spot)
+        K (float or numpy.ndarray): Strike price
+        r (float or numpy.ndarray): Risk-free interest rate (annual)
+        sigma (float or numpy.ndarray): Implied volatility (annualized)
+        T (float or numpy.ndarray): Time to maturity (in years)
+        dtype (numpy.dtype): Floating-point precision of the parameters and results
     """
-    
-    def __init__(self, S0, K, r, sigma, T):
+
+    def __init__(self, S0, K, r, sigma, T, dtype=np.float64):
         """
         Initialize Black-Scholes model with option parameters.
-        
+
         Args:
-            S0 (float): Current stock price (spot)
-            K (float): Strike price
-            r (float): Risk-free interest rate (annual)
-            sigma (float): Implied volatility (annualized)
-            T (float): Time to maturity (in years)
-        """
-        self.S0 = S0
-        self.K = K
-        self.r = r
-        self.sigma = sigma
-        self.T = T
-        
-        # Calculate d1 and d2 (used in many formulas)
+            S0 (float or array-like): Current stock price (spot)
+            K (float or array-like): Strike price
+            r (float or array-like): Risk-free interest rate (annual)
+            sigma (float or array-like): Implied volatility (annualized)
+            T (float or array-like): Time to maturity (in years)
+            dtype (numpy.dtype): np.float64, or np.float32 to halve the memory traffic of large
+                batches (see FLOAT32_TOLERANCES for the accuracy)
+        """
+        self.dtype = np.dtype(dtype)
+        self.S0 = np.asarray(S0, dtype=self.dtype)
+        self.K = np.asarray(K, dtype=self.dtype)
+        self.r = np.asarray(r, dtype=self.dtype)
+        self.sigma = np.asarray(sigma, dtype=self.dtype)
+        self.T = np.asarray(T, dtype=self.dtype)
+
+        # d1 and d2 (used in many formulas) are computed on first use
         self._update_d1_d2()
-        
+
     def _update_d1_d2(self):
-        """Update d1 and d2 values after any parameter change."""
-        if self.T <= 0:
-            self.d1 = np.nan
-            self.d2 = np.nan
-        else:
-            self.d1 = (np.log(self.S0 / self.K) + (self.r + 0.5 * self.sigma**2) * self.T) / (self.sigma * np.sqrt(self.T))
-            self.d2 = self.d1 - self.sigma * np.sqrt(self.T)
-    
+        """Reset d1 and d2 after any parameter change, they are recomputed on first use."""
+        self._d1_d2 = None
+
+    def _compute_d1_d2(self):
+        """d1, d2 (NaN where the option has expired) and the expiry mask, computed once per parameter set."""
+        if self._d1_d2 is None:
+            expired = self.T <= 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sqrt_T = np.sqrt(np.where(expired, np.nan, self.T))
+                d1 = (np.log(self.S0 / self.K) + (self.r + 0.5 * self.sigma**2) * self.T) / (self.sigma * sqrt_T)
+                self._d1_d2 = (d1, d1 - self.sigma * sqrt_T, expired)
+        return self._d1_d2
+
+    @property
+    def d1(self):
+        """numpy.ndarray: d1 of the Black-Scholes formula"""
+        return self._compute_d1_d2()[0]
+
+    @property
+    def d2(self):
+        """numpy.ndarray: d2 = d1 - sigma sqrt(T)"""
+        return self._compute_d1_d2()[1]
+
+    @property
+    def _expired(self):
+        """numpy.ndarray: True where the option has expired (T <= 0)"""
+        return self._compute_d1_d2()[2]
+
+    def _kernels(self):
+        """templates.pricing_kernels when its compiled backend applies to this model, else None."""
+        if self.dtype != np.float64:
+            return None  # The kernels compute in float64
+        # Imported here: pricing_kernels imports this module
+        from templates import pricing_kernels
+        return pricing_kernels if pricing_kernels.get_backend() == 'numba' else None
+
     def update_params(self, S0=None, K=None, r=None, sigma=None, T=None):
         """
         Update any of the model parameters.
-        
+
         Args:
-            S0 (float, optional): Current stock price
-            K (float, optional): Strike price
-            r (float, optional): Risk-free interest rate
-            sigma (float, optional): Implied volatility
-            T (float, optional): Time to maturity
+            S0 (float or array-like, optional): Current stock price
+            K (float or array-like, optional): Strike price
+            r (float or array-like, optional): Risk-free interest rate
+            sigma (float or array-like, optional): Implied volatility
+            T (float or array-like, optional): Time to maturity
         """
         if S0 is not None:
-            self.S0 = S0
+            self.S0 = np.asarray(S0, dtype=self.dtype)
         if K is not None:
-            self.K = K
+            self.K = np.asarray(K, dtype=self.dtype)
         if r is not None:
-            self.r = r
+            self.r = np.asarray(r, dtype=self.dtype)
         if sigma is not None:
-            self.sigma = sigma
+            self.sigma = np.asarray(sigma, dtype=self.dtype)
         if T is not None:
-            self.T = T
-        
+            self.T = np.asarray(T, dtype=self.dtype)
+
         self._update_d1_d2()
-    
+
     def call_price(self):
         """Calculate the price of a call option."""
-        if np.isnan(self.d1):
-            return max(0, self.S0 - self.K)  # Intrinsic value at expiration
-        
-        return self.S0 * norm.cdf(self.d1) - self.K * np.exp(-self.r * self.T) * norm.cdf(self.d2)
-    
+        intrinsic = np.maximum(self.S0 - self.K, 0.0)  # Intrinsic value at expiration
+        price = self.S0 * norm_cdf(self.d1) - self.K * np.exp(-self.r * self.T) * norm_cdf(self.d2)
+        return _output(np.where(self._expired, intrinsic, price))
+
     def put_price(self):
         """Calculate the price of a put option."""
-        if np.isnan(self.d1):
-            return max(0, self.K - self.S0)  # Intrinsic value at expiration
-        
-        return self.K * np.exp(-self.r * self.T) * norm.cdf(-self.d2) - self.S0 * norm.cdf(-self.d1)
-    
+        intrinsic = np.maximum(self.K - self.S0, 0.0)  # Intrinsic value at expiration
+        price = self.K * np.exp(-self.r * self.T) * norm_cdf(-self.d2) - self.S0 * norm_cdf(-self.d1)
+        return _output(np.where(self._expired, intrinsic, price))
+
+    def characteristic_function(self, u, T=None):
+        """
+        Characteristic function of X = ln(S_T / F), F being the forward (for the Fourier pricers
+        of templates.fourier_pricing; sigma must be a scalar there).
+
+        Args:
+            u (complex or array-like): Argument(s)
+            T (float or array-like, optional): Maturity, the option's by default
+
+        Returns:
+            numpy.ndarray: E[exp(i u X)] = exp(-sigma^2 T (i u + u^2) / 2)
+        """
+        u = np.asarray(u, dtype=complex)
+        T = self.T if T is None else np.asarray(T, dtype=float)
+        return np.exp(-0.5 * self.sigma * self.sigma * T * (1j * u + u * u))
+
     def price(self, option_type, option_position='long'):
         """
         Calculate the price of an option.
-        
+
         Args:
-            option_type (str): 'call' or 'put'
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Option price (positive for long, negative for short)
+            float or numpy.ndarray: Option price (positive for long, negative for short)
         """
-        if option_type.lower() == 'call':
-            price = self.call_price()
-        elif option_type.lower() == 'put':
-            price = self.put_price()
-        else:
-            raise ValueError("option_type must be 'call' or 'put'")
-        
-        if option_position.lower() == 'long':
-            return price
-        elif option_position.lower() == 'short':
-            return -price
-        else:
-            raise ValueError("option_position must be 'long' or 'short'")
-    
+        kernels = self._kernels()
+        if kernels is not None:
+            return kernels._kernel_price(self.S0, self.K, self.r, self.sigma, self.T, option_type, option_position)
+
+        # theta = +1 for calls and -1 for puts turns both formulas into one expression
+        theta = _theta_sign(option_type)
+        sign = _position_sign(option_position)
+
+        intrinsic = np.maximum(theta * (self.S0 - self.K), 0.0)
+        price = theta * (self.S0 * norm_cdf(theta * self.d1) -
+                         self.K * np.exp(-self.r * self.T) * norm_cdf(theta * self.d2))
+        return _output(sign * np.where(self._expired, intrinsic, price))
+
     # First-order Greeks
-    
+
     def delta(self, option_type, option_position='long'):
         """
         Calculate the delta of an option (first derivative with respect to spot price).
-        
+
         Args:
-            option_type (str): 'call' or 'put'
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Delta value
-        """
-        if np.isnan(self.d1):
-            # At expiration, delta is either 0 or 1 (or -1 for short)
-            if option_type.lower() == 'call':
-                delta = 1 if self.S0 > self.K else 0
-            else:  # put
-                delta = -1 if self.S0 < self.K else 0
-        else:
-            if option_type.lower() == 'call':
-                delta = norm.cdf(self.d1)
-            elif option_type.lower() == 'put':
-                delta = norm.cdf(self.d1) - 1
-            else:
-                raise ValueError("option_type must be 'call' or 'put'")
-        
-        if option_position.lower() == 'short':
-            delta = -delta
-            
-        return delta
-    
+            float or numpy.ndarray: Delta value
+        """
+        is_call = _call_mask(option_type)
+        sign = _position_sign(option_position)
+
+        # At expiration, delta is either 0 or 1 (or -1 for puts)
+        theta_sign = _theta_sign(option_type)
+        expired_delta = theta_sign * (theta_sign * (self.S0 - self.K) > 0)
+        delta = np.where(is_call, norm_cdf(self.d1), norm_cdf(self.d1) - 1)
+        return _output(sign * np.where(self._expired, expired_delta, delta))
+
     def gamma(self, option_position='long'):
         """
         Calculate the gamma of an option (second derivative with respect to spot price).
         Same for both calls and puts.
-        
+
         Args:
-            option_position (str): 'long' or 'short'
-            
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Gamma value
+            float or numpy.ndarray: Gamma value
         """
-        if np.isnan(self.d1):
-            return 0  # Gamma is 0 at expiration
-            
-        gamma = norm.pdf(self.d1) / (self.S0 * self.sigma * np.sqrt(self.T))
-        
-        if option_position.lower() == 'short':
-            gamma = -gamma
-            
-        return gamma
-    
+        gamma = norm_pdf(self.d1) / (self.S0 * self.sigma * np.sqrt(np.maximum(self.T, 0.0)))
+        # Gamma is 0 at expiration
+        return _output(_position_sign(option_position) * np.where(self._expired, 0.0, gamma))
+
     def theta(self, option_type, option_position='long'):
         """
         Calculate the theta of an option (derivative with respect to time).
-        
+
         Args:
-            option_type (str): 'call' or 'put'
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Theta value (daily)
+            float or numpy.ndarray: Theta value (daily)
         """
-        if np.isnan(self.d1):
-            return 0  # Theta is 0 at expiration
-            
-        # Common term for both call and put
-        common_term = -(self.S0 * norm.pdf(self.d1) * self.sigma) / (2 * np.sqrt(self.T))
-        
-        if option_type.lower() == 'call':
-            theta = common_term - self.r * self.K * np.exp(-self.r * self.T) * norm.cdf(self.d2)
-        elif option_type.lower() == 'put':
-            theta = common_term + self.r * self.K * np.exp(-self.r * self.T) * norm.cdf(-self.d2)
-        else:
-            raise ValueError("option_type must be 'call' or 'put'")
-        
-        # Convert from yearly to daily theta
-        theta = theta / 365.0
-        
-        if option_position.lower() == 'short':
-            theta = -theta
-            
-        return theta
-    
+        theta_sign = _theta_sign(option_type)
+        sign = _position_sign(option_position)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Common term for both call and put
+            common_term = -(self.S0 * norm_pdf(self.d1) * self.sigma) / (2 * np.sqrt(np.maximum(self.T, 0.0)))
+        theta = common_term - theta_sign * self.r * self.K * np.exp(-self.r * self.T) * norm_cdf(theta_sign * self.d2)
+
+        # Convert from yearly to daily theta, 0 at expiration
+        return _output(sign * np.where(self._expired, 0.0, theta / 365.0))
+
     def vega(self, option_position='long'):
         """
         Calculate the vega of an option (derivative with respect to volatility).
         Same for both calls and puts.
-        
+
         Args:
-            option_position (str): 'long' or 'short'
-            
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Vega value (for 1% change in volatility)
+            float or numpy.ndarray: Vega value (for 1% change in volatility)
         """
-        if np.isnan(self.d1):
-            return 0  # Vega is 0 at expiration
-            
-        vega = self.S0 * np.sqrt(self.T) * norm.pdf(self.d1) * 0.01
-        
-        if option_position.lower() == 'short':
-            vega = -vega
-            
-        return vega
-    
+        vega = self.S0 * np.sqrt(np.maximum(self.T, 0.0)) * norm_pdf(self.d1) * 0.01
+        # Vega is 0 at expiration
+        return _output(_position_sign(option_position) * np.where(self._expired, 0.0, vega))
+
     def rho(self, option_type, option_position='long'):
         """
         Calculate the rho of an option (derivative with respect to interest rate).
-        
+
         Args:
-            option_type (str): 'call' or 'put'
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Rho value (for 1% change in interest rate)
-        """
-        if np.isnan(self.d1):
-            return 0  # Rho is 0 at expiration
-            
-        if option_type.lower() == 'call':
-            rho = self.K * self.T * np.exp(-self.r * self.T) * norm.cdf(self.d2) * 0.01
-        elif option_type.lower() == 'put':
-            rho = -self.K * self.T * np.exp(-self.r * self.T) * norm.cdf(-self.d2) * 0.01
-        else:
-            raise ValueError("option_type must be 'call' or 'put'")
-        
-        if option_position.lower() == 'short':
-            rho = -rho
-            
-        return rho
-    
+            float or numpy.ndarray: Rho value (for 1% change in interest rate)
+        """
+        theta_sign = _theta_sign(option_type)
+        sign = _position_sign(option_position)
+
+        rho = theta_sign * self.K * self.T * np.exp(-self.r * self.T) * norm_cdf(theta_sign * self.d2) * 0.01
+        # Rho is 0 at expiration
+        return _output(sign * np.where(self._expired, 0.0, rho))
+
     # Second-order Greeks
-    
+
     def charm(self, option_type, option_position='long'):
         """
         Calculate the charm of an option (derivative of delta with respect to time).
         Also known as delta decay.
-        
+
         Args:
-            option_type (str): 'call' or 'put'
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Charm value (daily)
+            float or numpy.ndarray: Charm value (daily)
         """
-        if np.isnan(self.d1):
-            return 0  # Charm is 0 at expiration
-            
-        d_pdf = norm.pdf(self.d1)
-        
-        charm = -d_pdf * ((self.r - self.d1 * self.sigma / (2 * np.sqrt(self.T))) / 
-                         (self.sigma * np.sqrt(self.T)))
-        
-        if option_type.lower() == 'put':
-            charm = -charm
-        
-        # Convert from yearly to daily
-        charm = charm / 365.0
-        
-        if option_position.lower() == 'short':
-            charm = -charm
-            
-        return charm
-    
+        theta_sign = _theta_sign(option_type)
+        sign = _position_sign(option_position)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sqrt_T = np.sqrt(np.maximum(self.T, 0.0))
+            charm = -norm_pdf(self.d1) * ((self.r - self.d1 * self.sigma / (2 * sqrt_T)) /
+                                          (self.sigma * sqrt_T))
+
+        # Sign flips for puts, convert from yearly to daily, 0 at expiration
+        return _output(sign * np.where(self._expired, 0.0, theta_sign * charm / 365.0))
+
     def vanna(self, option_position='long'):
         """
         Calculate the vanna of an option (derivative of delta with respect to volatility).
         Or derivative of vega with respect to spot price.
         Same for both calls and puts.
-        
+
         Args:
-            option_position (str): 'long' or 'short'
-            
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Vanna value
+            float or numpy.ndarray: Vanna value
         """
-        if np.isnan(self.d1):
-            return 0  # Vanna is 0 at expiration
-            
-        vanna = -norm.pdf(self.d1) * (self.d2 / self.sigma)
-        
-        if option_position.lower() == 'short':
-            vanna = -vanna
-            
-        return vanna
-    
+        vanna = -norm_pdf(self.d1) * (self.d2 / self.sigma)
+        # Vanna is 0 at expiration
+        return _output(_position_sign(option_position) * np.where(self._expired, 0.0, vanna))
+
     def volga(self, option_position='long'):
         """
         Calculate the volga of an option (second derivative with respect to volatility).
         Also known as vomma. Same for both calls and puts.
-        
+
         Args:
-            option_position (str): 'long' or 'short'
-            
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Volga value
+            float or numpy.ndarray: Volga value
         """
-        if np.isnan(self.d1):
-            return 0  # Volga is 0 at expiration
-            
         vega = self.vega(option_position='long') * 100  # Vega for 1 point change (not %)
         volga = vega * (self.d1 * self.d2 / self.sigma)
-        
-        if option_position.lower() == 'short':
-            volga = -volga
-            
-        return volga
-    
+        # Volga is 0 at expiration
+        return _output(_position_sign(option_position) * np.where(self._expired, 0.0, volga))
+
     def veta(self, option_position='long'):
         """
         Calculate the veta of an option (derivative of vega with respect to time).
         Same for both calls and puts.
-        
+
         Args:
-            option_position (str): 'long' or 'short'
-            
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Veta value (daily)
-        """
-        if np.isnan(self.d1):
-            return 0  # Veta is 0 at expiration
-            
-        veta = -self.S0 * norm.pdf(self.d1) * np.sqrt(self.T) * (
-            (self.r - self.d1 * self.sigma / (2 * np.sqrt(self.T))) /
-            (self.sigma * np.sqrt(self.T))
-        ) * 0.01
-        
-        # Convert from yearly to daily
-        veta = veta / 365.0
-        
-        if option_position.lower() == 'short':
-            veta = -veta
-            
-        return veta
-    
+            float or numpy.ndarray: Veta value (daily)
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sqrt_T = np.sqrt(np.maximum(self.T, 0.0))
+            veta = -self.S0 * norm_pdf(self.d1) * sqrt_T * (
+                (self.r - self.d1 * self.sigma / (2 * sqrt_T)) /
+                (self.sigma * sqrt_T)
+            ) * 0.01
+
+        # Convert from yearly to daily, 0 at expiration
+        return _output(_position_sign(option_position) * np.where(self._expired, 0.0, veta / 365.0))
+
     def get_greek(self, greek_name, option_type=None, option_position='long'):
         """
         Get a specific Greek value.
-        
+
         Args:
             greek_name (str): Name of the Greek ('delta', 'gamma', etc.)
-            option_type (str, optional): 'call' or 'put' (not needed for gamma, vega, vanna, volga)
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like, optional): 'call'/'put' or CALL/PUT flags
+                (not needed for gamma, vega, vanna, volga, veta)
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            float: Value of the specified Greek
+            float or numpy.ndarray: Value of the specified Greek
         """
         greek_name = greek_name.lower()
-        
+
         if greek_name in ['gamma', 'vega', 'vanna', 'volga', 'veta']:
             return getattr(self, greek_name)(option_position=option_position)
         elif greek_name in ['delta', 'theta', 'rho', 'charm']:
@@ -365,106 +422,233 @@ class BlackScholes:
             return getattr(self, greek_name)(option_type=option_type, option_position=option_position)
         else:
             raise ValueError(f"Unknown greek: {greek_name}")
-    
+
     def get_all_greeks(self, option_type, option_position='long'):
         """
         Get all Greeks for a specific option type and position.
-        
+
         Args:
-            option_type (str): 'call' or 'put'
-            option_position (str): 'long' or 'short'
-            
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
         Returns:
-            dict: Dictionary with all Greek values
-        """
-        return {
-            'delta': self.delta(option_type, option_position),
-            'gamma': self.gamma(option_position),
-            'theta': self.theta(option_type, option_position),
-            'vega': self.vega(option_position),
-            'rho': self.rho(option_type, option_position),
-            'charm': self.charm(option_type, option_position),
-            'vanna': self.vanna(option_position),
-            'volga': self.volga(option_position),
-            'veta': self.veta(option_position)
+            dict: Dictionary with all Greek values (arrays for array inputs)
+        """
+        greeks = self.price_and_greeks(option_type, option_position)
+        del greeks['price']
+        return greeks
+
+    def price_and_greeks(self, option_type, option_position='long'):
+        """
+        Compute the price and every first- and second-order Greek in a single pass.
+
+        The normal pdf/cdf, discount factor and square root of maturity are evaluated once
+        and shared by all outputs, instead of once per Greek as in the individual methods.
+
+        Args:
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
+        Returns:
+            dict: 'price', 'delta', 'gamma', 'theta', 'vega', 'rho', 'charm', 'vanna',
+                'volga' and 'veta', each broadcast to the shape of the inputs
+        """
+        kernels = self._kernels()
+        if kernels is not None:
+            return kernels._kernel_price_and_greeks(self.S0, self.K, self.r, self.sigma, self.T, option_type,
+                                                    option_position)
+
+        theta_sign = _theta_sign(option_type)
+        sign = _position_sign(option_position)
+        expired = self._expired
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Shared intermediates
+            sqrt_T = np.sqrt(np.where(expired, np.nan, self.T))
+            sigma_sqrt_T = self.sigma * sqrt_T
+            k_discount = self.K * np.exp(-self.r * self.T)
+            pdf_d1 = norm_pdf(self.d1)
+            cdf_d1 = norm_cdf(theta_sign * self.d1)
+            cdf_d2 = norm_cdf(theta_sign * self.d2)
+            vega_unit = self.S0 * sqrt_T * pdf_d1  # Vega for 1 point change (not %)
+            charm_unit = -pdf_d1 * (self.r - self.d1 * self.sigma / (2 * sqrt_T)) / sigma_sqrt_T
+
+            price = theta_sign * (self.S0 * cdf_d1 - k_discount * cdf_d2)
+            delta = theta_sign * cdf_d1
+            gamma = pdf_d1 / (self.S0 * sigma_sqrt_T)
+            theta = (-self.S0 * pdf_d1 * self.sigma / (2 * sqrt_T) - theta_sign * self.r * k_discount * cdf_d2) / 365.0
+            rho = theta_sign * self.T * k_discount * cdf_d2 * 0.01
+            charm = theta_sign * charm_unit / 365.0
+            vanna = -pdf_d1 * self.d2 / self.sigma
+            volga = vega_unit * self.d1 * self.d2 / self.sigma
+            veta = self.S0 * sqrt_T * charm_unit * 0.01 / 365.0
+
+        # At expiration the price is the intrinsic value, delta is 0 or +/-1 and the rest is 0
+        expired_price = np.maximum(theta_sign * (self.S0 - self.K), 0.0)
+        expired_delta = theta_sign * (theta_sign * (self.S0 - self.K) > 0)
+
+        result = {
+            'price': np.where(expired, expired_price, price),
+            'delta': np.where(expired, expired_delta, delta),
+            'gamma': gamma,
+            'theta': theta,
+            'vega': vega_unit * 0.01,
+            'rho': rho,
+            'charm': charm,
+            'vanna': vanna,
+            'volga': volga,
+            'veta': veta,
         }
+        for name, value in result.items():
+            if name not in ('price', 'delta'):
+                value = np.where(expired, 0.0, value)
+            result[name] = _output(sign * value)
+        return result
+
+# Default sweep ranges (min, max, steps) for each parameter
+DEFAULT_RANGES = {
+    'S0': (50, 150, 100),  # 50 to 150, 100 steps
+    'K': (50, 150, 100),
+    'r': (0, 0.1, 100),    # 0% to 10%, 100 steps
+    'sigma': (0.05, 0.5, 100), # 5% to 50%, 100 steps
+    'T': (0.01, 2, 100)    # 0.01 to 2 years, 100 steps
+}
+
+PARAM_LABELS = {
+    'S0': 'Spot Price',
+    'K': 'Strike Price',
+    'r': 'Risk-Free Rate',
+    'sigma': 'Implied Volatility',
+    'T': 'Time to Maturity (years)'
+}
+
+GREEKS_LABELS = {
+    'price': 'Price',
+    'delta': 'Delta',
+    'gamma': 'Gamma',
+    'theta': 'Theta (daily)',
+    'vega': 'Vega (1% change)',
+    'rho': 'Rho (1% change)',
+    'charm': 'Charm (daily)',
+    'vanna': 'Vanna',
+    'volga': 'Volga',
+    'veta': 'Veta (daily)'
+}
+
+
+def _evaluate(bs, greek, option_type, option_position):
+    """Evaluate the price or a Greek of a (batched) BlackScholes instance."""
+    if greek == 'price':
+        return bs.price(option_type, option_position)
+    return bs.get_greek(greek, option_type=option_type, option_position=option_position)
+
+
+def greek_sweep(
+    greek, param_name, option_type='call', option_position='long',
+    S0=100, K=100, r=0.05, sigma=0.2, T=1,
+    param_range=None, dtype=np.float64
+):
+    """
+    Evaluate the price or a Greek along one parameter in a single batched call.
+
+    Args:
+        greek (str): 'price' or name of the Greek ('delta', 'gamma', etc.)
+        param_name (str): Name of the parameter to vary ('S0', 'K', 'r', 'sigma', 'T')
+        option_type (str): 'call' or 'put'
+        option_position (str): 'long' or 'short'
+        S0, K, r, sigma, T: Values of the other Black-Scholes parameters
+        param_range (tuple, optional): Range for the parameter (min, max, steps)
+        dtype (numpy.dtype): Precision of the evaluation (np.float64 or np.float32)
+
+    Returns:
+        tuple: Parameter values and the corresponding values of the Greek
+    """
+    if param_range is None:
+        param_range = DEFAULT_RANGES[param_name]
+
+    min_val, max_val, steps = param_range
+    x_values = np.linspace(min_val, max_val, steps)
+
+    params = {'S0': S0, 'K': K, 'r': r, 'sigma': sigma, 'T': T}
+    params[param_name] = x_values
+    y_values = _evaluate(BlackScholes(**params, dtype=dtype), greek, option_type, option_position)
+    return x_values, np.broadcast_to(y_values, x_values.shape)
+
+
+def greek_surface(
+    greek, x_param='S0', y_param='sigma', option_type='call', option_position='long',
+    S0=100, K=100, r=0.05, sigma=0.2, T=1,
+    x_range=None, y_range=None, resolution=500, dtype=np.float64
+):
+    """
+    Evaluate the price or a Greek on a 2-D parameter grid (e.g. spot x vol, spot x maturity)
+    in a single batched call.
+
+    Args:
+        greek (str): 'price' or name of the Greek ('delta', 'gamma', etc.)
+        x_param (str): Parameter along the columns of the grid
+        y_param (str): Parameter along the rows of the grid
+        option_type (str): 'call' or 'put'
+        option_position (str): 'long' or 'short'
+        S0, K, r, sigma, T: Values of the parameters that are not swept
+        x_range (tuple, optional): (min, max, steps) for x_param, default range with `resolution` steps
+        y_range (tuple, optional): (min, max, steps) for y_param, default range with `resolution` steps
+        resolution (int): Number of steps of the default ranges
+        dtype (numpy.dtype): Precision of the evaluation (np.float64 or np.float32)
+
+    Returns:
+        tuple: x values, y values and a (len(y), len(x)) array of Greek values
+    """
+    if x_param == y_param:
+        raise ValueError("x_param and y_param must be different parameters")
+    if x_range is None:
+        x_range = DEFAULT_RANGES[x_param][:2] + (resolution,)
+    if y_range is None:
+        y_range = DEFAULT_RANGES[y_param][:2] + (resolution,)
+
+    x_values = np.linspace(*x_range)
+    y_values = np.linspace(*y_range)
+
+    params = {'S0': S0, 'K': K, 'r': r, 'sigma': sigma, 'T': T}
+    params[x_param] = x_values[np.newaxis, :]
+    params[y_param] = y_values[:, np.newaxis]
+    values = _evaluate(BlackScholes(**params, dtype=dtype), greek, option_type, option_position)
+    return x_values, y_values, np.broadcast_to(values, (y_values.size, x_values.size))
+
 
 def plot_greek_vs_parameter(
     greek, param_name, option_type, option_position='long',
     S0=100, K=100, r=0.05, sigma=0.2, T=1,
-    param_range=None
+    param_range=None, dtype=np.float64
 ):
     """
     Plot a Greek against a changing parameter.
     
     Args:
-        greek (str): Name of the Greek to plot
+        greek (str): Name of the Greek to plot (or 'price')
         param_name (str): Name of the parameter to vary ('S0', 'K', 'r', 'sigma', 'T')
         option_type (str): 'call' or 'put'
         option_position (str): 'long' or 'short'
         S0, K, r, sigma, T: Default values for the Black-Scholes parameters
         param_range (tuple, optional): Range for the parameter (min, max, steps)
+        dtype (numpy.dtype): Precision of the evaluation (np.float64 or np.float32)
     """
-    # Default ranges for parameters
-    default_ranges = {
-        'S0': (50, 150, 100),  # 50 to 150, 100 steps
-        'K': (50, 150, 100),
-        'r': (0, 0.1, 100),    # 0% to 10%, 100 steps
-        'sigma': (0.05, 0.5, 100), # 5% to 50%, 100 steps
-        'T': (0.01, 2, 100)    # 0.01 to 2 years, 100 steps
-    }
-    
-    # Use provided range or default
+    import matplotlib.pyplot as plt
+
     if param_range is None:
-        param_range = default_ranges[param_name]
-    
-    min_val, max_val, steps = param_range
-    x_values = np.linspace(min_val, max_val, steps)
-    y_values = []
-    
-    for x in x_values:
-        # Create BS model with the current parameter value
-        params = {'S0': S0, 'K': K, 'r': r, 'sigma': sigma, 'T': T}
-        params[param_name] = x
-        
-        bs = BlackScholes(**params)
-        
-        # Get the Greek value
-        if greek in ['gamma', 'vega', 'vanna', 'volga', 'veta']:
-            y = bs.get_greek(greek, option_position=option_position)
-        else:
-            y = bs.get_greek(greek, option_type=option_type, option_position=option_position)
-        
-        y_values.append(y)
+        param_range = DEFAULT_RANGES[param_name]
+    min_val, max_val, _ = param_range
+
+    x_values, y_values = greek_sweep(greek, param_name, option_type, option_position,
+                                     S0, K, r, sigma, T, param_range, dtype=dtype)
     
     # Create the plot
     plt.figure(figsize=(10, 6))
     plt.plot(x_values, y_values)
     
-    # Parameter-specific formatting
-    param_labels = {
-        'S0': 'Spot Price',
-        'K': 'Strike Price',
-        'r': 'Risk-Free Rate',
-        'sigma': 'Implied Volatility',
-        'T': 'Time to Maturity (years)'
-    }
-    
-    greeks_labels = {
-        'delta': 'Delta',
-        'gamma': 'Gamma',
-        'theta': 'Theta (daily)',
-        'vega': 'Vega (1% change)',
-        'rho': 'Rho (1% change)',
-        'charm': 'Charm (daily)',
-        'vanna': 'Vanna',
-        'volga': 'Volga',
-        'veta': 'Veta (daily)'
-    }
-    
-    plt.title(f'{greeks_labels[greek]} vs {param_labels[param_name]} for {option_position} {option_type}')
-    plt.xlabel(param_labels[param_name])
-    plt.ylabel(greeks_labels[greek])
+    plt.title(f'{GREEKS_LABELS[greek]} vs {PARAM_LABELS[param_name]} for {option_position} {option_type}')
+    plt.xlabel(PARAM_LABELS[param_name])
+    plt.ylabel(GREEKS_LABELS[greek])
     plt.grid(True)
     
     # Add vertical line at the current parameter value
@@ -475,8 +659,42 @@ def plot_greek_vs_parameter(
     plt.tight_layout()
     plt.show()
 
+def plot_greek_surface(
+    greek, x_param='S0', y_param='sigma', option_type='call', option_position='long',
+    S0=100, K=100, r=0.05, sigma=0.2, T=1,
+    x_range=None, y_range=None, resolution=500, dtype=np.float64
+):
+    """
+    Plot a Greek as a heatmap over two parameters.
+
+    Args:
+        greek (str): Name of the Greek to plot (or 'price')
+        x_param (str): Parameter on the horizontal axis
+        y_param (str): Parameter on the vertical axis
+        option_type (str): 'call' or 'put'
+        option_position (str): 'long' or 'short'
+        S0, K, r, sigma, T: Values of the parameters that are not swept
+        x_range, y_range (tuple, optional): (min, max, steps) of the swept parameters
+        resolution (int): Number of steps of the default ranges
+        dtype (numpy.dtype): Precision of the evaluation (np.float64 or np.float32)
+    """
+    import matplotlib.pyplot as plt
+
+    x_values, y_values, values = greek_surface(greek, x_param, y_param, option_type, option_position,
+                                               S0, K, r, sigma, T, x_range, y_range, resolution, dtype=dtype)
+
+    plt.figure(figsize=(10, 6))
+    mesh = plt.pcolormesh(x_values, y_values, values, shading='auto', cmap='viridis')
+    plt.colorbar(mesh, label=GREEKS_LABELS[greek])
+    plt.title(f'{GREEKS_LABELS[greek]} for {option_position} {option_type}')
+    plt.xlabel(PARAM_LABELS[x_param])
+    plt.ylabel(PARAM_LABELS[y_param])
+    plt.tight_layout()
+    plt.show()
+
 def interactive_greek_analysis():
     """Create an interactive widget to explore Greeks vs parameters."""
+    from ipywidgets import interact, FloatSlider, Dropdown
     
     def update_plot(greek, param, option_type, option_position, S0, K, r, sigma, T):
         plot_greek_vs_parameter(
@@ -555,6 +773,7 @@ def interactive_greek_analysis():
 
 def option_price_calculator():
     """Interactive widget to calculate option prices and Greeks."""
+    from ipywidgets import interact, FloatSlider, Dropdown
     
     def update_calculation(option_type, option_position, S0, K, r, sigma, T):
         bs = BlackScholes(S0, K, r, sigma, T)
@@ -630,7 +849,8 @@ def option_price_calculator():
         T=T_slider
     )
 
-# Example usage
+# Example usage (the package imports need "Useful tools" on the path):
+#     cd "Useful tools" && python -m templates.black_scholes
 if __name__ == "__main__":
     # Create an instance with default parameters
     bs = BlackScholes(S0=100, K=100, r=0.05, sigma=0.2, T=1)
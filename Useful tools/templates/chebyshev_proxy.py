@@ -0,0 +1,221 @@
+import numpy as np
+from templates.black_scholes import BlackScholes
+
+# Proxy dimensions, in coefficient-tensor order
+PARAMETERS = ('S0', 'sigma', 'T')
+
+# Relative slack allowed when checking that evaluation points lie in the box
+_BOX_TOLERANCE = 1e-12
+
+# Maximum size of the intermediate arrays of a point evaluation batch
+_BATCH_ELEMENTS = 4_000_000
+
+
+def chebyshev_nodes(n):
+    """
+    Chebyshev points of the first kind on [-1, 1].
+
+    Args:
+        n (int): Number of nodes
+
+    Returns:
+        numpy.ndarray: cos(pi * (j + 1/2) / n) for j = 0..n-1
+    """
+    return np.cos(np.pi * (np.arange(n) + 0.5) / n)
+
+
+def _basis(t, n):
+    """Chebyshev polynomials T_0..T_{n-1} at points t in [-1, 1], shape (len(t), n)."""
+    return np.cos(np.arccos(np.clip(t, -1.0, 1.0))[:, None] * np.arange(n))
+
+
+def _transform(n):
+    """Matrix mapping values at the n Chebyshev nodes to the n Chebyshev coefficients."""
+    matrix = 2.0 / n * np.cos(np.pi * np.outer(np.arange(n), np.arange(n) + 0.5) / n)
+    matrix[0] *= 0.5
+    return matrix
+
+
+def black_scholes_pricer(K, r, option_type, option_position='long'):
+    """
+    Exact Black-Scholes pricer of a contract set, in the form expected by ChebyshevProxy.fit.
+
+    Args:
+        K (float or array-like): Strike of each contract
+        r (float or array-like): Risk-free interest rate
+        option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+        option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
+    Returns:
+        callable: pricer(S0, sigma, T) -> prices of shape (n_points, n_contracts)
+    """
+    K = np.atleast_1d(np.asarray(K, dtype=float))
+
+    def pricer(S0, sigma, T):
+        bs = BlackScholes(S0[:, None], K, r, sigma[:, None], T[:, None])
+        return bs.price(option_type, option_position)
+
+    return pricer
+
+
+class ChebyshevProxy:
+    """
+    Tensor Chebyshev interpolant of a pricer over a box of spot, volatility and maturity.
+
+    The pricer is sampled once on a tensor grid of Chebyshev nodes for a fixed set of
+    contracts; repricing then only evaluates polynomials. A scattered point costs
+    prod(degrees) multiply-adds per contract, which pays off for models whose exact price
+    costs far more than that (Heston, Dupire); `grid` evaluates whole tensor grids of
+    scenarios separably and is much cheaper per point. The fit is checked against the
+    pricer on random points of the box, and the largest of that validation error and the
+    magnitude of the highest-order coefficients is reported as the error bound. The bound is
+    an a-posteriori estimate, reliable for the smooth prices of options that are not close
+    to expiry, not a proof.
+
+    Attributes:
+        bounds (numpy.ndarray): (3, 2) lower and upper bounds of S0, sigma and T
+        coefficients (numpy.ndarray): Chebyshev coefficients, shape degrees + (n_contracts,)
+        validation_error (float): Largest absolute error on the validation points
+        coefficient_tail (float): Sum of the absolute highest-order coefficients
+    """
+
+    def __init__(self, bounds, coefficients, validation_error=np.nan, coefficient_tail=np.nan):
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.validation_error = float(validation_error)
+        self.coefficient_tail = float(coefficient_tail)
+
+    @property
+    def degrees(self):
+        """Number of nodes (polynomial degree + 1) along S0, sigma and T."""
+        return self.coefficients.shape[:3]
+
+    @property
+    def error_bound(self):
+        """Estimated maximum absolute pricing error over the box."""
+        return max(self.validation_error, self.coefficient_tail)
+
+    @classmethod
+    def fit(cls, pricer, bounds, degrees=(24, 16, 16), n_validation=2_000, seed=0):
+        """
+        Sample a pricer on Chebyshev nodes and build the proxy.
+
+        Args:
+            pricer (callable): pricer(S0, sigma, T) taking 1-D arrays of points and returning
+                prices of shape (n_points, n_contracts), e.g. black_scholes_pricer(...)
+            bounds (dict or array-like): Parameter name -> (low, high), or a (3, 2) array in PARAMETERS order
+            degrees (tuple): Number of nodes along S0, sigma and T
+            n_validation (int): Number of random points used to measure the error
+            seed (int): Seed of the validation points
+
+        Returns:
+            ChebyshevProxy: The fitted proxy
+        """
+        if isinstance(bounds, dict):
+            bounds = [bounds[name] for name in PARAMETERS]
+        bounds = np.asarray(bounds, dtype=float)
+
+        nodes = [chebyshev_nodes(n) for n in degrees]
+        grid = np.meshgrid(*(_from_unit(t, low, high) for t, (low, high) in zip(nodes, bounds)), indexing='ij')
+        values = np.asarray(pricer(*(g.ravel() for g in grid)), dtype=float)
+        values = values.reshape(tuple(degrees) + (-1,))
+
+        coefficients = values
+        for axis, n in enumerate(degrees):
+            coefficients = np.moveaxis(np.tensordot(_transform(n), coefficients, axes=([1], [axis])), 0, axis)
+
+        tail = sum(np.abs(np.take(coefficients, -1, axis=axis)).sum(axis=tuple(range(2))).max()
+                   for axis in range(3))
+        proxy = cls(bounds, coefficients, coefficient_tail=tail)
+
+        if n_validation:
+            rng = np.random.default_rng(seed)
+            points = [rng.uniform(low, high, n_validation) for low, high in bounds]
+            proxy.validation_error = float(np.max(np.abs(proxy(*points) - pricer(*points))))
+        return proxy
+
+    def _bases(self, points):
+        """Chebyshev bases of the points along each dimension, checking they lie in the box."""
+        bases = []
+        for name, x, (low, high), n in zip(PARAMETERS, points, self.bounds, self.degrees):
+            slack = _BOX_TOLERANCE * (high - low)
+            if np.any((x < low - slack) | (x > high + slack)):
+                raise ValueError(f"{name} outside the proxy box [{low}, {high}]")
+            bases.append(_basis(_to_unit(x, low, high), n))
+        return bases
+
+    def __call__(self, S0, sigma, T):
+        """
+        Reprice the contract set at scattered points.
+
+        Args:
+            S0, sigma, T (float or array-like): Points inside the box, broadcast against each other
+
+        Returns:
+            numpy.ndarray: Prices of shape (n_points, n_contracts), or (n_contracts,) for scalar inputs
+        """
+        scalar = all(np.ndim(a) == 0 for a in (S0, sigma, T))
+        points = [np.ravel(a) for a in np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S0, sigma, T)))]
+        spot_basis, vol_basis, time_basis = self._bases(points)
+
+        n_spot, n_vol, n_time, n_contracts = self.coefficients.shape
+        flat_coefficients = self.coefficients.reshape(n_spot, -1)
+        prices = np.empty((points[0].size, n_contracts))
+        step = max(1, _BATCH_ELEMENTS // flat_coefficients.shape[1])
+        for start in range(0, points[0].size, step):
+            rows = slice(start, start + step)
+            # Contract the spot axis with a matrix product, then the vol and time axes point by point
+            partial = (spot_basis[rows] @ flat_coefficients).reshape(-1, n_vol, n_time * n_contracts)
+            partial = np.einsum('pj,pjm->pm', vol_basis[rows], partial).reshape(-1, n_time, n_contracts)
+            prices[rows] = np.einsum('pk,pkc->pc', time_basis[rows], partial)
+        return prices[0] if scalar else prices
+
+    def grid(self, S0, sigma, T):
+        """
+        Reprice the contract set on the tensor grid of the given spots, vols and maturities.
+
+        Args:
+            S0, sigma, T (array-like): 1-D grids inside the box
+
+        Returns:
+            numpy.ndarray: Prices of shape (len(S0), len(sigma), len(T), n_contracts)
+        """
+        spot_basis, vol_basis, time_basis = self._bases([np.atleast_1d(np.asarray(a, dtype=float))
+                                                         for a in (S0, sigma, T)])
+        prices = np.tensordot(spot_basis, self.coefficients, axes=([1], [0]))
+        prices = np.moveaxis(np.tensordot(vol_basis, prices, axes=([1], [1])), 0, 1)
+        return np.moveaxis(np.tensordot(time_basis, prices, axes=([1], [2])), 0, 2)
+
+    def save(self, path):
+        """
+        Save the proxy to a .npz file.
+
+        Args:
+            path (str): File path
+        """
+        np.savez(path, bounds=self.bounds, coefficients=self.coefficients,
+                 validation_error=self.validation_error, coefficient_tail=self.coefficient_tail)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a proxy saved with save().
+
+        Args:
+            path (str): File path
+
+        Returns:
+            ChebyshevProxy: The proxy
+        """
+        with np.load(path) as data:
+            return cls(data['bounds'], data['coefficients'], data['validation_error'], data['coefficient_tail'])
+
+
+def _to_unit(x, low, high):
+    """Map [low, high] to [-1, 1]."""
+    return (2.0 * x - (low + high)) / (high - low)
+
+
+def _from_unit(t, low, high):
+    """Map [-1, 1] to [low, high]."""
+    return 0.5 * (low + high) + 0.5 * (high - low) * t
@@ -0,0 +1,176 @@
+"""
+Vectorized Monte Carlo pricing of path-dependent payoffs under geometric Brownian motion.
+
+    dS = (r - q) S dt + sigma S dW
+
+Paths are simulated exactly on the time grid (log-normal increments, no discretization bias)
+as an (n_paths, n_steps + 1) matrix, S0 in column 0: the normals of a chunk of rows are drawn
+at once and turned into log-prices by a cumulative sum along axis 1, in float64 whatever the
+output precision, then exponentiated into the output matrix. The payoffs are functions of that
+matrix, such as the Asian templates of this package, which evaluate every path at once.
+
+Large runs are split into path batches held in memory one at a time, each with its own child
+stream of a numpy SeedSequence: a (seed, batch_paths) pair always reproduces the same paths.
+Several payoffs can be priced on the same paths (price_book), so that a book of averaging
+products costs one simulation.
+"""
+
+import numpy as np
+from scipy.special import ndtri
+
+# Paths simulated and held in memory at once (252 steps: about 100 MB in float64)
+DEFAULT_BATCH_PATHS = 50_000
+
+# Two-sided level of the confidence intervals
+DEFAULT_CONFIDENCE = 0.95
+
+# Elements of the float64 log-price workspace (8 MB), filled one chunk of rows at a time
+_CHUNK_ELEMENTS = 2**20
+
+
+class MonteCarloResult:
+    """
+    Discounted Monte Carlo price with its sampling error.
+
+    Attributes:
+        price (float): Discounted mean payoff
+        stderr (float): Standard error of the price
+        confidence_interval (tuple): (low, high) bounds at the confidence level
+        confidence (float): Two-sided confidence level of the interval
+        n_paths (int): Number of simulated paths
+    """
+
+    def __init__(self, price, stderr, confidence, n_paths):
+        self.price = price
+        self.stderr = stderr
+        self.confidence = confidence
+        self.n_paths = n_paths
+        half_width = ndtri(0.5 + 0.5 * confidence) * stderr
+        self.confidence_interval = (price - half_width, price + half_width)
+
+    def __repr__(self):
+        low, high = self.confidence_interval
+        return (f"MonteCarloResult(price={self.price:.6g}, stderr={self.stderr:.2g}, "
+                f"{100 * self.confidence:g}% CI=[{low:.6g}, {high:.6g}], n_paths={self.n_paths})")
+
+
+class GBMMonteCarlo:
+    """
+    Exact GBM path simulator and payoff pricer.
+
+    Attributes:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        sigma (float): Volatility
+        T (float): Horizon in years
+        n_steps (int): Number of time steps (the paths have n_steps + 1 dates, S0 included)
+        q (float): Dividend yield
+        seed (int): Seed of the SeedSequence the path batches are spawned from
+    """
+
+    def __init__(self, S0, r, sigma, T, n_steps, q=0.0, seed=0):
+        """
+        Args:
+            S0 (float): Spot price
+            r (float): Risk-free rate
+            sigma (float): Volatility
+            T (float): Horizon in years
+            n_steps (int): Number of time steps
+            q (float): Dividend yield
+            seed (int): Seed of the random streams
+        """
+        self.S0 = float(S0)
+        self.r = float(r)
+        self.sigma = float(sigma)
+        self.T = float(T)
+        self.n_steps = int(n_steps)
+        self.q = float(q)
+        self.seed = seed
+
+    def _generator(self, batch):
+        """Independent, reproducible stream of a path batch."""
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(batch,)))
+
+    def simulate(self, n_paths, batch=0, dtype=np.float64):
+        """
+        Simulate price paths.
+
+        Args:
+            n_paths (int): Number of paths
+            batch (int): Index of the random stream, batch b of `price` is simulate(..., batch=b)
+            dtype: np.float64, or np.float32 to halve the memory of the stored prices (the
+                log-prices are still summed in float64)
+
+        Returns:
+            numpy.ndarray: Prices of shape (n_paths, n_steps + 1), S0 in column 0
+        """
+        dt = self.T / self.n_steps
+        paths = np.empty((n_paths, self.n_steps + 1), dtype=dtype)
+        rng = self._generator(batch)
+        rows_per_chunk = max(1, min(n_paths, _CHUNK_ELEMENTS // (self.n_steps + 1)))
+        workspace = np.empty((rows_per_chunk, self.n_steps + 1))
+        for start in range(0, n_paths, rows_per_chunk):
+            rows = slice(start, min(start + rows_per_chunk, n_paths))
+            log_paths = workspace[:rows.stop - start]
+            # Normals drawn straight into the (contiguous) workspace, the first column is then overwritten
+            rng.standard_normal(out=log_paths)
+            log_paths[:, 0] = 0.0
+            increments = log_paths[:, 1:]
+            increments *= self.sigma * np.sqrt(dt)
+            increments += (self.r - self.q - 0.5 * self.sigma * self.sigma) * dt
+            np.cumsum(log_paths, axis=1, out=log_paths)
+            np.exp(log_paths, out=log_paths)
+            log_paths *= self.S0
+            paths[rows] = log_paths
+        return paths
+
+    def price(self, payoff, n_paths, batch_paths=DEFAULT_BATCH_PATHS, dtype=np.float64,
+              confidence=DEFAULT_CONFIDENCE):
+        """
+        Discounted expected payoff, simulated batch by batch.
+
+        Args:
+            payoff (callable): Maps a (batch, n_steps + 1) price matrix to one payoff per path,
+                e.g. lambda paths: OptionAsianFixedStrike(paths, strike=100, window=21).payoff()
+            n_paths (int): Total number of paths
+            batch_paths (int): Paths simulated and held in memory at once
+            dtype: Precision of the simulated prices
+            confidence (float): Two-sided level of the confidence interval
+
+        Returns:
+            MonteCarloResult: Price, standard error and confidence interval
+        """
+        return self.price_book({None: payoff}, n_paths, batch_paths, dtype, confidence)[None]
+
+    def price_book(self, payoffs, n_paths, batch_paths=DEFAULT_BATCH_PATHS, dtype=np.float64,
+                   confidence=DEFAULT_CONFIDENCE):
+        """
+        Price several payoffs on the same simulated paths.
+
+        Args:
+            payoffs (dict): Payoff callables (see price) by name
+            n_paths (int): Total number of paths
+            batch_paths (int): Paths simulated and held in memory at once
+            dtype: Precision of the simulated prices
+            confidence (float): Two-sided level of the confidence intervals
+
+        Returns:
+            dict: MonteCarloResult by payoff name
+        """
+        total = dict.fromkeys(payoffs, 0.0)
+        total_sq = dict.fromkeys(payoffs, 0.0)
+        for batch, start in enumerate(range(0, n_paths, batch_paths)):
+            paths = self.simulate(min(batch_paths, n_paths - start), batch, dtype)
+            for name, payoff in payoffs.items():
+                values = np.asarray(payoff(paths), dtype=np.float64)
+                total[name] += values.sum()
+                total_sq[name] += np.dot(values, values)
+
+        discount = np.exp(-self.r * self.T)
+        results = {}
+        for name in payoffs:
+            mean = total[name] / n_paths
+            variance = max(total_sq[name] / n_paths - mean * mean, 0.0) * n_paths / max(n_paths - 1, 1)
+            results[name] = MonteCarloResult(discount * mean, discount * np.sqrt(variance / n_paths), confidence,
+                                             n_paths)
+        return results
@@ -0,0 +1,259 @@
+"""
+Semi-analytic Heston pricer.
+
+    dS = r S dt + sqrt(v) S dW1
+    dv = kappa (theta - v) dt + xi sqrt(v) dW2,    d<W1, W2> = rho dt
+
+European prices use the Lewis (2001) single-integral formula on the characteristic function
+of ln(S_T / F) in the "little trap" formulation of Albrecher et al. (2007), which has no
+branch-cut discontinuity of the complex logarithm. The integral is computed by Gauss-Legendre
+quadrature on [0, u_max(T)]; u_max is found per maturity from the decay of the characteristic
+function and the number of nodes grows with u_max and the log-moneyness of the strikes (the
+integrand oscillates like cos(u ln(F/K))). Nodes are cached per size. The characteristic
+function is evaluated once per maturity and shared by all the strikes of that maturity.
+"""
+
+from functools import lru_cache
+import numpy as np
+from templates.black_scholes import _call_mask, _position_sign, _output
+
+# Model parameters, in the order of the gradient outputs
+HESTON_PARAMETERS = ('kappa', 'theta', 'xi', 'rho', 'v0')
+
+# Minimum number of quadrature nodes per maturity
+DEFAULT_NODES = 128
+_MAX_NODES = 8192
+
+# The Lewis integral is truncated where the neglected tail is below _TOLERANCE
+_TOLERANCE = 1e-12
+_ENVELOPE_GRID = np.geomspace(1e-2, 1e5, 141)
+
+
+@lru_cache(maxsize=16)
+def gauss_legendre(n_nodes):
+    """
+    Gauss-Legendre nodes and weights on [0, 1] (cached).
+
+    Args:
+        n_nodes (int): Number of nodes
+
+    Returns:
+        tuple: Read-only nodes and weights arrays
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(n_nodes)
+    nodes, weights = 0.5 * (nodes + 1.0), 0.5 * weights
+    nodes.flags.writeable = weights.flags.writeable = False
+    return nodes, weights
+
+
+def _complex_log1p(z):
+    """log(1 + z) accurate for small complex z (numpy's complex log1p is computed as log(1 + z))."""
+    return 0.5 * np.log1p(z.real * (2.0 + z.real) + z.imag * z.imag) + 1j * np.arctan2(z.imag, 1.0 + z.real)
+
+
+class HestonModel:
+    """
+    Heston stochastic volatility model.
+
+    Attributes:
+        S0 (float): Current stock price (spot)
+        r (float): Risk-free interest rate (annual)
+        kappa (float): Speed of mean reversion of the variance
+        theta (float): Long-run variance
+        xi (float): Volatility of the variance
+        rho (float): Correlation between the stock and variance Brownian motions
+        v0 (float): Initial variance
+    """
+
+    def __init__(self, S0, r, kappa, theta, xi, rho, v0):
+        self.S0 = float(S0)
+        self.r = float(r)
+        self.kappa = float(kappa)
+        self.theta = float(theta)
+        self.xi = float(xi)
+        self.rho = float(rho)
+        self.v0 = float(v0)
+
+    @property
+    def params(self):
+        """dict: Model parameters by name (HESTON_PARAMETERS)"""
+        return {name: getattr(self, name) for name in HESTON_PARAMETERS}
+
+    def characteristic_function(self, u, T, gradient=False):
+        """
+        Characteristic function of X = ln(S_T / F), F being the forward, so that E[exp(X)] = 1.
+
+        Args:
+            u (complex or array-like): Argument(s)
+            T (float or array-like): Maturity (broadcast against u)
+            gradient (bool): Also return the derivatives with respect to HESTON_PARAMETERS
+
+        Returns:
+            numpy.ndarray: E[exp(i u X)], and with gradient=True a tuple with its derivatives
+                stacked on a leading axis of length 5
+        """
+        u = np.asarray(u, dtype=complex)
+        T = np.asarray(T, dtype=float)
+        kappa, theta, xi, rho, v0 = self.kappa, self.theta, self.xi, self.rho, self.v0
+
+        a = 1j * u + u * u
+        beta = kappa - 1j * rho * xi * u
+        d = np.sqrt(beta * beta + xi * xi * a)
+        beta_plus_d = beta + d
+        # beta - d without cancellation, (beta - d) / xi^2 stays finite for a small vol of vol
+        beta_minus_d = -a / beta_plus_d
+        # Little trap: g = (beta - d) / (beta + d) keeps |g exp(-dT)| < 1
+        g = xi * xi * beta_minus_d / beta_plus_d
+        exp_dT = np.exp(-d * T)
+        one_minus_g_exp = 1.0 - g * exp_dT
+        log_ratio = _complex_log1p(g * (1.0 - exp_dT) / (1.0 - g))
+        C = kappa * theta * (beta_minus_d * T - 2.0 / (xi * xi) * log_ratio)
+        D = beta_minus_d * (1.0 - exp_dT) / one_minus_g_exp
+        phi = np.exp(C + D * v0)
+        if not gradient:
+            return phi
+
+        # Chain rule through beta and d, parameter by parameter (kappa, xi, rho move beta and d)
+        dbeta = {'kappa': 1.0, 'xi': -1j * rho * u, 'rho': -1j * xi * u}
+        dd = {name: (beta * value + (xi * a if name == 'xi' else 0.0)) / d for name, value in dbeta.items()}
+        dphi = np.empty((len(HESTON_PARAMETERS),) + phi.shape, dtype=complex)
+        for i, name in enumerate(HESTON_PARAMETERS):
+            if name == 'theta':
+                dphi[i] = phi * C / theta
+                continue
+            if name == 'v0':
+                dphi[i] = phi * D
+                continue
+            db, dd_ = dbeta[name], dd[name]
+            dbeta_minus_d = -beta_minus_d * (db + dd_) / beta_plus_d
+            dg = 2.0 * (d * db - beta * dd_) / (beta_plus_d * beta_plus_d)
+            dexp_dT = -T * exp_dT * dd_
+            dg_exp = dg * exp_dT + g * dexp_dT
+            dlog_ratio = dg / (1.0 - g) - dg_exp / one_minus_g_exp
+            dC = kappa * theta * (dbeta_minus_d * T - 2.0 / (xi * xi) * dlog_ratio)
+            if name == 'kappa':
+                dC = dC + C / kappa
+            elif name == 'xi':
+                dC = dC + 4.0 * kappa * theta / xi ** 3 * log_ratio
+            dD = (dbeta_minus_d * (1.0 - exp_dT) - beta_minus_d * dexp_dT + D * dg_exp) / one_minus_g_exp
+            dphi[i] = phi * (dC + dD * v0)
+        return phi, dphi
+
+    def _upper_limit(self, T):
+        """
+        Truncation of the Lewis integral for one maturity.
+
+        The integrand is bounded by |phi(u - i/2)| / u^2, so the tail beyond u_max is bounded by
+        u_max times the largest envelope value past u_max.
+        """
+        u = _ENVELOPE_GRID
+        envelope = np.abs(self.characteristic_function(u - 0.5j, T)) / (u * u + 0.25)
+        tail = u * np.maximum.accumulate(envelope[::-1])[::-1]
+        inside = np.flatnonzero(tail > _TOLERANCE)
+        return u[min(inside[-1] + 1, u.size - 1)] if inside.size else u[0]
+
+    def call_price(self, K, T, n_nodes=DEFAULT_NODES):
+        """
+        Lewis formula for calls, vectorized over strikes and maturities.
+
+        C = exp(-rT) [F - sqrt(F K) / pi * int_0^inf Re(exp(i u x) phi(u - i/2)) / (u^2 + 1/4) du]
+        with x = ln(F / K).
+
+        Args:
+            K (float or array-like): Strike price
+            T (float or array-like): Time to maturity (in years), broadcast against K
+            n_nodes (int): Minimum number of quadrature nodes per maturity
+
+        Returns:
+            numpy.ndarray: Call prices
+        """
+        return self._lewis(K, T, n_nodes, gradient=False)
+
+    def _lewis(self, K, T, n_nodes, gradient):
+        """Call prices, and with gradient=True their derivatives on a trailing axis (HESTON_PARAMETERS)."""
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        prices = np.array(np.maximum(self.S0 - K, 0.0))  # Expired options are worth their intrinsic value
+        derivatives = np.zeros(K.shape + (len(HESTON_PARAMETERS),))
+        alive = np.flatnonzero(T > 0)
+        if not alive.size:
+            return (prices, derivatives) if gradient else prices
+
+        flat_prices = prices.reshape(-1)
+        flat_derivatives = derivatives.reshape(-1, len(HESTON_PARAMETERS))
+        K_alive, T_alive = K.reshape(-1)[alive], T.reshape(-1)[alive]
+        forward = self.S0 * np.exp(self.r * T_alive)
+        x = np.log(forward / K_alive)
+        # The characteristic function only depends on the maturity: evaluate it once per maturity
+        order = np.argsort(T_alive, kind='stable')
+        maturities, starts = np.unique(T_alive[order], return_index=True)
+        for maturity, contracts in zip(maturities, np.split(order, starts[1:])):
+            upper = self._upper_limit(maturity)
+            # About three nodes per period of cos(u x), plus the oscillation of phi itself
+            size = max(n_nodes, int(0.5 * upper * (np.abs(x[contracts]).max() + 1.0)) + 64)
+            nodes, weights = gauss_legendre(min(1 << (size - 1).bit_length(), _MAX_NODES))
+            u = upper * nodes
+            kernel = upper * weights / (u * u + 0.25)
+            ux = np.multiply.outer(x[contracts], u)            # (n_contracts, n_nodes)
+            cos_ux, sin_ux = np.cos(ux), np.sin(ux)
+            f, k = forward[contracts], K_alive[contracts]
+            scale = np.exp(-self.r * maturity) * np.sqrt(f * k) / np.pi
+            if gradient:
+                phi, dphi = self.characteristic_function(u - 0.5j, maturity, gradient=True)
+                # Re(exp(iux) dphi) integrated for the 5 parameters in two matrix products
+                weighted = dphi * kernel
+                flat_derivatives[alive[contracts]] = -scale[:, None] * (cos_ux @ weighted.real.T -
+                                                                        sin_ux @ weighted.imag.T)
+            else:
+                phi = self.characteristic_function(u - 0.5j, maturity)
+            phi = phi * kernel
+            integral = cos_ux @ phi.real - sin_ux @ phi.imag
+            flat_prices[alive[contracts]] = np.exp(-self.r * maturity) * f - scale * integral
+        return (prices, derivatives) if gradient else prices
+
+    def price(self, K, T, option_type, option_position='long', n_nodes=DEFAULT_NODES):
+        """
+        Calculate option prices.
+
+        Use K[np.newaxis, :] and T[:, np.newaxis] to price a whole strike x maturity grid.
+
+        Args:
+            K (float or array-like): Strike price
+            T (float or array-like): Time to maturity (in years), broadcast against K
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+            n_nodes (int): Minimum number of quadrature nodes per maturity
+
+        Returns:
+            float or numpy.ndarray: Option price (positive for long, negative for short)
+        """
+        is_call = _call_mask(option_type)
+        K, T, is_call = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float), is_call)
+        call = self.call_price(K, T, n_nodes)
+        # Put-call parity, expired puts are worth their intrinsic value
+        put = np.where(T > 0, call - self.S0 + K * np.exp(-self.r * T), np.maximum(K - self.S0, 0.0))
+        return _output(_position_sign(option_position) * np.where(is_call, call, put))
+
+    def price_and_gradient(self, K, T, option_type, option_position='long', n_nodes=DEFAULT_NODES):
+        """
+        Option prices and their analytic derivatives with respect to the model parameters.
+
+        The derivatives of the characteristic function are integrated on the same nodes as the
+        price, so the gradient is exact for the discretized price (as needed by a calibration).
+
+        Args:
+            K (float or array-like): Strike price
+            T (float or array-like): Time to maturity (in years), broadcast against K
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+            n_nodes (int): Minimum number of quadrature nodes per maturity
+
+        Returns:
+            tuple: Prices and their derivatives, on a trailing axis ordered as HESTON_PARAMETERS
+        """
+        is_call = _call_mask(option_type)
+        K, T, is_call = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float), is_call)
+        call, derivatives = self._lewis(K, T, n_nodes, gradient=True)
+        # Put-call parity: puts and calls have the same parameter sensitivities
+        put = np.where(T > 0, call - self.S0 + K * np.exp(-self.r * T), np.maximum(K - self.S0, 0.0))
+        sign = _position_sign(option_position)
+        return _output(sign * np.where(is_call, call, put)), np.asarray(sign)[..., None] * derivatives
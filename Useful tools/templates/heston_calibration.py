@@ -0,0 +1,255 @@
+"""
+Heston calibration to an option chain.
+
+The parameters minimize the vega-weighted price errors
+
+    sum_i ((C_heston(K_i, T_i) - C_market,i) / vega_i)^2
+
+which to first order is the sum of squared implied-volatility errors, without solving for a
+Heston implied volatility at every iteration. scipy.optimize.least_squares ('trf', within
+CALIBRATION_BOUNDS) is given the analytic Jacobian of HestonModel.price_and_gradient, so an
+iteration costs one evaluation of the characteristic function and of its derivatives per
+expiry instead of six.
+
+Several starting points are fitted concurrently on a process pool and the best fit wins. When
+the previous snapshot's parameters are given they are fitted first: between two snapshots a few
+minutes apart the market moves little, so the warm start usually converges in a handful of
+iterations and the other starts are only needed when it does not fit well.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import least_squares
+from templates.black_scholes import CALL, PUT, BlackScholes, _call_mask
+from templates.heston import HESTON_PARAMETERS, HestonModel
+
+# Box constraints of the fit, in the order of HESTON_PARAMETERS
+CALIBRATION_BOUNDS = {
+    'kappa': (1e-3, 20.0),
+    'theta': (1e-4, 2.0),
+    'xi': (1e-2, 5.0),
+    'rho': (-0.999, 0.999),
+    'v0': (1e-4, 2.0),
+}
+
+# Starting point without a previous snapshot, and the box the extra starts are drawn from
+DEFAULT_START = {'kappa': 2.0, 'theta': 0.04, 'xi': 0.5, 'rho': -0.6, 'v0': 0.04}
+_START_BOX = {'kappa': (0.5, 5.0), 'theta': (0.01, 0.25), 'xi': (0.2, 1.5), 'rho': (-0.9, 0.2), 'v0': (0.01, 0.25)}
+
+# A converged warm start within this RMSE (about 0.5 volatility point) skips the other starts
+WARM_START_RMSE = 5e-3
+
+# Vegas are floored at this fraction of S0 * sqrt(T) so that far wings do not dominate the fit
+_MIN_RELATIVE_VEGA = 1e-3
+
+
+class CalibrationResult:
+    """
+    Outcome of a Heston calibration.
+
+    Attributes:
+        params (dict): Fitted parameters by name (HESTON_PARAMETERS)
+        rmse (float): Root mean square vega-weighted error, about the implied-volatility RMSE
+        price_rmse (float): Root mean square price error
+        iterations (int): Jacobian evaluations of the best start
+        evaluations (int): Residual evaluations summed over all the starts
+        wall_time (float): Elapsed time of the calibration in seconds
+        n_starts (int): Number of starting points actually fitted
+        success (bool): Whether the best start met a convergence criterion
+    """
+
+    def __init__(self, params, rmse, price_rmse, iterations, evaluations, wall_time, n_starts, success):
+        self.params = params
+        self.rmse = rmse
+        self.price_rmse = price_rmse
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.wall_time = wall_time
+        self.n_starts = n_starts
+        self.success = success
+
+    def __repr__(self):
+        params = ", ".join(f"{name}={value:.4g}" for name, value in self.params.items())
+        return (f"CalibrationResult({params}; rmse={self.rmse:.2e}, iterations={self.iterations}, "
+                f"wall_time={self.wall_time * 1e3:.0f} ms)")
+
+    def model(self, S0, r):
+        """Return the HestonModel with the fitted parameters."""
+        return HestonModel(S0, r, **self.params)
+
+
+def calibration_inputs(book, spot, r, underlying=None, as_of=None, min_maturity=7 / 365, moneyness=(0.5, 1.5)):
+    """
+    Select the calibration instruments of an OptionBook: out-of-the-money calls and puts
+    with a price and a published implied volatility, within a forward-moneyness range.
+
+    Args:
+        book (OptionBook): Option chain, e.g. OptionBook.from_cboe(CboeApi().get_option_quotes(ticker))
+        spot (float): Spot price of the underlying
+        r (float): Risk-free rate
+        underlying (str, optional): Underlying to select when the book holds several
+        as_of (str or numpy.datetime64, optional): Valuation time, the snapshot time by default
+        min_maturity (float): Shortest maturity kept, in years
+        moneyness (tuple): Lowest and highest K / F kept
+
+    Returns:
+        dict: K, T, price, option_type and vega arrays, the keyword arguments of calibrate_heston
+    """
+    if underlying is not None:
+        book = book.view(underlying)
+    T = book.time_to_maturity(as_of)
+    forward = spot * np.exp(r * T)
+    K, price, sigma, option_type = book.strike, book.price, book.implied_vol, book.option_type
+    otm = np.where(option_type == CALL, K >= forward, K < forward)
+    keep = (otm & (T >= min_maturity) & (price > 0) & (sigma > 0) & np.isfinite(price) & np.isfinite(sigma)
+            & (K >= moneyness[0] * forward) & (K <= moneyness[1] * forward))
+    vega = BlackScholes(spot, K[keep], r, sigma[keep], T[keep]).vega() * 100  # per unit of volatility
+    return {'K': K[keep], 'T': T[keep], 'price': price[keep], 'option_type': option_type[keep], 'vega': vega}
+
+
+def _fit(x0, S0, r, K, T, price, option_type, weight, max_nfev):
+    """Worker: least-squares fit from one starting point."""
+    cache = {}
+
+    def evaluate(x):
+        key = x.tobytes()
+        if key not in cache:  # least_squares asks for the residuals and the Jacobian at the same point
+            model_price, gradient = HestonModel(S0, r, *x).price_and_gradient(K, T, option_type)
+            cache.clear()
+            cache[key] = ((model_price - price) * weight, gradient * weight[:, None])
+        return cache[key]
+
+    lower, upper = np.array(list(CALIBRATION_BOUNDS.values())).T
+    fit = least_squares(lambda x: evaluate(x)[0], x0, jac=lambda x: evaluate(x)[1], bounds=(lower, upper),
+                        method='trf', x_scale='jac', max_nfev=max_nfev)
+    return fit.x, fit.fun, fit.nfev, fit.njev, fit.status > 0
+
+
+def _starts(initial, n_starts, seed):
+    """Warm start (or DEFAULT_START) followed by n_starts - 1 random points of _START_BOX."""
+    first = initial if initial is not None else DEFAULT_START
+    lower, upper = np.array([_START_BOX[name] for name in HESTON_PARAMETERS]).T
+    random = np.random.default_rng(seed).uniform(lower, upper, (max(n_starts - 1, 0), len(HESTON_PARAMETERS)))
+    return [np.array([first[name] for name in HESTON_PARAMETERS], dtype=float)] + list(random)
+
+
+def calibrate_heston(S0, r, K, T, price, option_type, vega=None, initial=None, n_starts=4, executor=None,
+                     seed=0, max_nfev=100, warm_rmse=WARM_START_RMSE):
+    """
+    Fit the Heston parameters to market prices by vega-weighted least squares.
+
+    Args:
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        K, T, price (array-like): Strikes, maturities (in years) and market prices
+        option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+        vega (array-like, optional): Black-Scholes vegas per unit of volatility at the market
+            implied volatilities, no weighting by default
+        initial (dict, optional): Warm start, e.g. the params of the previous snapshot's result.
+            It is fitted first, and the other starts only run if its RMSE is above warm_rmse
+        n_starts (int): Number of starting points, the warm start included
+        executor (concurrent.futures.Executor, optional): Pool running the starts, the starts
+            are fitted one after the other in this process by default
+        seed (int): Seed of the random starting points
+        max_nfev (int): Maximum number of residual evaluations per start
+        warm_rmse (float): RMSE under which a converged warm start is accepted on its own
+
+    Returns:
+        CalibrationResult: Best fit over the starts
+    """
+    start = time.perf_counter()
+    K, T, price = (np.asarray(a, dtype=float) for a in (K, T, price))
+    option_type = np.broadcast_to(np.where(_call_mask(option_type), CALL, PUT), K.shape)
+    if vega is None:
+        weight = np.ones_like(K)
+    else:
+        weight = 1.0 / np.maximum(np.asarray(vega, dtype=float), _MIN_RELATIVE_VEGA * S0 * np.sqrt(T))
+
+    args = (S0, r, K, T, price, option_type, weight, max_nfev)
+    starts = _starts(initial, n_starts, seed)
+    fits = []
+    if initial is not None:
+        # A good warm fit makes the other starts unnecessary
+        fits.append(_fit(starts.pop(0), *args))
+        if fits[0][4] and np.sqrt(np.mean(fits[0][1] ** 2)) <= warm_rmse:
+            starts = []
+    if executor is None:
+        fits += [_fit(x0, *args) for x0 in starts]
+    else:
+        fits += [future.result() for future in [executor.submit(_fit, x0, *args) for x0 in starts]]
+
+    x, residuals, _, iterations, success = min(fits, key=lambda fit: np.sum(fit[1] ** 2))
+    return CalibrationResult(
+        params=dict(zip(HESTON_PARAMETERS, x.tolist())),
+        rmse=float(np.sqrt(np.mean(residuals ** 2))),
+        price_rmse=float(np.sqrt(np.mean((residuals / weight) ** 2))),
+        iterations=int(iterations),
+        evaluations=int(sum(fit[2] for fit in fits)),
+        wall_time=time.perf_counter() - start,
+        n_starts=len(fits),
+        success=bool(success),
+    )
+
+
+class HestonCalibrator:
+    """
+    Repeated calibration of several underlyings, snapshot after snapshot.
+
+    Keeps the worker pool alive between calls and the last fitted parameters of each underlying,
+    which warm-start its next calibration:
+
+        with HestonCalibrator(n_workers=4) as calibrator:
+            book = OptionBook.from_cboe(CboeApi().get_option_quotes("AAPL"))
+            result = calibrator.calibrate(book, "AAPL", spot, r)
+    """
+
+    def __init__(self, n_workers=None, n_starts=4, seed=0):
+        """
+        Args:
+            n_workers (int, optional): Number of worker processes, os.cpu_count() by default
+                (1 fits in the calling process)
+            n_starts (int): Starting points per calibration, the warm start included
+            seed (int): Seed of the random starting points
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.n_starts = n_starts
+        self.seed = seed
+        self.previous = {}
+        self._executor = None
+
+    def __enter__(self):
+        if self.n_workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the worker pool down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def calibrate(self, book, underlying, spot, r, as_of=None, **selection):
+        """
+        Calibrate one underlying of a chain snapshot, warm-started from its previous fit.
+
+        Args:
+            book (OptionBook): Option chain snapshot
+            underlying (str): Underlying to calibrate
+            spot (float): Spot price
+            r (float): Risk-free rate
+            as_of (str or numpy.datetime64, optional): Valuation time, the snapshot time by default
+            **selection: min_maturity and moneyness of calibration_inputs
+
+        Returns:
+            CalibrationResult: Best fit, also stored in self.previous[underlying]
+        """
+        inputs = calibration_inputs(book, spot, r, underlying, as_of, **selection)
+        result = calibrate_heston(spot, r, **inputs, initial=self.previous.get(underlying), n_starts=self.n_starts,
+                                  executor=self._executor, seed=self.seed)
+        self.previous[underlying] = result.params
+        return result
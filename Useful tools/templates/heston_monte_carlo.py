@@ -0,0 +1,208 @@
+"""
+Monte Carlo simulation of the Heston model with Andersen's quadratic-exponential (QE) scheme.
+
+The variance is advanced with the QE moment-matched draws of Andersen (2008): a squared
+Gaussian when the variance is far from zero (psi <= psi_c), an exponential with a mass at zero
+otherwise, so v stays non-negative without truncation bias. The log-price uses the matching
+central discretization of the integrated variance (gamma1 = gamma2 = 1/2).
+
+All paths advance together, one vectorized update per time step (or, with the 'numba' backend
+of templates.pricing_kernels, one compiled pass over the paths per chunk of steps). Normals are drawn for
+chunk_steps steps at a time and only the observation dates are stored, so the memory is
+n_paths x (number of observations) plus a bounded workspace. Large runs are split into path
+batches, each with its own child stream of a numpy SeedSequence: a (seed, batch_paths) pair
+always reproduces the same paths, whatever the number of batches priced. The normals come from
+NumPy in both backends, so the two agree to rounding.
+"""
+
+import math
+import numpy as np
+from scipy.special import ndtr
+from templates.gbm_monte_carlo import DEFAULT_CONFIDENCE, MonteCarloResult
+from templates.pricing_kernels import get_backend
+
+try:
+    import numba
+except ImportError:  # Numba is optional
+    numba = None
+
+# Switching level of the QE scheme between the quadratic and the exponential variance draws
+PSI_CRITICAL = 1.5
+
+# Time steps whose normals are drawn at once, and paths simulated per batch by `price`
+DEFAULT_CHUNK_STEPS = 16
+DEFAULT_BATCH_PATHS = 100_000
+
+
+_SQRT_2 = math.sqrt(2.0)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _qe_kernel(log_s, v, normals, constants, psi_critical, columns, prices, variances):
+        drift, decay, theta, c1, c2, K0, K1, K2, K3, K4 = constants
+        for i in numba.prange(log_s.size):
+            x, var = log_s[i], v[i]
+            for j in range(normals.shape[0]):
+                z_v, z_s = normals[j, 0, i], normals[j, 1, i]
+                mean = theta + (var - theta) * decay
+                psi = (c1 * var + c2) / (mean * mean)
+                if psi <= psi_critical:
+                    inv_psi = 2.0 / psi
+                    b2 = inv_psi - 1.0 + math.sqrt(inv_psi * (inv_psi - 1.0))
+                    var_next = mean / (1.0 + b2) * (math.sqrt(b2) + z_v) ** 2
+                else:
+                    p = (psi - 1.0) / (psi + 1.0)
+                    u = 0.5 * math.erfc(-z_v / _SQRT_2)
+                    var_next = 0.0 if u <= p else math.log((1.0 - p) / (1.0 - u)) * mean / (1.0 - p)
+                x += drift + K0 + K1 * var + K2 * var_next + math.sqrt(K3 * var + K4 * var_next) * z_s
+                var = var_next
+                if columns[j] >= 0:
+                    prices[i, columns[j]] = math.exp(x)
+                    if variances.shape[0]:
+                        variances[i, columns[j]] = var
+            log_s[i], v[i] = x, var
+
+
+class HestonMonteCarlo:
+    """
+    QE path simulator for a HestonModel.
+
+    Attributes:
+        model (HestonModel): Model whose S0, r and parameters are simulated
+        T (float): Horizon in years
+        n_steps (int): Number of time steps (the paths have n_steps + 1 dates, S0 included)
+        seed (int): Seed of the SeedSequence the path batches are spawned from
+    """
+
+    def __init__(self, model, T, n_steps, seed=0, chunk_steps=DEFAULT_CHUNK_STEPS, psi_critical=PSI_CRITICAL):
+        """
+        Args:
+            model (HestonModel): Model to simulate
+            T (float): Horizon in years
+            n_steps (int): Number of time steps
+            seed (int): Seed of the random streams
+            chunk_steps (int): Time steps whose normals are drawn at once
+            psi_critical (float): Switching level of the QE scheme, in [1, 2]
+        """
+        self.model = model
+        self.T = float(T)
+        self.n_steps = int(n_steps)
+        self.seed = seed
+        self.chunk_steps = int(chunk_steps)
+        self.psi_critical = psi_critical
+
+    def _generator(self, batch):
+        """Independent, reproducible stream of a path batch."""
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(batch,)))
+
+    def _qe_variance(self, v, z_v, constants):
+        """One QE step of the variance of every path (NumPy backend)."""
+        _, decay, theta, c1, c2 = constants[:5]
+        mean = theta + (v - theta) * decay
+        psi = (c1 * v + c2) / (mean * mean)
+        v_next = np.empty_like(v)
+
+        quadratic = psi <= self.psi_critical
+        inv_psi = 2.0 / psi[quadratic]
+        b2 = inv_psi - 1.0 + np.sqrt(inv_psi * (inv_psi - 1.0))
+        v_next[quadratic] = mean[quadratic] / (1.0 + b2) * (np.sqrt(b2) + z_v[quadratic]) ** 2
+
+        # Exponential branch, the uniform is taken from the same normal
+        exponential = ~quadratic
+        p = (psi[exponential] - 1.0) / (psi[exponential] + 1.0)
+        u = ndtr(z_v[exponential])
+        with np.errstate(divide='ignore'):
+            v_next[exponential] = np.where(u <= p, 0.0, np.log((1.0 - p) / (1.0 - u)) * mean[exponential] / (1.0 - p))
+        return v_next
+
+    def simulate(self, n_paths, observe=None, batch=0, dtype=np.float64, return_variance=False):
+        """
+        Simulate price paths.
+
+        Args:
+            n_paths (int): Number of paths
+            observe (array-like, optional): Dates stored, as indices in 0..n_steps (0 is S0);
+                every date by default
+            batch (int): Index of the random stream, batch b of `price` is simulate(..., batch=b)
+            dtype: Precision of the stored prices (the simulation runs in float64)
+            return_variance (bool): Also return the variance at the observation dates
+
+        Returns:
+            numpy.ndarray: Prices of shape (n_paths, number of observations), and the variances
+                with return_variance=True
+        """
+        m = self.model
+        observe = np.arange(self.n_steps + 1) if observe is None else np.asarray(observe)
+        stored = np.zeros(self.n_steps + 1, dtype=bool)
+        stored[observe] = True
+        column = np.cumsum(stored) - 1  # Column of each stored date
+        prices = np.empty((n_paths, stored.sum()), dtype=dtype)
+        variances = np.empty_like(prices) if return_variance else None
+
+        dt = self.T / self.n_steps
+        decay = np.exp(-m.kappa * dt)
+        # Moments of v(t + dt) given v(t): m = theta + (v - theta) decay, s^2 = c1 v + c2
+        c1 = m.xi * m.xi * decay * (1.0 - decay) / m.kappa
+        c2 = m.theta * m.xi * m.xi * (1.0 - decay) ** 2 / (2.0 * m.kappa)
+        # Log-price increment: r dt + K0 + K1 v + K2 v' + sqrt(K3 v + K4 v') Z
+        K0 = -m.rho * m.kappa * m.theta * dt / m.xi
+        K1 = 0.5 * dt * (m.kappa * m.rho / m.xi - 0.5) - m.rho / m.xi
+        K2 = 0.5 * dt * (m.kappa * m.rho / m.xi - 0.5) + m.rho / m.xi
+        K3 = K4 = 0.5 * dt * (1.0 - m.rho * m.rho)
+        drift = m.r * dt
+        constants = (drift, decay, m.theta, c1, c2, K0, K1, K2, K3, K4)
+
+        rng = self._generator(batch)
+        log_s = np.full(n_paths, np.log(m.S0))
+        v = np.full(n_paths, m.v0)
+        if stored[0]:
+            prices[:, 0] = m.S0
+            if return_variance:
+                variances[:, 0] = m.v0
+        for chunk_start in range(0, self.n_steps, self.chunk_steps):
+            steps = min(self.chunk_steps, self.n_steps - chunk_start)
+            normals = rng.standard_normal((steps, 2, n_paths))
+            step_columns = np.where(stored[chunk_start + 1:chunk_start + steps + 1],
+                                    column[chunk_start + 1:chunk_start + steps + 1], -1)
+            if get_backend() == 'numba':
+                _qe_kernel(log_s, v, normals, constants, self.psi_critical, step_columns, prices,
+                           variances if return_variance else np.empty((0, 0), dtype=dtype))
+                continue
+            for j in range(steps):
+                v_next = self._qe_variance(v, normals[j, 0], constants)
+                log_s += drift + K0 + K1 * v + K2 * v_next + np.sqrt(K3 * v + K4 * v_next) * normals[j, 1]
+                v = v_next
+                if step_columns[j] >= 0:
+                    prices[:, step_columns[j]] = np.exp(log_s)
+                    if return_variance:
+                        variances[:, step_columns[j]] = v
+        return (prices, variances) if return_variance else prices
+
+    def price(self, payoff, n_paths, batch_paths=DEFAULT_BATCH_PATHS, observe=None, dtype=np.float64,
+              confidence=DEFAULT_CONFIDENCE):
+        """
+        Discounted expected payoff, simulated batch by batch.
+
+        Args:
+            payoff (callable): Maps a (batch, number of observations) price matrix to one payoff
+                per path, e.g. lambda paths: OptionAsianFixedStrike(paths, strike=100, window=21).payoff()
+            n_paths (int): Total number of paths
+            batch_paths (int): Paths simulated and held in memory at once
+            observe (array-like, optional): Dates stored, see simulate
+            dtype: Precision of the stored prices
+            confidence (float): Two-sided level of the confidence interval
+
+        Returns:
+            MonteCarloResult: Price, standard error and confidence interval
+        """
+        total = total_sq = 0.0
+        for batch, start in enumerate(range(0, n_paths, batch_paths)):
+            paths = self.simulate(min(batch_paths, n_paths - start), observe, batch, dtype)
+            values = np.asarray(payoff(paths), dtype=np.float64)
+            total += values.sum()
+            total_sq += np.dot(values, values)
+        mean = total / n_paths
+        variance = max(total_sq / n_paths - mean * mean, 0.0) * n_paths / max(n_paths - 1, 1)
+        discount = np.exp(-self.model.r * self.T)
+        return MonteCarloResult(discount * mean, discount * np.sqrt(variance / n_paths), confidence, n_paths)
@@ -0,0 +1,242 @@
+import numpy as np
+from scipy.special import erfcx, ndtr, ndtri
+from templates.black_scholes import _call_mask
+from templates.rational_implied_volatility import HOUSEHOLDER_ITERATIONS, rational_total_volatility
+
+# Per-contract solver status codes
+CONVERGED = 0
+BELOW_INTRINSIC = 1
+ABOVE_MAXIMUM = 2
+ZERO_VEGA = 3
+NOT_CONVERGED = 4
+INVALID_INPUT = 5
+TIME_VALUE_LOST = 6
+
+STATUS = {
+    CONVERGED: "converged",
+    BELOW_INTRINSIC: "price at or below intrinsic value",
+    ABOVE_MAXIMUM: "price at or above the no-arbitrage maximum",
+    ZERO_VEGA: "vega underflows, volatility undetermined",
+    NOT_CONVERGED: "maximum number of iterations reached",
+    INVALID_INPUT: "non-positive or missing input",
+    TIME_VALUE_LOST: "time value lost in the rounding of the premium",
+}
+
+METHODS = ('newton', 'rational')
+
+# Relative repricing error below which a fixed-iteration rational solution is accepted
+_RATIONAL_ACCEPTANCE = 1e-8
+
+# Time values within this many ulps of the undiscounted premium are rounding noise
+_ROUNDING_ULPS = 8
+
+_SQRT_2 = np.sqrt(2.0)
+_SQRT_2_OVER_PI = np.sqrt(2.0 / np.pi)
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+class ImpliedVolatilityResult:
+    """
+    Implied volatilities of an option chain with per-contract diagnostics.
+
+    Attributes:
+        sigma (numpy.ndarray): Implied volatility (annualized), NaN where the solver failed
+        status (numpy.ndarray): Status code of each contract (see STATUS)
+        iterations (numpy.ndarray): Number of iterations used by each contract
+    """
+
+    def __init__(self, sigma, status, iterations):
+        self.sigma = sigma
+        self.status = status
+        self.iterations = iterations
+
+    @property
+    def converged(self):
+        """Boolean mask of the contracts whose implied volatility was found."""
+        return self.status == CONVERGED
+
+    @property
+    def failed(self):
+        """Boolean mask of the contracts whose implied volatility could not be found."""
+        return self.status != CONVERGED
+
+    def failures(self):
+        """
+        Group the failed contracts by reason.
+
+        Returns:
+            dict: Status description -> indices of the contracts that failed for that reason
+        """
+        return {STATUS[code]: np.flatnonzero(self.status == code)
+                for code in STATUS if code != CONVERGED and np.any(self.status == code)}
+
+
+def _normalized_otm_inputs(price, forward, strike, maturity, option_type, rate):
+    """
+    Reduce every contract to an out-of-the-money call on a unit strike.
+
+    The undiscounted out-of-the-money price divided by max(forward, strike) is
+    c(s) = exp(x) * N(x/s + s/2) - N(x/s - s/2) with x = -|ln(F/K)| <= 0 and s = sigma * sqrt(T),
+    using put-call parity for in-the-money options and put/call symmetry for puts.
+
+    Returns:
+        tuple: x, normalized target price, its maximum, the rounding noise of the target (a few
+            ulps of the premium it was computed from) and the broadcast maturity
+    """
+    price, forward, strike, maturity, rate, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(forward, dtype=float), np.asarray(strike, dtype=float),
+        np.asarray(maturity, dtype=float), np.asarray(rate, dtype=float), _call_mask(option_type))
+
+    theta = np.where(is_call, 1.0, -1.0)
+    undiscounted = price * np.exp(rate * maturity)
+    # Remove the intrinsic value of in-the-money options (put-call parity)
+    otm_price = undiscounted - np.maximum(theta * (forward - strike), 0.0)
+
+    x = -np.abs(np.log(forward / strike))
+    scale = np.maximum(forward, strike)
+    noise = _ROUNDING_ULPS * np.finfo(float).eps * undiscounted / scale
+    return x, otm_price / scale, np.exp(x), noise, maturity
+
+
+def normalized_otm_call(x, s):
+    """
+    Normalized out-of-the-money call price and the derivative of its logarithm.
+
+    Away from the money the price is computed as a difference of scaled complementary
+    error functions, which does not underflow or cancel where both N() terms are tiny.
+
+    Args:
+        x (numpy.ndarray): Log-moneyness -|ln(F/K)|
+        s (numpy.ndarray): Total volatility sigma * sqrt(T)
+
+    Returns:
+        tuple: log c(s) and d log c / ds
+    """
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        h = x / s
+        t = 0.5 * s
+        tail = h + t < 0
+        # c = 1/2 exp(x/2 - (h^2 + t^2)/2) [erfcx(-(h+t)/sqrt2) - erfcx(-(h-t)/sqrt2)]
+        erfcx_difference = erfcx(-(h + t) / _SQRT_2) - erfcx(-(h - t) / _SQRT_2)
+        log_c_tail = np.log(0.5 * erfcx_difference) + 0.5 * x - 0.5 * (h * h + t * t)
+        dlog_c_tail = _SQRT_2_OVER_PI / erfcx_difference
+
+        c = np.exp(x) * ndtr(h + t) - ndtr(h - t)
+        log_c = np.log(c)
+        dlog_c = _INV_SQRT_2PI * np.exp(-0.5 * (h - t) ** 2) / c
+    return np.where(tail, log_c_tail, log_c), np.where(tail, dlog_c_tail, dlog_c)
+
+
+def _newton_solve(x, target, tol, max_iter):
+    """
+    Safeguarded Newton iterations on log c(s) - log(target), run in lock-step on all contracts.
+
+    log c(s) is increasing and concave, so Newton converges monotonically once an iterate is
+    below the root. Each contract keeps a bracket [lo, hi] and falls back to bisection whenever
+    a Newton step leaves it or is not finite.
+
+    Returns:
+        tuple: Total volatility, iterations used and convergence mask
+    """
+    # Initial guess from the small-price asymptotic log c ~ -x^2 / (2 s^2), exact at the money
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(x < 0, -x / np.sqrt(-2.0 * np.log(target)), 2.0 * ndtri(0.5 * (1.0 + target)))
+    lo = np.zeros_like(s)
+    hi = np.full_like(s, np.inf)
+    log_target = np.log(target)
+    iterations = np.zeros(s.shape, dtype=np.int64)
+    converged = np.zeros(s.shape, dtype=bool)
+
+    active = np.arange(s.size)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        s_active, lo_active, hi_active = s[active], lo[active], hi[active]
+        log_c, dlog_c = normalized_otm_call(x[active], s_active)
+        g = log_c - log_target[active]
+
+        done = np.abs(g) < tol
+        lo_active = np.where(g < 0, s_active, lo_active)
+        hi_active = np.where(g > 0, s_active, hi_active)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s_next = s_active - g / dlog_c
+        outside = ~np.isfinite(s_next) | (s_next <= lo_active) | (s_next >= hi_active)
+        bisection = np.where(np.isfinite(hi_active), 0.5 * (lo_active + hi_active), 2.0 * s_active)
+
+        s[active] = np.where(done, s_active, np.where(outside, bisection, s_next))
+        lo[active], hi[active] = lo_active, hi_active
+        iterations[active] += 1
+        converged[active] = done
+        active = active[~done]
+
+    return s, iterations, converged
+
+
+def implied_volatility(price, forward, strike, maturity, option_type, rate=0.0, method='newton',
+                       tol=1e-12, max_iter=100):
+    """
+    Back out Black implied volatilities for a whole option chain at once.
+
+    All inputs are broadcast against each other. With method='newton' contracts are solved
+    in lock-step with safeguarded Newton iterations, and the ones that converge drop out of
+    the active set. With method='rational' every contract gets a rational initial guess and
+    the same fixed number of Householder steps (see templates.rational_implied_volatility);
+    a result is accepted when it reprices the option to 1e-8 relative error. Deep in-the-money
+    contracts whose time value is within a few ulps of the premium are flagged TIME_VALUE_LOST
+    instead of being solved from rounding noise.
+
+    Args:
+        price (float or array-like): Option premium (discounted)
+        forward (float or array-like): Forward price of the underlying for the option maturity
+            (S0 * exp(r * T) without dividends)
+        strike (float or array-like): Strike price
+        maturity (float or array-like): Time to maturity (in years)
+        option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+        rate (float or array-like): Risk-free interest rate used to discount the premium
+        method (str): 'newton' or 'rational'
+        tol (float): Tolerance on the relative error of the out-of-the-money price ('newton' only)
+        max_iter (int): Maximum number of iterations ('newton' only)
+
+    Returns:
+        ImpliedVolatilityResult: Volatilities, status codes and iteration counts
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+
+    x, target, max_target, noise, maturity = _normalized_otm_inputs(price, forward, strike, maturity, option_type,
+                                                                    rate)
+    shape = x.shape
+    x, target, max_target, noise, maturity = (np.ravel(a) for a in (x, target, max_target, noise, maturity))
+
+    status = np.full(x.shape, NOT_CONVERGED, dtype=np.int8)
+    status[~(target < max_target)] = ABOVE_MAXIMUM
+    # Subnormal prices have lost their relative precision along with their vega
+    status[(target > 0) & (target < np.finfo(float).tiny)] = ZERO_VEGA
+    # Deep in the money, what is left after removing the intrinsic value can be pure rounding
+    status[(target > 0) & (target <= noise)] = TIME_VALUE_LOST
+    status[~(target > 0)] = BELOW_INTRINSIC
+    status[~(np.isfinite(x) & (maturity > 0) & np.isfinite(target))] = INVALID_INPUT
+
+    solvable = status == NOT_CONVERGED
+    total_vol = np.full(x.shape, np.nan)
+    iterations = np.zeros(x.shape, dtype=np.int64)
+    if method == 'newton':
+        s, iterations[solvable], converged = _newton_solve(x[solvable], target[solvable], tol, max_iter)
+        log_c, dlog_c = normalized_otm_call(x[solvable], s)
+    else:
+        # The rational engine uses the price normalized by sqrt(F * K) instead of max(F, K)
+        beta = target[solvable] * np.exp(-0.5 * x[solvable])
+        s = rational_total_volatility(x[solvable], beta)
+        iterations[solvable] = HOUSEHOLDER_ITERATIONS
+        log_c, dlog_c = normalized_otm_call(x[solvable], s)
+        with np.errstate(invalid='ignore'):
+            converged = np.abs(log_c - np.log(target[solvable])) < _RATIONAL_ACCEPTANCE
+
+    solved_status = np.where(converged, CONVERGED, NOT_CONVERGED)
+    # Vega and price underflow together: the volatility cannot be resolved
+    solved_status[~converged & ~(np.isfinite(log_c) & np.isfinite(dlog_c))] = ZERO_VEGA
+    status[solvable] = solved_status
+    total_vol[solvable] = np.where(converged, s, np.nan)
+
+    sigma = (total_vol / np.sqrt(maturity)).reshape(shape)
+    return ImpliedVolatilityResult(sigma, status.reshape(shape), iterations.reshape(shape))
@@ -0,0 +1,265 @@
+"""
+Dupire local volatility surface built from an implied-volatility chain.
+
+Construction (once per chain snapshot):
+    1. Each expiry slice of implied vols is fitted by a raw SVI total variance
+       w(k) = a + b (rho (k - m) + sqrt((k - m)^2 + s^2)), k = ln(K / F(T)), with a >= 0 and
+       b (1 + |rho|) <= 2: the wing slopes b (1 +/- rho) of the total variance stay within
+       Lee's moment bound of 2, whatever the maturity. This keeps the slices smooth with
+       admissible wings, but butterfly arbitrage is not checked.
+    2. The slices are evaluated on a dense log-moneyness grid and made non-decreasing in T
+       (no calendar arbitrage); between expiries w is linear in T, before the first expiry
+       and after the last one the implied vol is held flat.
+    3. Gatheral's form of the Dupire formula in total variance is applied with vectorized
+       finite differences (numpy.gradient) on the dense (T, k) grid.
+
+Queries sigma_loc(S, t) and sigma_imp(K, T) are bilinear interpolations on the stored grid,
+located with numpy.searchsorted: O(log n) per point, vectorized over points, with no refit or
+differentiation.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from scipy.optimize import least_squares
+from templates.black_scholes import CALL
+
+# Dense grid of the surface: maturities x log-moneyness points
+DEFAULT_GRID = (100, 200)
+
+# Local volatilities are clipped to this range (holes and spikes of noisy chains)
+LOCAL_VOL_BOUNDS = (0.01, 3.0)
+
+# Surfaces kept by from_book, least recently used evicted first
+SURFACE_CACHE_SIZE = 16
+
+# Lee's moment bound on both wing slopes b (1 -/+ rho) of the total variance
+LEE_WING_BOUND = 2.0
+
+# Slices with fewer usable quotes are not fitted
+_MIN_QUOTES = 5
+
+_surface_cache = OrderedDict()
+
+
+def svi_total_variance(k, params):
+    """
+    Raw SVI total implied variance.
+
+    Args:
+        k (array-like): Log-moneyness ln(K / F)
+        params (array-like): (a, b, rho, m, s), broadcast against k along a trailing axis
+
+    Returns:
+        numpy.ndarray: Total variance sigma^2 T
+    """
+    a, b, rho, m, s = np.moveaxis(np.asarray(params, dtype=float), -1, 0)
+    x = np.asarray(k) - m
+    return a + b * (rho * x + np.sqrt(x * x + s * s))
+
+
+def _svi_from_wing_slopes(params):
+    """(a, b, rho, m, s) from (a, left slope b (1 - rho), right slope b (1 + rho), m, s)."""
+    a, left, right, m, s = params
+    b = 0.5 * (left + right)
+    return np.array([a, b, (right - left) / max(left + right, 1e-12), m, s])
+
+
+def fit_svi(k, total_variance):
+    """
+    Least-squares raw SVI fit of one expiry slice, with wing slopes within Lee's bound.
+
+    The fit runs on the wing slopes b (1 - rho) and b (1 + rho) of the total variance instead
+    of (b, rho), so that box bounds [0, LEE_WING_BOUND] on both enforce b (1 + |rho|) <= 2.
+
+    Args:
+        k (numpy.ndarray): Log-moneyness of the quotes
+        total_variance (numpy.ndarray): Market total variance sigma^2 T of the quotes
+
+    Returns:
+        numpy.ndarray: (a, b, rho, m, s)
+    """
+    w_max = total_variance.max()
+    b0 = 0.1 * np.sqrt(w_max)
+    x0 = np.array([0.5 * total_variance.min(), 1.5 * b0, 0.5 * b0, 0.0, 0.1])
+    lower = [0.0, 0.0, 0.0, 2 * k.min(), 1e-3]
+    upper = [w_max, LEE_WING_BOUND, LEE_WING_BOUND, 2 * k.max(), 2.0]
+    x0 = np.clip(x0, lower, upper)
+    fit = least_squares(lambda p: svi_total_variance(k, _svi_from_wing_slopes(p)) - total_variance, x0,
+                        bounds=(lower, upper), x_scale='jac')
+    return _svi_from_wing_slopes(fit.x)
+
+
+def _bilinear_indices(grid, values):
+    """Left grid index and weight of each value, clipped to the grid (flat extrapolation)."""
+    values = np.clip(values, grid[0], grid[-1])
+    i = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, grid.size - 2)
+    return i, (values - grid[i]) / (grid[i + 1] - grid[i])
+
+
+class LocalVolatilitySurface:
+    """
+    Dupire local volatility on a dense (maturity, log-moneyness) grid.
+
+    Attributes:
+        S0 (float): Spot price of the snapshot
+        r (float): Risk-free rate (forwards are S0 exp(r T))
+        maturities (numpy.ndarray): Grid maturities in years
+        log_moneyness (numpy.ndarray): Grid log-moneyness ln(K / F(T))
+        total_variance (numpy.ndarray): Calendar-monotone SVI total variance on the grid
+        local_vol (numpy.ndarray): Local volatility on the grid
+        expiries (numpy.ndarray): Maturities of the fitted slices
+        svi_params (numpy.ndarray): (a, b, rho, m, s) of each slice
+    """
+
+    def __init__(self, S0, r, maturities, log_moneyness, total_variance, local_vol, expiries, svi_params):
+        self.S0 = float(S0)
+        self.r = float(r)
+        self.maturities = maturities
+        self.log_moneyness = log_moneyness
+        self.total_variance = total_variance
+        self.local_vol = local_vol
+        self.expiries = expiries
+        self.svi_params = svi_params
+
+    @classmethod
+    def from_implied_vols(cls, S0, r, K, T, sigma, grid=DEFAULT_GRID, k_range=None):
+        """
+        Build the surface from implied volatility quotes.
+
+        Args:
+            S0 (float): Spot price
+            r (float): Risk-free rate
+            K, T, sigma (array-like): Strikes, maturities (in years) and implied volatilities
+            grid (tuple): Number of grid maturities and log-moneyness points
+            k_range (tuple, optional): Log-moneyness range of the grid, the quoted range by default
+
+        Returns:
+            LocalVolatilitySurface: The surface
+        """
+        K, T, sigma = (np.asarray(a, dtype=float).ravel() for a in (K, T, sigma))
+        k = np.log(K / (S0 * np.exp(r * T)))
+        usable = (T > 0) & (sigma > 0) & np.isfinite(sigma) & np.isfinite(k)
+        k, T, w = k[usable], T[usable], sigma[usable] ** 2 * T[usable]
+
+        expiries, slice_index, counts = np.unique(T, return_inverse=True, return_counts=True)
+        fitted = counts >= _MIN_QUOTES
+        if not fitted.any():
+            raise ValueError(f"No expiry has the {_MIN_QUOTES} implied volatilities needed for a fit")
+        svi_params = np.array([fit_svi(k[slice_index == i], w[slice_index == i])
+                               for i in np.flatnonzero(fitted)])
+        expiries = expiries[fitted]
+
+        n_maturities, n_strikes = grid
+        k_range = k_range if k_range is not None else (k.min(), k.max())
+        log_moneyness = np.linspace(*k_range, n_strikes)
+        maturities = np.linspace(expiries[-1] / n_maturities, expiries[-1], n_maturities)
+
+        # Slices on the grid, non-decreasing in T, then linear in T between expiries
+        slices = np.maximum.accumulate(svi_total_variance(log_moneyness[:, None], svi_params).T, axis=0)
+        j = np.clip(np.searchsorted(expiries, maturities) - 1, 0, None)
+        upper = np.minimum(j + 1, expiries.size - 1)
+        before = maturities < expiries[0]
+        weight = np.where(upper > j, (maturities - expiries[j]) / (expiries[upper] - expiries[j] + 1e-300), 0.0)
+        total_variance = (1 - weight)[:, None] * slices[j] + weight[:, None] * slices[upper]
+        # Flat implied vol before the first expiry
+        total_variance[before] = slices[0] * (maturities[before] / expiries[0])[:, None]
+
+        local_vol = cls._dupire(maturities, log_moneyness, total_variance)
+        return cls(S0, r, maturities, log_moneyness, total_variance, local_vol, expiries, svi_params)
+
+    @classmethod
+    def from_book(cls, book, spot, r, underlying=None, as_of=None, grid=DEFAULT_GRID, min_maturity=7 / 365,
+                  moneyness=(0.5, 2.0)):
+        """
+        Build, or reuse, the surface of an OptionBook snapshot from its out-of-the-money quotes.
+
+        Surfaces are cached per (underlying, snapshot time, spot, rate, grid): repeated calls on
+        the same snapshot return the same object without refitting.
+
+        Args:
+            book (OptionBook): Option chain, e.g. OptionBook.from_cboe(CboeApi().get_option_quotes(ticker))
+            spot (float): Spot price of the underlying
+            r (float): Risk-free rate
+            underlying (str, optional): Underlying to select when the book holds several
+            as_of (str or numpy.datetime64, optional): Valuation time, the snapshot time by default
+            grid (tuple): Number of grid maturities and log-moneyness points
+            min_maturity (float): Shortest maturity used, in years
+            moneyness (tuple): Lowest and highest K / F used
+
+        Returns:
+            LocalVolatilitySurface: The surface
+        """
+        as_of = as_of if as_of is not None else book.as_of
+        key = (underlying, None if as_of is None else str(as_of), float(spot), float(r), tuple(grid), min_maturity,
+               tuple(moneyness))
+        if as_of is not None and key in _surface_cache:
+            _surface_cache.move_to_end(key)
+            return _surface_cache[key]
+
+        if underlying is not None:
+            book = book.view(underlying)
+        T = book.time_to_maturity(as_of)
+        forward = spot * np.exp(r * T)
+        K, option_type = book.strike, book.option_type
+        keep = (np.where(option_type == CALL, K >= forward, K < forward) & (T >= min_maturity)
+                & (K >= moneyness[0] * forward) & (K <= moneyness[1] * forward))
+        surface = cls.from_implied_vols(spot, r, K[keep], T[keep], book.implied_vol[keep], grid)
+
+        if as_of is not None:
+            _surface_cache[key] = surface
+            while len(_surface_cache) > SURFACE_CACHE_SIZE:
+                _surface_cache.popitem(last=False)
+        return surface
+
+    @staticmethod
+    def _dupire(maturities, log_moneyness, w):
+        """Gatheral's local variance from total variance with finite differences on the grid."""
+        dw_dT = np.gradient(w, maturities, axis=0)
+        dw_dk = np.gradient(w, log_moneyness, axis=1)
+        d2w_dk2 = np.gradient(dw_dk, log_moneyness, axis=1)
+        k = log_moneyness[None, :]
+        denominator = (1.0 - k / w * dw_dk + 0.25 * (-0.25 - 1.0 / w + k * k / (w * w)) * dw_dk ** 2
+                       + 0.5 * d2w_dk2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            local_variance = dw_dT / denominator
+        # Butterfly or calendar violations of the data give non-positive values: clip them
+        local_variance = np.where((denominator > 0) & np.isfinite(local_variance), local_variance, 0.0)
+        return np.clip(np.sqrt(np.maximum(local_variance, 0.0)), *LOCAL_VOL_BOUNDS)
+
+    def _interpolate(self, values, k, t):
+        i, u = _bilinear_indices(self.maturities, t)
+        j, v = _bilinear_indices(self.log_moneyness, k)
+        return ((1 - u) * ((1 - v) * values[i, j] + v * values[i, j + 1])
+                + u * ((1 - v) * values[i + 1, j] + v * values[i + 1, j + 1]))
+
+    def __call__(self, S, t):
+        """
+        Local volatility sigma_loc(S, t).
+
+        Args:
+            S (float or array-like): Underlying price
+            t (float or array-like): Time in years, broadcast against S
+
+        Returns:
+            float or numpy.ndarray: Local volatility, flat outside the grid
+        """
+        S, t = np.broadcast_arrays(np.asarray(S, dtype=float), np.asarray(t, dtype=float))
+        result = self._interpolate(self.local_vol, np.log(S / self.S0) - self.r * t, t)
+        return result[()] if result.ndim == 0 else result
+
+    def implied_vol(self, K, T):
+        """
+        Implied volatility of the fitted (calendar-monotone) surface.
+
+        Args:
+            K (float or array-like): Strike price
+            T (float or array-like): Maturity in years, broadcast against K
+
+        Returns:
+            float or numpy.ndarray: Implied volatility, flat outside the grid
+        """
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        T_grid = np.clip(T, self.maturities[0], self.maturities[-1])
+        w = self._interpolate(self.total_variance, np.log(K / self.S0) - self.r * T, T_grid)
+        result = np.sqrt(w / T_grid)
+        return result[()] if result.ndim == 0 else result
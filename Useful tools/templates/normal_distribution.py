@@ -0,0 +1,146 @@
+"""
+Standard normal CDF and PDF with a pluggable backend.
+
+scipy.stats.norm spends microseconds checking arguments on every call, which dominates
+scalar pricing. The functions below dispatch to:
+    - 'scalar': math.erfc / math.exp on Python floats (used for scalars and 0-d arrays)
+    - 'numpy': scipy.special.ndtr and numpy ufuncs, no frozen-distribution overhead
+    - 'numba': Numba-compiled ufuncs built on erfc, only when Numba is installed
+With the default 'auto' backend scalars take the scalar path and arrays the Numba path
+when available, else the numpy path.
+
+Accuracy against scipy.stats.norm (checked against 40-digit mpmath references):
+    - norm_cdf: relative difference below 5e-13 for x in [-37, 8.3], the range where
+      the CDF is a normal double; outside it both round to 0 / 1 up to 1e-300.
+    - norm_pdf: relative difference below 1e-13 for |x| <= 37.
+The error grows like x**2 * eps in the far left tail for every implementation, scipy's
+included, because x * x / 2 is rounded before exponentiation.
+"""
+
+import math
+import numpy as np
+from scipy.special import ndtr
+
+try:
+    import numba
+except ImportError:  # Numba is optional
+    numba = None
+
+BACKENDS = ('auto', 'scalar', 'numpy', 'numba')
+
+_SQRT_2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+_backend = 'auto'
+
+
+def _cdf_scalar(x):
+    return 0.5 * math.erfc(-x / _SQRT_2)
+
+
+def _pdf_scalar(x):
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+def _cdf_numpy(x):
+    return ndtr(x)
+
+
+def _pdf_numpy(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * np.square(x))
+
+
+if numba is not None:
+    @numba.vectorize(['float32(float32)', 'float64(float64)'], cache=True)
+    def _cdf_numba(x):
+        return 0.5 * math.erfc(-x / _SQRT_2)
+
+    @numba.vectorize(['float32(float32)', 'float64(float64)'], cache=True)
+    def _pdf_numba(x):
+        return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+def set_backend(backend):
+    """
+    Select the backend used by norm_cdf and norm_pdf.
+
+    Args:
+        backend (str): 'auto', 'scalar', 'numpy' or 'numba'
+
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If 'numba' is requested but Numba is not installed
+    """
+    global _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    if backend == 'numba' and numba is None:
+        raise ImportError("The 'numba' backend requires Numba to be installed")
+    _backend = backend
+
+
+def get_backend():
+    """Return the name of the selected backend."""
+    return _backend
+
+
+def _is_scalar(x):
+    """Cheap test for Python/NumPy scalars and 0-d arrays (np.ndim costs about a microsecond)."""
+    if isinstance(x, np.ndarray):
+        return x.ndim == 0
+    return isinstance(x, (float, int, np.generic))
+
+
+def _as_float_array(x):
+    """Convert x to a float array, keeping float32 inputs in single precision."""
+    x = np.asarray(x)
+    return x if x.dtype.kind == 'f' else x.astype(float)
+
+
+def _resolve(x):
+    """Return the backend to use for x."""
+    if _backend != 'auto':
+        return _backend
+    if _is_scalar(x):
+        return 'scalar'
+    return 'numba' if numba is not None else 'numpy'
+
+
+def norm_cdf(x):
+    """
+    Cumulative distribution function of the standard normal distribution.
+
+    Args:
+        x (float or array-like): Evaluation points
+
+    Returns:
+        float or numpy.ndarray: P(Z <= x)
+    """
+    backend = _resolve(x)
+    if backend == 'scalar':
+        if _is_scalar(x):
+            return _cdf_scalar(float(x))
+        return np.vectorize(_cdf_scalar, otypes=[float])(x)
+    if backend == 'numba':
+        return _cdf_numba(_as_float_array(x))
+    return _cdf_numpy(x)
+
+
+def norm_pdf(x):
+    """
+    Probability density function of the standard normal distribution.
+
+    Args:
+        x (float or array-like): Evaluation points
+
+    Returns:
+        float or numpy.ndarray: Density at x
+    """
+    backend = _resolve(x)
+    if backend == 'scalar':
+        if _is_scalar(x):
+            return _pdf_scalar(float(x))
+        return np.vectorize(_pdf_scalar, otypes=[float])(x)
+    if backend == 'numba':
+        return _pdf_numba(_as_float_array(x))
+    return _pdf_numpy(x)
@@ -0,0 +1,322 @@
+import numpy as np
+import pandas as pd
+from templates.black_scholes import BlackScholes, CALL, PUT
+from templates.implied_volatility import implied_volatility
+
+
+class OptionBook:
+    """
+    Struct-of-arrays container for large option chains.
+
+    Contracts are stored in contiguous typed NumPy arrays sorted by (underlying, expiry,
+    option type, strike), so every (underlying, expiry) and (underlying, expiry, type) group
+    is a slice, and `view` returns it without copying. Underlying names are interned: each
+    contract stores an int32 index into `underlyings`.
+
+    Attributes:
+        underlyings (numpy.ndarray): Underlying names, indexed by the `underlying` codes
+        underlying (numpy.ndarray): int32 underlying code of each contract
+        expiry (numpy.ndarray): datetime64[D] expiry date
+        option_type (numpy.ndarray): int8 CALL/PUT flag
+        strike (numpy.ndarray): float64 strike price
+        bid, ask (numpy.ndarray): float64 quotes (NaN when missing)
+        price (numpy.ndarray): float64 mid price, or last price when the quotes are unusable
+        implied_vol (numpy.ndarray): float64 implied volatility published by the data source
+        as_of (numpy.datetime64): Time of the snapshot, shared by every contract
+    """
+
+    _FIELDS = ('underlying', 'expiry', 'option_type', 'strike', 'bid', 'ask', 'price', 'implied_vol')
+
+    def __init__(self, underlyings, underlying, expiry, option_type, strike, bid, ask, price, implied_vol,
+                 as_of=None):
+        """
+        Build a book from per-contract arrays, sorting them into groups.
+
+        Args:
+            underlyings (array-like): Underlying names
+            underlying (array-like): Index of each contract's underlying in `underlyings`
+            expiry (array-like): Expiry dates (anything numpy converts to datetime64[D])
+            option_type (array-like): CALL/PUT flags
+            strike, bid, ask, price, implied_vol (array-like): Per-contract values
+            as_of (str or numpy.datetime64, optional): Time of the snapshot
+        """
+        self.underlyings = np.asarray(underlyings, dtype=str)
+        self.as_of = np.datetime64(as_of, 's') if as_of is not None else None
+
+        columns = {
+            'underlying': np.asarray(underlying, dtype=np.int32),
+            'expiry': np.asarray(expiry, dtype='datetime64[D]'),
+            'option_type': np.asarray(option_type, dtype=np.int8),
+            'strike': np.asarray(strike, dtype=np.float64),
+            'bid': np.asarray(bid, dtype=np.float64),
+            'ask': np.asarray(ask, dtype=np.float64),
+            'price': np.asarray(price, dtype=np.float64),
+            'implied_vol': np.asarray(implied_vol, dtype=np.float64),
+        }
+        order = np.lexsort((columns['strike'], columns['option_type'], columns['expiry'], columns['underlying']))
+        for name in self._FIELDS:
+            setattr(self, name, np.ascontiguousarray(columns[name][order]))
+
+    @classmethod
+    def _from_arrays(cls, underlyings, as_of, **arrays):
+        """Wrap already sorted arrays (or views of them) without copying."""
+        book = cls.__new__(cls)
+        book.underlyings = underlyings
+        book.as_of = as_of
+        for name in cls._FIELDS:
+            setattr(book, name, arrays[name])
+        return book
+
+    @classmethod
+    def from_cboe(cls, df):
+        """
+        Build a book from the DataFrame returned by CboeApi.get_option_quotes.
+
+        Args:
+            df (pandas.DataFrame): CBOE option quotes (one or several tickers)
+
+        Returns:
+            OptionBook: The book, without the rows whose option type could not be parsed
+        """
+        df = df[df['option_type'].isin(['CALL', 'PUT'])]
+        names, codes = np.unique(df['ticker'].to_numpy(dtype=str), return_inverse=True)
+        bid = pd.to_numeric(df['bid'], errors='coerce').to_numpy(dtype=np.float64)
+        ask = pd.to_numeric(df['ask'], errors='coerce').to_numpy(dtype=np.float64)
+        last = (pd.to_numeric(df['last_trade_price'], errors='coerce').to_numpy(dtype=np.float64)
+                if 'last_trade_price' in df else np.full(len(df), np.nan))
+        return cls(
+            underlyings=names,
+            underlying=codes,
+            expiry=df['maturity'].to_numpy(dtype=str),
+            option_type=np.where(df['option_type'].to_numpy() == 'CALL', CALL, PUT),
+            strike=df['strike'].to_numpy(dtype=np.float64),
+            bid=bid,
+            ask=ask,
+            price=_mid_or_last(bid, ask, last),
+            implied_vol=pd.to_numeric(df['implied_vol'], errors='coerce').to_numpy(dtype=np.float64),
+            as_of=df['time'].iloc[0] if 'time' in df and len(df) else None,
+        )
+
+    @classmethod
+    def from_barchart(cls, df):
+        """
+        Build a book from the DataFrame returned by BarchartApi.get_option_quotes.
+
+        Barchart formats its fields as strings ("1,250.00", "25.30%"); they are parsed to numbers,
+        percentages being converted to fractions.
+
+        Args:
+            df (pandas.DataFrame): Barchart option quotes
+
+        Returns:
+            OptionBook: The book
+        """
+        option_type = df['optionType'].astype(str).str.upper()
+        df = df[option_type.isin(['CALL', 'PUT'])]
+        option_type = option_type[option_type.isin(['CALL', 'PUT'])]
+        names, codes = np.unique(df['baseSymbol'].to_numpy(dtype=str), return_inverse=True)
+        bid = _parse_number(df['bidPrice'])
+        ask = _parse_number(df['askPrice'])
+        return cls(
+            underlyings=names,
+            underlying=codes,
+            expiry=pd.to_datetime(df['expirationDate']).to_numpy(dtype='datetime64[D]'),
+            option_type=np.where(option_type.to_numpy() == 'CALL', CALL, PUT),
+            strike=_parse_number(df['strikePrice']),
+            bid=bid,
+            ask=ask,
+            price=_mid_or_last(bid, ask, _parse_number(df['lastPrice'])),
+            implied_vol=_parse_number(df['volatility']),
+            as_of=df['ExtractTime'].iloc[0] if 'ExtractTime' in df and len(df) else None,
+        )
+
+    @classmethod
+    def concat(cls, books):
+        """
+        Merge several books into one, re-interning the underlying names.
+
+        Args:
+            books (list): OptionBook instances
+
+        Returns:
+            OptionBook: The merged book (as_of of the first book)
+        """
+        names = np.unique(np.concatenate([book.underlyings for book in books]))
+        codes = [np.searchsorted(names, book.underlyings)[book.underlying] for book in books]
+        return cls(names, np.concatenate(codes),
+                   *(np.concatenate([getattr(book, name) for book in books]) for name in cls._FIELDS[1:]),
+                   as_of=books[0].as_of if books else None)
+
+    def __len__(self):
+        return self.strike.size
+
+    def __repr__(self):
+        return (f"OptionBook({len(self)} contracts, {len(self.underlyings)} underlyings, "
+                f"{np.unique(self.expiry).size} expiries, {self.nbytes / 1e6:.1f} MB)")
+
+    @property
+    def nbytes(self):
+        """Memory used by the per-contract arrays."""
+        return sum(getattr(self, name).nbytes for name in self._FIELDS)
+
+    def underlying_code(self, name):
+        """
+        Return the interned code of an underlying.
+
+        Args:
+            name (str): Underlying name
+
+        Returns:
+            int: Index of the underlying in `underlyings`
+        """
+        code = np.searchsorted(self.underlyings, name)
+        if code >= len(self.underlyings) or self.underlyings[code] != name:
+            raise KeyError(f"Unknown underlying: {name}")
+        return int(code)
+
+    def expiries(self, underlying=None):
+        """
+        List the expiries of the book.
+
+        Args:
+            underlying (str, optional): Restrict to one underlying
+
+        Returns:
+            numpy.ndarray: Sorted unique datetime64[D] expiries
+        """
+        if underlying is None:
+            return np.unique(self.expiry)
+        return np.unique(self.view(underlying).expiry)
+
+    def view(self, underlying=None, expiry=None, option_type=None):
+        """
+        Zero-copy view of one underlying, one (underlying, expiry) or one (underlying, expiry, type) group.
+
+        Args:
+            underlying (str, optional): Underlying name, may be omitted when the book has only one
+            expiry (str or numpy.datetime64, optional): Expiry date
+            option_type (int or str, optional): CALL/PUT flag or 'call'/'put', requires `expiry`
+
+        Returns:
+            OptionBook: Book whose arrays are slices of this one
+        """
+        if underlying is None:
+            if len(np.unique(self.underlying)) > 1:
+                raise ValueError("The book holds several underlyings: pass underlying")
+            start, stop = 0, len(self)
+        else:
+            code = self.underlying_code(underlying)
+            start, stop = np.searchsorted(self.underlying, [code, code + 1])
+
+        if expiry is not None:
+            expiry = np.datetime64(expiry, 'D')
+            start, stop = start + np.searchsorted(self.expiry[start:stop], [expiry, expiry + 1])
+        if option_type is not None:
+            if expiry is None:
+                raise ValueError("option_type views require an expiry")
+            if isinstance(option_type, str):
+                option_type = CALL if option_type.lower() == 'call' else PUT
+            start, stop = start + np.searchsorted(self.option_type[start:stop], [option_type, option_type + 1])
+
+        return self._from_arrays(self.underlyings, self.as_of,
+                                 **{name: getattr(self, name)[start:stop] for name in self._FIELDS})
+
+    def groups(self, by_type=False):
+        """
+        Iterate over the zero-copy (underlying, expiry) groups of the book.
+
+        Args:
+            by_type (bool): Split each group further by option type
+
+        Yields:
+            tuple: (underlying name, expiry[, option type]) and the OptionBook view
+        """
+        keys = [self.underlying, self.expiry] + ([self.option_type] if by_type else [])
+        change = np.zeros(len(self), dtype=bool)
+        change[:1] = True
+        for key in keys:
+            change[1:] |= key[1:] != key[:-1]
+        bounds = np.append(np.flatnonzero(change), len(self))
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            view = self._from_arrays(self.underlyings, self.as_of,
+                                     **{name: getattr(self, name)[start:stop] for name in self._FIELDS})
+            group = (str(self.underlyings[self.underlying[start]]), self.expiry[start])
+            yield (group + (int(self.option_type[start]),) if by_type else group), view
+
+    def time_to_maturity(self, as_of=None):
+        """
+        Time to maturity of each contract in years (ACT/365).
+
+        Args:
+            as_of (str or numpy.datetime64, optional): Valuation time, the snapshot time by default
+
+        Returns:
+            numpy.ndarray: float64 year fractions
+        """
+        as_of = np.datetime64(as_of if as_of is not None else self.as_of, 's')
+        return (self.expiry.astype('datetime64[s]') - as_of) / np.timedelta64(365 * 86400, 's')
+
+    def per_contract(self, values):
+        """
+        Broadcast per-underlying values to the contracts.
+
+        Args:
+            values (float, dict or array-like): One value, a mapping name -> value, or an array
+                indexed by underlying code
+
+        Returns:
+            numpy.ndarray or float: Value for each contract
+        """
+        if isinstance(values, dict):
+            values = np.array([values[name] for name in self.underlyings], dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        return values[self.underlying] if values.ndim else values
+
+    def black_scholes(self, spot, r, sigma=None, as_of=None):
+        """
+        Batched Black-Scholes model of every contract of the book.
+
+        Args:
+            spot (float, dict or array-like): Spot per underlying (see per_contract)
+            r (float, dict or array-like): Risk-free rate per underlying
+            sigma (float or array-like, optional): Volatilities, the published implied_vol by default
+            as_of (str or numpy.datetime64, optional): Valuation time
+
+        Returns:
+            BlackScholes: Model whose price() and Greeks take `book.option_type` as option type
+        """
+        sigma = self.implied_vol if sigma is None else sigma
+        return BlackScholes(self.per_contract(spot), self.strike, self.per_contract(r), sigma,
+                            self.time_to_maturity(as_of))
+
+    def implied_volatility(self, spot, r, method='newton', as_of=None):
+        """
+        Re-solve the implied volatility of every contract from its price.
+
+        Args:
+            spot (float, dict or array-like): Spot per underlying (see per_contract)
+            r (float, dict or array-like): Risk-free rate per underlying
+            method (str): 'newton' or 'rational'
+            as_of (str or numpy.datetime64, optional): Valuation time
+
+        Returns:
+            ImpliedVolatilityResult: Volatilities and per-contract status
+        """
+        maturity = self.time_to_maturity(as_of)
+        rate = self.per_contract(r)
+        return implied_volatility(self.price, self.per_contract(spot) * np.exp(rate * maturity), self.strike,
+                                  maturity, self.option_type, rate, method=method)
+
+
+def _mid_or_last(bid, ask, last):
+    """Mid price where both quotes are usable, last traded price otherwise."""
+    quoted = (bid > 0) & (ask >= bid)
+    return np.where(quoted, 0.5 * (bid + ask), last)
+
+
+def _parse_number(series):
+    """Parse numbers formatted as strings ("1,250.00", "25.30%", "N/A"), percentages becoming fractions."""
+    text = series.astype(str).str.replace(',', '', regex=False)
+    percent = text.str.endswith('%')
+    values = pd.to_numeric(text.str.rstrip('%'), errors='coerce').to_numpy(dtype=np.float64)
+    return np.where(percent.to_numpy(), values / 100, values)
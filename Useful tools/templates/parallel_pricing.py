@@ -0,0 +1,185 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from templates.black_scholes import CALL, LONG, PUT, SHORT, BlackScholes, _call_mask, _position_sign
+
+# Elements per chunk: the float64 inputs and outputs of a chunk fit in a typical L2 cache
+DEFAULT_CHUNK_SIZE = 32_768
+
+# Chunks sent to a worker per round trip
+_CHUNKS_PER_TASK = 8
+
+_INPUTS = ('S0', 'K', 'r', 'sigma', 'T')
+_GREEK_OUTPUTS = ('price', 'delta', 'gamma', 'theta', 'vega', 'rho', 'charm', 'vanna', 'volga', 'veta')
+
+
+class _SharedArray:
+    """A NumPy array backed by a named shared-memory block."""
+
+    def __init__(self, shape, dtype, name=None):
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+        self.spec = (self.shm.name, shape, np.dtype(dtype).str)
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to a block created by another process."""
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self, unlink=False):
+        del self.array
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _init_worker():
+    """Worker start-up: the pool already uses every core, so the compiled kernels run on one thread."""
+    try:
+        import numba
+    except ImportError:  # Numba is optional
+        return
+    numba.set_num_threads(1)
+
+
+def _price_chunks(inputs_spec, flags_spec, outputs_spec, greeks, bounds):
+    """Worker: price the chunks [start, stop) of the shared inputs into the shared outputs."""
+    inputs, flags, outputs = (_SharedArray.attach(spec) for spec in (inputs_spec, flags_spec, outputs_spec))
+    try:
+        for start, stop in bounds:
+            _price_slice(inputs.array, flags.array, outputs.array, greeks, slice(start, stop))
+    finally:
+        for shared in (inputs, flags, outputs):
+            shared.close()
+
+
+def _price_slice(inputs, flags, outputs, greeks, rows):
+    """Price one slice of the (input, contract) matrices, the same BlackScholes call for every chunk."""
+    bs = BlackScholes(*inputs[:, rows])
+    if greeks:
+        result = bs.price_and_greeks(flags[0, rows], flags[1, rows])
+        for i, name in enumerate(_GREEK_OUTPUTS):
+            outputs[i, rows] = result[name]
+    else:
+        outputs[0, rows] = bs.price(flags[0, rows], flags[1, rows])
+
+
+class ParallelPricer:
+    """
+    Black-Scholes pricing of very large contract sets on a process pool.
+
+    Inputs are copied once into shared-memory blocks; the workers read their chunks and write
+    the results in place, so nothing but chunk bounds is pickled. Each element is computed by
+    the same code as BlackScholes on the whole array (the NumPy expressions, or the compiled
+    kernels of the templates.pricing_kernels backend), so the results are bit-identical to the
+    single-core path whatever the chunking.
+
+    Use as a context manager to keep the pool alive across calls:
+
+        with ParallelPricer(n_workers=8) as pricer:
+            prices = pricer.price(S0, K, r, sigma, T, option_type)
+    """
+
+    def __init__(self, n_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            n_workers (int, optional): Number of worker processes, os.cpu_count() by default
+                (1 prices in the calling process)
+            chunk_size (int): Number of contracts priced per BlackScholes evaluation
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = int(chunk_size)
+        self._executor = None
+
+    def __enter__(self):
+        if self.n_workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the worker pool down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _run(self, S0, K, r, sigma, T, option_type, option_position, greeks):
+        arrays = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S0, K, r, sigma, T)),
+                                     np.where(_call_mask(option_type), CALL, PUT),
+                                     np.where(_position_sign(option_position) > 0, LONG, SHORT))
+        shape = arrays[0].shape
+        n = arrays[0].size
+        n_outputs = len(_GREEK_OUTPUTS) if greeks else 1
+
+        inputs = _SharedArray((len(_INPUTS), n), np.float64)
+        flags = _SharedArray((2, n), np.int8)
+        outputs = _SharedArray((n_outputs, n), np.float64)
+        try:
+            for i, a in enumerate(arrays[:5]):
+                inputs.array[i] = a.ravel()
+            flags.array[0] = arrays[5].ravel()
+            flags.array[1] = arrays[6].ravel()
+
+            starts = range(0, n, self.chunk_size)
+            bounds = [(start, min(start + self.chunk_size, n)) for start in starts]
+            if self.n_workers == 1 or len(bounds) == 1:
+                for start, stop in bounds:
+                    _price_slice(inputs.array, flags.array, outputs.array, greeks, slice(start, stop))
+            else:
+                executor = self._executor or ProcessPoolExecutor(max_workers=self.n_workers,
+                                                                 initializer=_init_worker)
+                try:
+                    tasks = [bounds[i:i + _CHUNKS_PER_TASK] for i in range(0, len(bounds), _CHUNKS_PER_TASK)]
+                    futures = [executor.submit(_price_chunks, inputs.spec, flags.spec, outputs.spec, greeks, task)
+                               for task in tasks]
+                    for future in futures:
+                        future.result()
+                finally:
+                    if executor is not self._executor:
+                        executor.shutdown()
+            result = outputs.array.reshape((n_outputs,) + shape).copy()
+        finally:
+            for shared in (inputs, flags, outputs):
+                shared.close(unlink=True)
+        return result
+
+    def price(self, S0, K, r, sigma, T, option_type, option_position='long'):
+        """
+        Price every contract.
+
+        Args:
+            S0, K, r, sigma, T (float or array-like): Black-Scholes parameters, broadcast against each other
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
+        Returns:
+            numpy.ndarray: Prices, in input order
+        """
+        return self._run(S0, K, r, sigma, T, option_type, option_position, greeks=False)[0]
+
+    def price_and_greeks(self, S0, K, r, sigma, T, option_type, option_position='long'):
+        """
+        Price and Greeks of every contract (see BlackScholes.price_and_greeks).
+
+        Returns:
+            dict: Output name -> array in input order
+        """
+        result = self._run(S0, K, r, sigma, T, option_type, option_position, greeks=True)
+        return dict(zip(_GREEK_OUTPUTS, result))
+
+
+def price_parallel(S0, K, r, sigma, T, option_type, option_position='long', n_workers=None,
+                   chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    One-off parallel pricing, starting and stopping a worker pool (see ParallelPricer).
+
+    Returns:
+        numpy.ndarray: Prices, in input order
+    """
+    with ParallelPricer(n_workers, chunk_size) as pricer:
+        return pricer.price(S0, K, r, sigma, T, option_type, option_position)
@@ -0,0 +1,295 @@
+"""
+Crank-Nicolson finite-difference pricer under local volatility.
+
+Backward PDE (one contract, European or American), in time to maturity tau = T - t:
+
+    V_tau = 1/2 sigma(S, t)^2 S^2 V_SS + r S V_S - r V
+
+Forward Dupire PDE (a whole strike ladder in one sweep), in maturity T:
+
+    C_T = 1/2 sigma(K, T)^2 K^2 C_KK - r K C_K,    C(K, 0) = (S0 - K)^+
+
+Both are discretized with second-order central differences on a non-uniform sinh grid that
+concentrates points around the strike (backward) or the spot (forward), where the payoff kink
+is. Time stepping is Crank-Nicolson, except for the first steps that are replaced by pairs of
+implicit half steps (Rannacher start-up) to damp the oscillations the kink causes. Every step
+is one O(N) tridiagonal solve (scipy.linalg.solve_banded). The early-exercise constraint of
+American options is enforced by the penalty method: a few banded solves per step with a large
+penalty on the nodes below the exercise value, until the exercised set stops changing.
+
+The volatility is a float or any callable sigma(S, t) evaluated on a whole grid at once, such as
+a templates.local_volatility.LocalVolatilitySurface.
+"""
+
+import numpy as np
+from scipy.linalg import solve_banded
+from templates.black_scholes import _call_mask, _position_sign
+
+EXERCISE_STYLES = ('european', 'american')
+
+# Default grid: space nodes, time steps and Rannacher start-up steps
+DEFAULT_SPACE_STEPS = 400
+DEFAULT_TIME_STEPS = 200
+DEFAULT_RANNACHER_STEPS = 2
+
+# Grid spacing around the centre, relative to the centre (smaller is more concentrated)
+DEFAULT_CONCENTRATION = 0.1
+
+# The grid extends this many standard deviations above the centre
+_GRID_STD = 6.0
+
+_PENALTY = 1e8
+_MAX_PENALTY_ITERATIONS = 50
+
+
+def sinh_grid(center, upper, n_nodes, concentration=DEFAULT_CONCENTRATION):
+    """
+    Non-uniform grid on [0, upper], dense around `center`.
+
+    Args:
+        center (float): Point of highest density
+        upper (float): Last node
+        n_nodes (int): Number of nodes
+        concentration (float): Spacing scale around the centre, relative to it
+
+    Returns:
+        numpy.ndarray: Increasing nodes, the first one 0
+    """
+    c = concentration * center
+    xi = np.linspace(np.arcsinh(-center / c), np.arcsinh((upper - center) / c), n_nodes)
+    grid = center + c * np.sinh(xi)
+    grid[0] = 0.0
+    return grid
+
+
+def _derivative_weights(x):
+    """
+    Three-point weights of the first and second derivatives at the interior nodes of x.
+
+    Returns:
+        tuple: (lower, diagonal, upper) weights of d/dx and of d2/dx2, each of size len(x) - 2
+    """
+    h_minus, h_plus = np.diff(x)[:-1], np.diff(x)[1:]
+    total = h_minus + h_plus
+    first = (-h_plus / (h_minus * total), (h_plus - h_minus) / (h_minus * h_plus), h_minus / (h_plus * total))
+    second = (2.0 / (h_minus * total), -2.0 / (h_minus * h_plus), 2.0 / (h_plus * total))
+    return first, second
+
+
+def _quadratic_at(x0, x, y):
+    """Value, first and second derivative at x0 of the parabola through the 3 nodes nearest x0."""
+    i = np.clip(np.searchsorted(x, x0), 1, x.size - 2)
+    (x_a, x_b, x_c), (y_a, y_b, y_c) = x[i - 1:i + 2], y[i - 1:i + 2]
+    d_ab, d_bc = (y_b - y_a) / (x_b - x_a), (y_c - y_b) / (x_c - x_b)
+    second = 2.0 * (d_bc - d_ab) / (x_c - x_a)
+    first = d_ab + 0.5 * second * (2.0 * x0 - x_a - x_b)
+    return y_a + (x0 - x_a) * d_ab + 0.5 * second * (x0 - x_a) * (x0 - x_b), first, second
+
+
+class CrankNicolsonPricer:
+    """
+    Finite-difference pricer of European and American options under local volatility.
+
+    Attributes:
+        sigma (float or callable): Volatility, constant or sigma(S, t) on arrays
+        S0 (float): Spot price
+        r (float): Risk-free rate
+        n_space (int): Number of space nodes
+        n_time (int): Number of time steps
+        rannacher_steps (int): Crank-Nicolson steps replaced by two implicit half steps
+        concentration (float): Grid spacing scale around the strike or the spot
+    """
+
+    def __init__(self, sigma, S0, r, n_space=DEFAULT_SPACE_STEPS, n_time=DEFAULT_TIME_STEPS,
+                 rannacher_steps=DEFAULT_RANNACHER_STEPS, concentration=DEFAULT_CONCENTRATION):
+        self.sigma = sigma
+        self.S0 = float(S0)
+        self.r = float(r)
+        self.n_space = int(n_space)
+        self.n_time = int(n_time)
+        self.rannacher_steps = int(rannacher_steps)
+        self.concentration = concentration
+
+    def _volatility(self, S, t):
+        """Volatility on the grid S at time t."""
+        if callable(self.sigma):
+            return np.broadcast_to(np.asarray(self.sigma(S, t), dtype=float), S.shape)
+        return np.full(S.shape, float(self.sigma))
+
+    def _upper(self, center, T):
+        """Last grid node: _GRID_STD standard deviations above the centre."""
+        sigma = float(np.max(self._volatility(np.array([self.S0]), 0.5 * T)))
+        return max(center, self.S0) * np.exp(_GRID_STD * sigma * np.sqrt(T) + max(self.r, 0.0) * T)
+
+    def _steps(self):
+        """(fraction of the horizon, implicitness theta) of each time step, Rannacher start-up first."""
+        n_startup = min(self.rannacher_steps, self.n_time)
+        return ([(0.5 / self.n_time, 1.0)] * (2 * n_startup)
+                + [(1.0 / self.n_time, 0.5)] * (self.n_time - n_startup))
+
+    def _sweep(self, x, T, values, coefficients, boundaries, exercise_value=None):
+        """
+        March u_tau = A(tau) u over [0, T] with theta-steps and tridiagonal solves.
+
+        Args:
+            x (numpy.ndarray): Space grid
+            T (float): Horizon
+            values (numpy.ndarray): Initial condition on the grid
+            coefficients (callable): tau -> (lower, diagonal, upper) of A at the interior nodes
+            boundaries (callable): tau -> (value at x[0], value at x[-1])
+            exercise_value (numpy.ndarray, optional): Floor of the solution (American exercise)
+
+        Returns:
+            numpy.ndarray: Solution at tau = T
+        """
+        n = x.size
+        ab = np.zeros((3, n))
+        tau = 0.0
+        for fraction, theta in self._steps():
+            dt = fraction * T
+            # Crank-Nicolson uses the operator at mid-step, implicit steps at the end of the step
+            lower, diagonal, upper = coefficients(tau + (0.5 if theta == 0.5 else 1.0) * dt)
+            # Explicit part: (I + (1 - theta) dt A) u
+            rhs = values.copy()
+            if theta < 1.0:
+                rhs[1:-1] += (1.0 - theta) * dt * (lower * values[:-2] + diagonal * values[1:-1] + upper * values[2:])
+            # Implicit part: I - theta dt A, Dirichlet rows at both ends
+            ab[0, 2:] = -theta * dt * upper
+            ab[1, 1:-1] = 1.0 - theta * dt * diagonal
+            ab[2, :-2] = -theta * dt * lower
+            ab[1, 0] = ab[1, -1] = 1.0
+            ab[0, 1] = ab[2, -2] = 0.0
+            tau += dt
+            rhs[0], rhs[-1] = boundaries(tau)
+
+            values = solve_banded((1, 1), ab, rhs, check_finite=False)
+            if exercise_value is not None:
+                values = self._penalize(ab, rhs, values, exercise_value)
+        return values
+
+    @staticmethod
+    def _penalize(ab, rhs, values, exercise_value):
+        """Penalty iterations: (M + P) u = rhs + P g with P large where u < g, until that set is stable."""
+        active = values < exercise_value
+        penalized = ab.copy()
+        for _ in range(_MAX_PENALTY_ITERATIONS):
+            if not active.any():
+                break
+            penalty = _PENALTY * active
+            penalized[1] = ab[1] + penalty
+            values = solve_banded((1, 1), penalized, rhs + penalty * exercise_value, check_finite=False)
+            updated = values < exercise_value
+            if np.array_equal(updated, active):
+                break
+            active = updated
+        return values
+
+    def solve(self, K, T, option_type, exercise='european'):
+        """
+        Backward sweep of one contract over the whole spot grid.
+
+        Args:
+            K (float): Strike price
+            T (float): Time to maturity (in years)
+            option_type (str or int): 'call'/'put' or CALL/PUT flag
+            exercise (str): 'european' or 'american'
+
+        Returns:
+            tuple: Spot grid and long option values at time 0 on it
+        """
+        if exercise not in EXERCISE_STYLES:
+            raise ValueError(f"exercise must be one of {EXERCISE_STYLES}")
+        K, T = float(K), float(T)
+        is_call = bool(_call_mask(option_type))
+        S = sinh_grid(K, self._upper(K, T), self.n_space, self.concentration)
+        payoff = np.maximum(S - K, 0.0) if is_call else np.maximum(K - S, 0.0)
+        if T <= 0:
+            return S, payoff
+
+        american = exercise == 'american'
+        (d1_lower, d1_diag, d1_upper), (d2_lower, d2_diag, d2_upper) = _derivative_weights(S)
+        interior = S[1:-1]
+
+        def coefficients(tau):
+            variance = self._volatility(interior, T - tau) ** 2
+            diffusion, drift = 0.5 * variance * interior ** 2, self.r * interior
+            return (diffusion * d2_lower + drift * d1_lower,
+                    diffusion * d2_diag + drift * d1_diag - self.r,
+                    diffusion * d2_upper + drift * d1_upper)
+
+        def boundaries(tau):
+            discounted_strike = K if american else K * np.exp(-self.r * tau)
+            if is_call:
+                return 0.0, S[-1] - K * np.exp(-self.r * tau)
+            return discounted_strike, 0.0
+
+        return S, self._sweep(S, T, payoff, coefficients, boundaries, payoff if american else None)
+
+    def price(self, K, T, option_type, option_position='long', exercise='european'):
+        """
+        Option price at the spot.
+
+        Args:
+            K (float): Strike price
+            T (float): Time to maturity (in years)
+            option_type (str or int): 'call'/'put' or CALL/PUT flag
+            option_position (str or int): 'long'/'short' or LONG/SHORT flag
+            exercise (str): 'european' or 'american'
+
+        Returns:
+            float: Option price (negative for short positions)
+        """
+        return self.price_and_greeks(K, T, option_type, option_position, exercise)['price']
+
+    def price_and_greeks(self, K, T, option_type, option_position='long', exercise='european'):
+        """
+        Price, delta and gamma at the spot, read from the same backward sweep.
+
+        Args:
+            K (float): Strike price
+            T (float): Time to maturity (in years)
+            option_type (str or int): 'call'/'put' or CALL/PUT flag
+            option_position (str or int): 'long'/'short' or LONG/SHORT flag
+            exercise (str): 'european' or 'american'
+
+        Returns:
+            dict: 'price', 'delta' and 'gamma' (negative for short positions)
+        """
+        S, values = self.solve(K, T, option_type, exercise)
+        sign = float(_position_sign(option_position))
+        price, delta, gamma = _quadratic_at(self.S0, S, values)
+        return {'price': sign * price, 'delta': sign * delta, 'gamma': sign * gamma}
+
+    def price_strikes(self, K, T, option_type, option_position='long'):
+        """
+        European prices of a whole strike ladder from one forward (Dupire) sweep.
+
+        Args:
+            K (array-like): Strikes
+            T (float): Common maturity (in years)
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags, broadcast against K
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+
+        Returns:
+            numpy.ndarray: Option prices (negative for short positions)
+        """
+        K = np.asarray(K, dtype=float)
+        T = float(T)
+        grid = sinh_grid(self.S0, max(self._upper(self.S0, T), 1.1 * K.max()), self.n_space, self.concentration)
+        calls = np.maximum(self.S0 - grid, 0.0)
+        if T > 0:
+            (d1_lower, d1_diag, d1_upper), (d2_lower, d2_diag, d2_upper) = _derivative_weights(grid)
+            interior = grid[1:-1]
+
+            def coefficients(maturity):
+                variance = self._volatility(interior, maturity) ** 2
+                diffusion, drift = 0.5 * variance * interior ** 2, -self.r * interior
+                return (diffusion * d2_lower + drift * d1_lower,
+                        diffusion * d2_diag + drift * d1_diag,
+                        diffusion * d2_upper + drift * d1_upper)
+
+            calls = self._sweep(grid, T, calls, coefficients, lambda maturity: (self.S0, 0.0))
+
+        call = np.interp(K, grid, calls)
+        put = call - self.S0 + K * np.exp(-self.r * T)
+        return _position_sign(option_position) * np.where(_call_mask(option_type), call, put)
@@ -0,0 +1,139 @@
+import time
+from collections import deque
+import numpy as np
+from templates.black_scholes import BlackScholes
+
+# Aggregated by default, keys of BlackScholes.price_and_greeks
+AGGREGATED_GREEKS = ('price', 'delta', 'gamma', 'vega')
+
+
+class RiskAggregator:
+    """
+    Live portfolio Greeks, updated incrementally on spot ticks.
+
+    Contracts are grouped by underlying into contiguous slices. The aggregator keeps the
+    quantity-weighted Greeks of every underlying (partial sums) and the portfolio totals;
+    a tick on one underlying reprices only its slice and moves the totals by the change of
+    its partial sums, so the cost is proportional to the number of affected contracts.
+
+    Attributes:
+        underlyings (list): Underlying names, in slice order
+        spot (numpy.ndarray): Last spot of each underlying
+        partial (dict): Greek name -> per-underlying weighted sums
+        totals (dict): Greek name -> portfolio total
+    """
+
+    def __init__(self, portfolio, underlying, greeks=AGGREGATED_GREEKS, latency_window=10_000):
+        """
+        Args:
+            portfolio (Portfolio): Positions, with the current spot of each contract in portfolio.S0
+            underlying (array-like): Underlying name of each contract
+            greeks (tuple): Greeks to aggregate
+            latency_window (int): Number of recent update latencies kept for the statistics
+        """
+        underlying = np.asarray(underlying, dtype=str)
+        names, codes = np.unique(underlying, return_inverse=True)
+        order = np.argsort(codes, kind='stable')
+        self.underlyings = names.tolist()
+        self._index = {name: i for i, name in enumerate(self.underlyings)}
+        self._bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+
+        self._K = portfolio.K[order]
+        self._r = portfolio.r[order]
+        self._sigma = portfolio.sigma[order]
+        self._T = portfolio.T[order]
+        self._option_type = portfolio.option_type[order]
+        self._weight = portfolio.weight[order]
+        self.spot = portfolio.S0[order][self._bounds[:-1]].copy()
+
+        self.greeks = tuple(greeks)
+        self.partial = {greek: np.zeros(len(names)) for greek in self.greeks}
+        self.totals = dict.fromkeys(self.greeks, 0.0)
+        self._latencies = deque(maxlen=latency_window)
+        self.n_repriced = 0
+        self.recompute()
+        self.reset_latency()
+
+    def _reprice(self, i):
+        """Weighted Greeks of underlying i at its current spot."""
+        rows = slice(self._bounds[i], self._bounds[i + 1])
+        bs = BlackScholes(self.spot[i], self._K[rows], self._r[rows], self._sigma[rows], self._T[rows])
+        result = bs.price_and_greeks(self._option_type[rows])
+        self.n_repriced += int(rows.stop - rows.start)
+        return {greek: result[greek] @ self._weight[rows] for greek in self.greeks}
+
+    def recompute(self):
+        """Reprice every underlying and rebuild the totals from scratch (clears accumulated rounding)."""
+        for i in range(len(self.underlyings)):
+            for greek, value in self._reprice(i).items():
+                self.partial[greek][i] = value
+        self.totals = {greek: float(self.partial[greek].sum()) for greek in self.greeks}
+
+    def on_tick(self, underlying, spot):
+        """
+        Update the risk after a spot move of one underlying.
+
+        Args:
+            underlying (str): Underlying name
+            spot (float): New spot price
+
+        Returns:
+            dict: Updated portfolio totals
+        """
+        start = time.perf_counter_ns()
+        i = self._index[underlying]
+        self.spot[i] = spot
+        for greek, value in self._reprice(i).items():
+            self.totals[greek] += value - self.partial[greek][i]
+            self.partial[greek][i] = value
+        self._latencies.append(time.perf_counter_ns() - start)
+        self.n_updates += 1
+        return self.totals
+
+    def on_ticks(self, spots):
+        """
+        Apply several spot moves.
+
+        Args:
+            spots (dict): Underlying name -> new spot
+
+        Returns:
+            dict: Updated portfolio totals
+        """
+        for underlying, spot in spots.items():
+            self.on_tick(underlying, spot)
+        return self.totals
+
+    def exposure(self, underlying):
+        """
+        Weighted Greeks of the contracts on one underlying.
+
+        Args:
+            underlying (str): Underlying name
+
+        Returns:
+            dict: Greek name -> value
+        """
+        i = self._index[underlying]
+        return {greek: float(self.partial[greek][i]) for greek in self.greeks}
+
+    def latency(self):
+        """
+        Statistics of the recent on_tick latencies.
+
+        Returns:
+            dict: 'updates', 'contracts_repriced' and the mean, median, 99th percentile and
+                maximum latency in microseconds over the latency window
+        """
+        stats = {'updates': self.n_updates, 'contracts_repriced': self.n_repriced}
+        if self._latencies:
+            latencies = np.fromiter(self._latencies, dtype=np.int64) / 1e3
+            stats.update(mean_us=latencies.mean(), p50_us=np.percentile(latencies, 50),
+                         p99_us=np.percentile(latencies, 99), max_us=latencies.max())
+        return stats
+
+    def reset_latency(self):
+        """Clear the latency counters."""
+        self._latencies.clear()
+        self.n_updates = 0
+        self.n_repriced = 0
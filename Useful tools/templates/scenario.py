@@ -0,0 +1,208 @@
+import numpy as np
+from templates.black_scholes import CALL, PUT, BlackScholes, _call_mask, _position_sign
+
+# Greeks aggregated per scenario by default
+SCENARIO_GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+# Number of contract x scenario evaluations per batch, bounds the memory of the intermediates
+DEFAULT_BATCH_SIZE = 2_000_000
+
+# Volatility floor applied after a negative vol shock
+_MIN_SIGMA = 1e-4
+
+
+class Portfolio:
+    """
+    A book of European options held in given quantities.
+
+    Attributes:
+        S0, K, r, sigma, T (numpy.ndarray): Black-Scholes parameters of each contract
+        option_type (numpy.ndarray): CALL/PUT flag of each contract
+        sign (numpy.ndarray): +1 for long positions, -1 for short positions
+        quantity (numpy.ndarray): Number of contracts held (unsigned)
+    """
+
+    def __init__(self, S0, K, r, sigma, T, option_type, option_position='long', quantity=1.0):
+        """
+        Args:
+            S0, K, r, sigma, T (float or array-like): Black-Scholes parameters, broadcast per contract
+            option_type (str, int or array-like): 'call'/'put' or CALL/PUT flags
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags (CONFIG.OPTION_POSITION)
+            quantity (float or array-like): Number of contracts held
+        """
+        arrays = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S0, K, r, sigma, T, quantity)),
+                                     _call_mask(option_type), _position_sign(option_position))
+        self.S0, self.K, self.r, self.sigma, self.T, self.quantity, is_call, self.sign = (
+            np.ravel(a) for a in arrays)
+        self.option_type = np.where(is_call, CALL, PUT).astype(np.int8)
+
+    @classmethod
+    def from_book(cls, book, spot, r, quantity=1.0, option_position='long', sigma=None, as_of=None):
+        """
+        Build a portfolio from an OptionBook.
+
+        Args:
+            book (OptionBook): Contracts
+            spot (float, dict or array-like): Spot per underlying (see OptionBook.per_contract)
+            r (float, dict or array-like): Risk-free rate per underlying
+            quantity (float or array-like): Number of contracts held
+            option_position (str, int or array-like): 'long'/'short' or LONG/SHORT flags
+            sigma (float or array-like, optional): Volatilities, the book implied_vol by default
+            as_of (str or numpy.datetime64, optional): Valuation time
+
+        Returns:
+            Portfolio: The portfolio
+        """
+        return cls(book.per_contract(spot), book.strike, book.per_contract(r),
+                   book.implied_vol if sigma is None else sigma, book.time_to_maturity(as_of),
+                   book.option_type, option_position, quantity)
+
+    def __len__(self):
+        return self.K.size
+
+    @property
+    def weight(self):
+        """Signed quantity of each contract."""
+        return self.sign * self.quantity
+
+    def value(self, dtype=np.float64):
+        """
+        Mark-to-model value of each position.
+
+        Args:
+            dtype (numpy.dtype): Precision of the pricing (np.float64 or np.float32)
+
+        Returns:
+            numpy.ndarray: Signed value of each contract times its quantity (float64)
+        """
+        bs = BlackScholes(self.S0, self.K, self.r, self.sigma, self.T, dtype=dtype)
+        return self.weight * bs.price(self.option_type)
+
+
+class ScenarioGrid:
+    """
+    Cartesian grid of market shocks.
+
+    Attributes:
+        spot_shocks (numpy.ndarray): Relative spot moves (0.1 = spot up 10%)
+        vol_shocks (numpy.ndarray): Absolute volatility moves (0.05 = +5 vol points)
+        rate_shocks (numpy.ndarray): Absolute rate moves (0.01 = +100bp)
+        time_shifts (numpy.ndarray): Days elapsed
+    """
+
+    def __init__(self, spot_shocks=(0.0,), vol_shocks=(0.0,), rate_shocks=(0.0,), time_shifts=(0.0,)):
+        self.spot_shocks = np.atleast_1d(np.asarray(spot_shocks, dtype=float))
+        self.vol_shocks = np.atleast_1d(np.asarray(vol_shocks, dtype=float))
+        self.rate_shocks = np.atleast_1d(np.asarray(rate_shocks, dtype=float))
+        self.time_shifts = np.atleast_1d(np.asarray(time_shifts, dtype=float))
+
+    @property
+    def shape(self):
+        """Grid shape (spot, vol, rate, time)."""
+        return self.spot_shocks.size, self.vol_shocks.size, self.rate_shocks.size, self.time_shifts.size
+
+    def __len__(self):
+        return int(np.prod(self.shape))
+
+    def flat(self):
+        """
+        Flatten the grid into one row per scenario.
+
+        Returns:
+            tuple: Spot, vol, rate and time shocks, each of length len(grid), in C order of `shape`
+        """
+        return tuple(np.ravel(a) for a in np.meshgrid(self.spot_shocks, self.vol_shocks, self.rate_shocks,
+                                                      self.time_shifts, indexing='ij'))
+
+
+class ScenarioResult:
+    """
+    Output of a scenario run, every array being indexed by (spot, vol, rate, time) shock.
+
+    Attributes:
+        grid (ScenarioGrid): The scenarios
+        base_value (float): Portfolio value before shocks
+        pnl (numpy.ndarray): Portfolio P&L per scenario
+        greeks (dict): Greek name -> portfolio Greek per scenario
+        contract_pnl (numpy.ndarray or None): P&L per scenario and contract (grid shape + (n_contracts,))
+    """
+
+    def __init__(self, grid, base_value, pnl, greeks, contract_pnl=None):
+        self.grid = grid
+        self.base_value = base_value
+        self.pnl = pnl
+        self.greeks = greeks
+        self.contract_pnl = contract_pnl
+
+    def worst(self, n=5):
+        """
+        Worst scenarios of the grid.
+
+        Args:
+            n (int): Number of scenarios
+
+        Returns:
+            list: (P&L, spot shock, vol shock, rate shock, days) tuples, worst first
+        """
+        flat_pnl = self.pnl.ravel()
+        shocks = self.grid.flat()
+        order = np.argsort(flat_pnl)[:n]
+        return [(flat_pnl[i],) + tuple(shock[i] for shock in shocks) for i in order]
+
+
+def run_scenarios(portfolio, grid, greeks=SCENARIO_GREEKS, by_contract=False, batch_size=DEFAULT_BATCH_SIZE,
+                  dtype=np.float64):
+    """
+    Reprice a portfolio across a grid of spot, vol, rate and time shocks.
+
+    Contracts and scenarios are broadcast into (scenario, contract) matrices and priced with
+    the fused BlackScholes.price_and_greeks kernel, a batch of scenarios at a time so the
+    intermediates stay within `batch_size` elements. With dtype=np.float32 the repricing
+    runs in single precision while the P&L and Greek sums are accumulated in float64.
+
+    Args:
+        portfolio (Portfolio): Positions to reprice
+        grid (ScenarioGrid): Shocks
+        greeks (tuple): Greeks aggregated per scenario (keys of BlackScholes.price_and_greeks)
+        by_contract (bool): Also keep the P&L of every contract in every scenario
+        batch_size (int): Maximum number of contract x scenario evaluations per batch
+        dtype (numpy.dtype): Precision of the repricing (np.float64 or np.float32)
+
+    Returns:
+        ScenarioResult: P&L and aggregated Greeks per scenario
+    """
+    spot_shock, vol_shock, rate_shock, time_shift = grid.flat()
+    n_scenarios, n_contracts = len(grid), len(portfolio)
+    base = portfolio.value(dtype)
+    weight = portfolio.weight
+
+    pnl = np.empty(n_scenarios)
+    totals = {greek: np.empty(n_scenarios) for greek in greeks}
+    contract_pnl = np.empty((n_scenarios, n_contracts), dtype=dtype) if by_contract else None
+
+    step = max(1, batch_size // max(n_contracts, 1))
+    for start in range(0, n_scenarios, step):
+        rows = slice(start, min(start + step, n_scenarios))
+        bs = BlackScholes(
+            portfolio.S0 * (1.0 + spot_shock[rows, None]),
+            portfolio.K,
+            portfolio.r + rate_shock[rows, None],
+            np.maximum(portfolio.sigma + vol_shock[rows, None], _MIN_SIGMA),
+            np.maximum(portfolio.T - time_shift[rows, None] / 365.0, 0.0),
+            dtype=dtype,
+        )
+        result = bs.price_and_greeks(portfolio.option_type)
+        batch_pnl = weight * result['price'] - base
+        pnl[rows] = batch_pnl.sum(axis=1)
+        for greek in greeks:
+            totals[greek][rows] = result[greek] @ weight
+        if by_contract:
+            contract_pnl[rows] = batch_pnl
+
+    return ScenarioResult(
+        grid,
+        base.sum(),
+        pnl.reshape(grid.shape),
+        {greek: total.reshape(grid.shape) for greek, total in totals.items()},
+        contract_pnl.reshape(grid.shape + (n_contracts,)) if by_contract else None,
+    )
@@ -0,0 +1,222 @@
+"""
+Online averages of the last `window` fixings, for marking live averaging options without
+re-reading their price history.
+
+AverageAccumulator.update(fixing) gives the same value as templates.averaging.average on the
+last `window` fixings (the floating spot of OptionAsianFixedStrike, the floating strike of
+OptionAsianFloatingStrike) and costs, per fixing:
+    - arithmetic, geometric, harmonic, quadratic: O(1), running sum of x, ln x, 1 / x or x^2
+    - weighted (1..n): O(1), running linearly weighted sum, shifted with the plain sum
+    - ema: O(1) once the window is full, running sum U = sum (1 - alpha)^(n-1-j) x_j with
+      ema = alpha U + (1 - alpha)^n x_0. While the window fills up, the smoothing factor
+      2 / (n + 1) changes with every fixing (as in the templates), so the value is recomputed
+      from the fewer than `window` stored fixings.
+    - median, trimmed: the window is also kept sorted (bisect). The median is read in O(1)
+      and the sum of the kept order statistics is updated in O(1) from the neighbours of
+      the inserted or removed fixing; the sorted insertion itself is a binary search plus a
+      memmove of the list.
+Fixings leaving the window are subtracted from the running sums. To bound the rounding that
+accumulates this way, the sums are recomputed from the stored window every `window` fixings
+(amortized O(1)).
+
+The state is plain Python data (to_dict / from_dict), so the accumulators of a book of live
+trades can be stored as JSON and restored intraday.
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from templates.averaging import AVERAGE_TYPES, ema_alpha, trimmed_bounds
+
+# Running sums of f(x) for the averages that are a function of their mean
+_TRANSFORMS = {
+    'arithmetic': lambda x: x,
+    'geometric': math.log,
+    'harmonic': lambda x: 1.0 / x,
+    'quadratic': lambda x: x * x,
+}
+_FINALIZERS = {
+    'arithmetic': lambda total, n: total / n,
+    'geometric': lambda total, n: math.exp(total / n),
+    'harmonic': lambda total, n: n / total,
+    'quadratic': lambda total, n: math.sqrt(total / n),
+}
+
+
+def _prefix_delta(ordered, anchor, index):
+    """P(index) - P(anchor) for the prefix sums P of a sorted list, |index - anchor| <= 1."""
+    if index == anchor + 1:
+        return ordered[anchor]
+    if index == anchor - 1:
+        return -ordered[index]
+    return 0.0
+
+
+class AverageAccumulator:
+    """
+    Average of the last `window` fixings, updated one fixing at a time.
+
+    Attributes:
+        window (int): Number of fixings averaged (fewer while the window fills up)
+        avg_type (str): One of AVERAGE_TYPES
+        n_fixings (int): Fixings received since the start
+    """
+
+    def __init__(self, window, avg_type='arithmetic'):
+        if avg_type not in AVERAGE_TYPES:
+            raise ValueError(f"Invalid average type. Choose one of {AVERAGE_TYPES}.")
+        if int(window) < 1:
+            raise ValueError("The window must hold at least one fixing.")
+        self.window = int(window)
+        self.avg_type = avg_type
+        self.n_fixings = 0
+        self._values = deque()
+        self._sorted = [] if avg_type in ('median', 'trimmed') else None
+        self._total = 0.0      # Running sum of x (or of f(x), see _TRANSFORMS; U for ema)
+        self._weighted = 0.0   # Running sum of (j + 1) x_j (weighted) or of the kept order statistics (trimmed)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        value = f"{self.value:.6g}" if self._values else "empty"
+        return f"AverageAccumulator({self.avg_type}, window={self.window}, {len(self)} fixings: {value})"
+
+    def update(self, price):
+        """
+        Add a fixing, dropping the oldest one when the window is full.
+
+        Args:
+            price (float): New fixing
+
+        Returns:
+            float: Average after the fixing
+        """
+        price = float(price)
+        evicted = self._values.popleft() if len(self._values) == self.window else None
+        self._values.append(price)
+        self.n_fixings += 1
+        n = len(self._values)
+
+        if self.n_fixings % self.window == 0:
+            self._resync()
+        elif self.avg_type in _TRANSFORMS:
+            transform = _TRANSFORMS[self.avg_type]
+            self._total += transform(price) - (transform(evicted) if evicted is not None else 0.0)
+        elif self.avg_type == 'weighted':
+            # Dropping x_0 shifts every weight down by one: W' = W - S + n x_new
+            self._weighted += n * price - (self._total if evicted is not None else 0.0)
+            self._total += price - (evicted if evicted is not None else 0.0)
+        elif self.avg_type == 'ema':
+            if evicted is None:
+                self._resync()  # The smoothing factor changes with n
+            else:
+                decay = 1.0 - ema_alpha(n)
+                self._total = decay * self._total + price - decay ** n * evicted
+        else:
+            if evicted is not None:
+                self._remove_sorted(evicted)
+            self._insert_sorted(price)
+        return self.value
+
+    def extend(self, prices):
+        """
+        Add fixings in order.
+
+        Args:
+            prices (iterable): Fixings, oldest first
+
+        Returns:
+            float: Average after the last fixing
+        """
+        for price in prices:
+            self.update(price)
+        return self.value
+
+    @property
+    def value(self):
+        """float: Average of the fixings in the window"""
+        n = len(self._values)
+        if not n:
+            raise ValueError("No fixing yet.")
+        if self.avg_type in _FINALIZERS:
+            return _FINALIZERS[self.avg_type](self._total, n)
+        if self.avg_type == 'weighted':
+            return self._weighted / (0.5 * n * (n + 1))
+        if self.avg_type == 'ema':
+            alpha = ema_alpha(n)
+            return alpha * self._total + (1.0 - alpha) ** n * self._values[0]
+        if self.avg_type == 'median':
+            return 0.5 * (self._sorted[(n - 1) // 2] + self._sorted[n // 2])
+        lo, hi = trimmed_bounds(n)
+        return self._weighted / (hi - lo) if hi > lo else math.nan
+
+    def _resync(self):
+        """Recompute the running sums from the stored window."""
+        values, n = self._values, len(self._values)
+        if self.avg_type in _TRANSFORMS:
+            self._total = math.fsum(map(_TRANSFORMS[self.avg_type], values))
+        elif self.avg_type == 'weighted':
+            self._total = math.fsum(values)
+            self._weighted = math.fsum((j + 1) * x for j, x in enumerate(values))
+        elif self.avg_type == 'ema':
+            decay = 1.0 - ema_alpha(n)
+            self._total = math.fsum(decay ** (n - 1 - j) * x for j, x in enumerate(values))
+        else:
+            self._sorted = sorted(values)
+            lo, hi = trimmed_bounds(n)
+            self._weighted = math.fsum(self._sorted[lo:hi])
+
+    def _insert_sorted(self, price):
+        """Insert a fixing in the sorted window and update the sum of the kept order statistics."""
+        ordered, n = self._sorted, len(self._sorted)
+        (lo, hi), (new_lo, new_hi) = trimmed_bounds(n), trimmed_bounds(n + 1)
+        position = bisect_left(ordered, price)
+
+        def new_prefix(k, anchor):
+            # Prefix sums after the insertion, relative to the old P(anchor)
+            return _prefix_delta(ordered, anchor, k) if k <= position else _prefix_delta(ordered, anchor, k - 1) + price
+        self._weighted += new_prefix(new_hi, hi) - new_prefix(new_lo, lo)
+        insort(ordered, price)
+
+    def _remove_sorted(self, price):
+        """Remove a fixing from the sorted window and update the sum of the kept order statistics."""
+        ordered, n = self._sorted, len(self._sorted)
+        (lo, hi), (new_lo, new_hi) = trimmed_bounds(n), trimmed_bounds(n - 1)
+        position = bisect_left(ordered, price)
+
+        def new_prefix(k, anchor):
+            # Prefix sums after the removal, relative to the old P(anchor)
+            return _prefix_delta(ordered, anchor, k) if k <= position else _prefix_delta(ordered, anchor, k + 1) - price
+        self._weighted += new_prefix(new_hi, hi) - new_prefix(new_lo, lo)
+        del ordered[position]
+
+    def to_dict(self):
+        """
+        Serializable state (JSON-compatible).
+
+        Returns:
+            dict: Window, average type, fixing count, stored fixings and running sums
+        """
+        return {'window': self.window, 'avg_type': self.avg_type, 'n_fixings': self.n_fixings,
+                'values': list(self._values), 'total': self._total, 'weighted': self._weighted}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Restore an accumulator saved by to_dict.
+
+        Args:
+            state (dict): Output of to_dict
+
+        Returns:
+            AverageAccumulator: Accumulator in the saved state
+        """
+        accumulator = cls(state['window'], state['avg_type'])
+        accumulator.n_fixings = state['n_fixings']
+        accumulator._values = deque(state['values'])
+        accumulator._total = state['total']
+        accumulator._weighted = state['weighted']
+        if accumulator._sorted is not None:
+            accumulator._sorted = sorted(accumulator._values)
+        return accumulator
@@ -1,9 +1,27 @@
+import sys
+from importlib import import_module
+from pathlib import Path
 import streamlit as st
+
+# Pages reuse the pricing code from "Useful tools" (e.g. templates.normal_distribution)
+sys.path.append(str(Path(__file__).parent / "Useful tools"))
+
 from sidebar import Sidebar
-from windows.home import HomePage
-from windows.dupire import Dupire
-from windows.heston import Heston
-from windows.blackscholes import BlackScholes
+
+# Page title -> (module, class). A page module, and the numerical libraries it pulls in,
+# is only imported the first time the page is selected.
+PAGES = {
+    "Home": ("windows.home", "HomePage"),
+    "Black Scholes": ("windows.blackscholes", "BlackScholes"),
+    "Dupire": ("windows.dupire", "Dupire"),
+    "Heston": ("windows.heston", "Heston"),
+}
+
+
+def load_page(title):
+    """Import the page registered under a title and return its class"""
+    module_name, class_name = PAGES[title]
+    return getattr(import_module(module_name), class_name)
 
 
 class Main:
@@ -17,14 +35,8 @@ class Main:
             page_icon=":chart_with_upwards_trend:",
         )
         selected_page = st.navigation(self.sidebar.page)
-        if selected_page.title == "Black Scholes":
-            BlackScholes().display()
-        elif selected_page.title == "Dupire":
-            Dupire.display()
-        elif selected_page.title == "Heston":
-            Heston.display()
-        elif selected_page.title == "Home":
-            HomePage.display()
+        if selected_page.title in PAGES:
+            load_page(selected_page.title)().display()
 
 
 if __name__ == "__main__":
@@ -1,21 +1,108 @@
+import time
+from functools import lru_cache
 import numpy as np
+import pandas as pd
 import streamlit as st
-from scipy.stats import norm
+from templates.black_scholes import GREEKS_LABELS, BlackScholes as BlackScholesModel
 from config import CONFIG
 
+# Maximum number of input combinations kept by the pricing cache (least recently used are evicted)
+PRICING_CACHE_SIZE = 1024
+
+# Chart panel axes: label -> parameter of the templates BlackScholes model
+CHART_AXES = {"Spot": "S0", "Volatility": "sigma", "Maturity": "T"}
+CHART_POINTS = 200
+
+
+@lru_cache(maxsize=PRICING_CACHE_SIZE)
+def price_option(s0, k, r, sigma, t, option_type, option_position):
+    """
+    Memoized Black-Scholes price, keyed on the numeric inputs.
+
+    The cache lives at module level, so it is shared by every session of the server process
+    and a rerun with unchanged inputs does not recompute d1/d2.
+
+    Args:
+        s0 (float): Spot price
+        k (float): Strike price
+        r (float): Risk-free rate (decimal, 0.05 for 5%)
+        sigma (float): Implied volatility (decimal, 0.2 for 20%)
+        t (float): Maturity in years
+        option_type (int): Key of CONFIG.OPTION_TYPE
+        option_position (int): Key of CONFIG.OPTION_POSITION
+
+    Returns:
+        float: Option price (negative for short positions)
+    """
+    model = BlackScholesModel(s0, k, r, sigma, t)
+    return float(model.price(option_type, option_position))
+
+
+def price_and_greek_curves(s0, k, r, sigma, t, option_type, option_position, width=0.5, points=CHART_POINTS):
+    """
+    Price and every Greek versus spot, volatility and maturity, computed in one batched call.
+
+    Args:
+        s0, k, r, sigma, t (float): Model inputs (rate and volatility in decimals)
+        option_type (int): Key of CONFIG.OPTION_TYPE
+        option_position (int): Key of CONFIG.OPTION_POSITION
+        width (float): Half-width of each axis, relative to the input value
+        points (int): Number of points per curve
+
+    Returns:
+        dict: Axis label (CHART_AXES) -> DataFrame of the outputs indexed by the axis values
+    """
+    base = {"S0": s0, "sigma": sigma, "T": t}
+    axes = {param: np.linspace(max(value * (1 - width), 1e-4), value * (1 + width), points)
+            for param, value in base.items()}
+    # One segment per axis, the other parameters held at their input values
+    params = {param: np.concatenate([axes[param] if param == swept else np.full(points, value)
+                                     for swept in CHART_AXES.values()])
+              for param, value in base.items()}
+
+    result = BlackScholesModel(params["S0"], k, r, params["sigma"], params["T"]).price_and_greeks(
+        option_type, option_position)
+    frame = pd.DataFrame({GREEKS_LABELS[name]: values for name, values in result.items()})
+    return {label: frame.iloc[i * points:(i + 1) * points].set_index(axes[param])
+            for i, (label, param) in enumerate(CHART_AXES.items())}
+
+
+@st.fragment
+def chart_panel(s0, k, r, sigma, t, option_type, option_position):
+    """
+    Price/Greek charts, rerun on their own when their widgets change (the page script is not rerun).
+    """
+    start = time.perf_counter()
+    st.subheader("Price and Greeks")
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        axis = st.segmented_control("Versus", options=list(CHART_AXES), default="Spot", key="chart_axis")
+    with col2:
+        width = st.slider("Range (± % of the input)", min_value=10, max_value=90, value=50, key="chart_width")
+    outputs = st.multiselect("Outputs", options=list(GREEKS_LABELS.values()),
+                             default=list(GREEKS_LABELS.values())[:5], key="chart_outputs")
+
+    curves = price_and_greek_curves(s0, k, r, sigma, t, option_type, option_position, width / 100)
+    computed = time.perf_counter()
+    columns = st.columns([1, 1])
+    for i, output in enumerate(outputs):
+        with columns[i % 2]:
+            st.caption(output)
+            st.line_chart(curves[axis or "Spot"][output], height=200)
+    st.caption(f"Curves computed in {(computed - start) * 1e3:.1f} ms, "
+               f"panel rerun in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
 
 class BlackScholes:
     """Black Scholes page display"""
     def __init__(self):
-        self.s0 = np.nan
-        self.sigma = np.nan
-        self.k = np.nan
-        self.r = np.nan
-        self.t = np.nan
-        self.d1 = np.nan
-        self.d2 = np.nan
-        self.option_type = ""
-        self.option_position = ""
+        self.s0 = None
+        self.sigma = None
+        self.k = None
+        self.r = None
+        self.t = None
+        self.option_type = None
+        self.option_position = None
 
     def display(self):
         st.title("Black Scholes")
@@ -44,46 +131,34 @@ class BlackScholes:
                                                             format_func=lambda option: CONFIG.OPTION_POSITION[option],
                                                             selection_mode="single")
 
-        if ((self.t is not None) & (self.s0 is not None) & (self.sigma is not None) & (self.k is not None) &
-                (self.r is not None)):
-            self.calculate_d1_d2()
-
         if st.button("Calculate"):
-            if CONFIG.OPTION_TYPE[self.option_type] == "CALL":
-                price = self.calculate_call_price()
-                if CONFIG.OPTION_POSITION[self.option_position] == "SHORT":
-                    price = -price
-                st.write(price)
-            elif CONFIG.OPTION_TYPE[self.option_type] == "PUT":
-                price = self.calculate_put_price()
-                if CONFIG.OPTION_POSITION[self.option_position] == "SHORT":
-                    price = -price
-                st.write(price)
-
-
-    def calculate_d1_d2(self):
-        """
-        Function to calculate d1 and d2 in the black scholes formula
-        """
-        if self.t > 0:
-            self.d1 = (np.log(self.s0 / self.k) +
-                       (self.r + 0.5 * self.sigma**2) * self.t) / (self.sigma * np.sqrt(self.t))
-            self.d2 = self.d1 - self.sigma * np.sqrt(self.t)
+            if self.option_type is None or self.option_position is None:
+                st.warning("Select an option type and an option position.")
+            else:
+                st.write(self.calculate_price())
 
-    def calculate_call_price(self):
-        """
-        Function to calculate the price of the call
-        """
-        if np.isnan(self.d1):
-            return max(0.0, self.s0 - self.k)
+        with st.container(border=True):
+            if self.option_type is None or self.option_position is None:
+                st.caption("Select an option type and an option position to chart the price and Greeks.")
+            else:
+                chart_panel(float(self.s0), float(self.k), float(self.r) / 100, float(self.sigma) / 100,
+                            float(self.t), self.option_type, self.option_position)
 
-        return self.s0 * norm.cdf(self.d1) - self.k * np.exp(-self.r * self.t) * norm.cdf(self.d2)
+        with st.expander("Debug: pricing cache"):
+            info = price_option.cache_info()
+            col1, col2, col3 = st.columns([1, 1, 1])
+            col1.metric("Hits", info.hits)
+            col2.metric("Misses", info.misses)
+            col3.metric("Entries", f"{info.currsize} / {info.maxsize}")
+            if st.button("Clear cache"):
+                price_option.cache_clear()
+                # The metrics above were drawn before the clear, show the emptied cache
+                st.rerun()
 
-    def calculate_put_price(self):
+    def calculate_price(self):
         """
-        Function to calculate the price of the put
+        Function to calculate the price of the selected option through the shared pricing cache
         """
-        if np.isnan(self.d1):
-            return max(0.0, self.k - self.s0)
-
-        return self.k * np.exp(-self.r * self.t) * norm.cdf(-self.d2) - self.s0 * norm.cdf(-self.d1)
+        # Volatility and rate are entered in percent
+        return price_option(float(self.s0), float(self.k), float(self.r) / 100, float(self.sigma) / 100,
+                            float(self.t), self.option_type, self.option_position)
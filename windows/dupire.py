@@ -1,9 +1,155 @@
+import time
+import numpy as np
+import pandas as pd
 import streamlit as st
+from templates.black_scholes import CALL, PUT
+from templates.heston import HestonModel
+from templates.implied_volatility import implied_volatility
+from templates.local_volatility import LocalVolatilitySurface
+from templates.option_book import OptionBook
+from templates.pde_pricer import CrankNicolsonPricer
+
+# Seconds a CBOE chain snapshot is reused before it is downloaded again
+CHAIN_TTL = 300
+
+# Maturities charted, as fractions of the longest fitted expiry
+CHART_MATURITIES = (0.1, 0.25, 0.5, 0.75, 1.0)
+CHART_POINTS = 200
+
+
+@st.cache_data(ttl=CHAIN_TTL, show_spinner="Downloading the CBOE chain...")
+def cboe_quotes(ticker):
+    """Delayed CBOE option quotes of a ticker, shared by the sessions for CHAIN_TTL seconds."""
+    from api.cboe.cboe import CboeApi
+    return CboeApi().get_option_quotes(ticker)
+
+
+def synthetic_book(spot, r, as_of="2026-01-02T16:00:00"):
+    """
+    Chain priced with a Heston model (skewed smile), to explore the page without market data.
+
+    Args:
+        spot (float): Spot price
+        r (float): Risk-free rate
+        as_of (str): Snapshot time
+
+    Returns:
+        OptionBook: Calls and puts on 41 strikes x 8 expiries
+    """
+    as_of = np.datetime64(as_of, 's')
+    days = np.array([14, 30, 60, 91, 182, 273, 365, 730])
+    strikes = spot * np.linspace(0.5, 1.5, 41)
+    expiry = np.datetime64(as_of, 'D') + np.repeat(days, 2 * strikes.size)
+    K = np.tile(np.repeat(strikes, 2), days.size)
+    option_type = np.tile([CALL, PUT], K.size // 2)
+    T = (expiry.astype('datetime64[s]') - as_of) / np.timedelta64(365 * 86400, 's')
+    price = HestonModel(spot, r, kappa=1.5, theta=0.05, xi=0.7, rho=-0.7, v0=0.03).price(K, T, option_type)
+    sigma = implied_volatility(price, spot * np.exp(r * T), K, T, option_type, r).sigma
+    return OptionBook(["SYNTHETIC"], np.zeros(K.size), expiry, option_type, K, price, price, price, sigma,
+                      as_of=as_of)
 
 
 class Dupire:
     """Dupire page display"""
-    @staticmethod
-    def display():
+    def __init__(self):
+        self.source = None
+        self.ticker = None
+        self.s0 = None
+        self.r = None
+
+    def display(self):
         st.title("Dupire")
-        st.write("Bienvenue dans notre application.")
\ No newline at end of file
+
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                self.source = st.segmented_control("Chain", options=["Synthetic (Heston)", "CBOE"],
+                                                   default="Synthetic (Heston)", selection_mode="single")
+                self.ticker = st.text_input("Ticker", value="AAPL", disabled=self.source != "CBOE")
+            with col2:
+                if self.source == "CBOE":
+                    # The spot of a market chain is read from the quotes once they are loaded
+                    spot_slot = st.empty()
+                else:
+                    self.s0 = st.number_input("Spot ($)", value=100.0, min_value=0.01)
+            with col3:
+                self.r = st.number_input("Risk-free Rate (%)", value=3.0)
+
+        if self.source is None:
+            st.warning("Select a chain.")
+            return
+
+        try:
+            book, underlying = self.load_chain()
+        except Exception as error:  # Network and parsing failures of the data source
+            st.error(f"Could not load the chain: {error}")
+            return
+        if self.source == "CBOE":
+            if self.s0 is None:
+                st.error(f"The CBOE chain of {self.ticker} has no underlying price: the forwards, and so the "
+                         f"surface, cannot be built.")
+                return
+            spot_slot.metric("Spot ($)", f"{self.s0:.2f}")
+
+        start = time.perf_counter()
+        try:
+            surface = LocalVolatilitySurface.from_book(book, float(self.s0), float(self.r) / 100, underlying)
+        except ValueError as error:
+            st.error(str(error))
+            return
+        st.caption(f"Surface of {len(surface.expiries)} expiries ready in {(time.perf_counter() - start) * 1e3:.1f} ms "
+                   f"(built once per snapshot, then served from the cache)")
+
+        strikes = float(self.s0) * np.exp(np.linspace(surface.log_moneyness[0], surface.log_moneyness[-1],
+                                                      CHART_POINTS))
+        maturities = [fraction * surface.expiries[-1] for fraction in CHART_MATURITIES]
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.subheader("Local volatility (%)")
+            st.line_chart(pd.DataFrame({f"{t:.2f}y": 100 * surface(strikes, t) for t in maturities}, index=strikes),
+                          height=300)
+        with col2:
+            st.subheader("Implied volatility (%)")
+            st.line_chart(pd.DataFrame({f"{t:.2f}y": 100 * surface.implied_vol(strikes, t) for t in maturities},
+                                       index=strikes), height=300)
+
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                spot = st.number_input("S", value=float(self.s0), min_value=0.01)
+            with col2:
+                t = st.number_input("t (Years)", value=0.5, min_value=0.0)
+            with col3:
+                st.metric("Local volatility", f"{100 * surface(spot, t):.2f} %")
+
+        st.subheader("Crank-Nicolson price under the local volatility")
+        with st.container(border=True):
+            col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+            with col1:
+                strike = st.number_input("K ($)", value=float(self.s0), min_value=0.01)
+            with col2:
+                maturity = st.number_input("T (Years)", value=min(1.0, float(surface.expiries[-1])), min_value=0.01)
+            with col3:
+                option_type = st.selectbox("Option type", ["call", "put"])
+            with col4:
+                exercise = st.selectbox("Exercise", ["european", "american"])
+            start = time.perf_counter()
+            price = CrankNicolsonPricer(surface, float(self.s0), float(self.r) / 100).price_and_greeks(
+                strike, maturity, option_type, exercise=exercise)
+            col1, col2, col3 = st.columns([1, 1, 1])
+            col1.metric("Price", f"{price['price']:.4f}")
+            col2.metric("Delta", f"{price['delta']:.4f}")
+            col3.metric("Gamma", f"{price['gamma']:.5f}")
+            st.caption(f"Solved in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    def load_chain(self):
+        """
+        Option book of the selected source and the underlying to build the surface of. For the
+        CBOE source the spot is set from the chain (None when the quotes do not carry it).
+        """
+        if self.source == "CBOE":
+            quotes = cboe_quotes(self.ticker)
+            spot = pd.to_numeric(quotes.get("current_price", pd.Series(dtype=float)), errors='coerce').max()
+            self.s0 = float(spot) if spot > 0 else None
+            return OptionBook.from_cboe(quotes), self.ticker
+        return synthetic_book(float(self.s0), float(self.r) / 100), None
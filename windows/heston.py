@@ -1,9 +1,114 @@
+import time
+import numpy as np
+import pandas as pd
 import streamlit as st
+from templates.black_scholes import CALL, PUT
+from templates.fourier_pricing import fourier_price
+from templates.heston import HestonModel
+from templates.implied_volatility import implied_volatility
+from config import CONFIG
+
+# Size of the priced grid: strikes spread around the spot x expiries up to the maximum maturity
+GRID_STRIKES = 200
+GRID_EXPIRIES = 10
+
+# Pricing engines of the grid: Lewis quadrature, or a Fourier pass per expiry (templates.fourier_pricing)
+ENGINES = {"Lewis": None, "COS": "cos", "Carr-Madan FFT": "carr-madan"}
+
+
+def heston_surface(s0, r, kappa, theta, xi, rho, v0, strike_range, max_maturity, option_type, engine="Lewis"):
+    """
+    Heston prices and Black implied volatilities on a strike x expiry grid, priced in one call.
+
+    Args:
+        s0 (float): Spot price
+        r (float): Risk-free rate (decimal)
+        kappa, theta, xi, rho, v0 (float): Heston parameters (variances in decimals)
+        strike_range (tuple): Lowest and highest strike, relative to the spot (0.5 for 50%)
+        max_maturity (float): Longest expiry in years
+        option_type (int): Key of CONFIG.OPTION_TYPE
+        engine (str): Key of ENGINES
+
+    Returns:
+        tuple: Prices and implied volatilities (DataFrames indexed by strike, one column per expiry)
+    """
+    strikes = s0 * np.linspace(*strike_range, GRID_STRIKES)
+    maturities = np.linspace(max_maturity / GRID_EXPIRIES, max_maturity, GRID_EXPIRIES)
+    K, T = strikes[np.newaxis, :], maturities[:, np.newaxis]
+    # The characteristic function is integrated once: puts follow from put-call parity
+    model = HestonModel(s0, r, kappa, theta, xi, rho, v0)
+    if ENGINES[engine] is None:
+        calls = model.call_price(K, T)
+    else:
+        calls = fourier_price(model, K, T, CALL, method=ENGINES[engine])
+    puts = calls - s0 + K * np.exp(-r * T)
+    prices = calls if option_type == CALL else puts
+
+    # Out-of-the-money prices carry the volatility information
+    forwards = s0 * np.exp(r * T)
+    otm_type = np.where(K >= forwards, CALL, PUT)
+    sigma = implied_volatility(np.where(otm_type == CALL, calls, puts), forwards, K, T, otm_type, rate=r).sigma
+
+    columns = [f"{maturity:.2f}y" for maturity in maturities]
+    return (pd.DataFrame(prices.T, index=strikes, columns=columns),
+            pd.DataFrame(100 * sigma.T, index=strikes, columns=columns))
 
 
 class Heston:
     """Heston page display"""
-    @staticmethod
-    def display():
+    def __init__(self):
+        self.s0 = None
+        self.r = None
+        self.kappa = None
+        self.theta = None
+        self.xi = None
+        self.rho = None
+        self.v0 = None
+        self.option_type = None
+        self.engine = None
+
+    def display(self):
         st.title("Heston")
-        st.write("Bienvenue dans notre application.")
\ No newline at end of file
+
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                self.s0 = st.number_input("Spot ($)", value=100.0)
+                self.r = st.number_input("Risk-free Rate (%)", value=5.0)
+                self.v0 = st.number_input("Initial Variance v0", value=0.04, min_value=0.0, format="%.4f")
+            with col2:
+                self.kappa = st.number_input("Mean Reversion kappa", value=1.5, min_value=0.0)
+                self.theta = st.number_input("Long-run Variance theta", value=0.04, min_value=0.0, format="%.4f")
+            with col3:
+                self.xi = st.number_input("Vol of Vol xi", value=0.5, min_value=1e-4, format="%.4f")
+                self.rho = st.number_input("Correlation rho", value=-0.7, min_value=-0.999, max_value=0.999)
+
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                self.option_type = st.segmented_control("Option Type",
+                                                        options=CONFIG.OPTION_TYPE.keys(),
+                                                        format_func=lambda option: CONFIG.OPTION_TYPE[option],
+                                                        selection_mode="single", default=CALL)
+            with col2:
+                strike_range = st.slider("Strikes (% of spot)", min_value=10, max_value=300, value=(50, 150))
+            with col3:
+                max_maturity = st.number_input("Longest Expiry (Years)", value=2.0, min_value=0.01)
+                self.engine = st.selectbox("Pricing Engine", options=list(ENGINES))
+
+        if self.option_type is None:
+            st.warning("Select an option type.")
+            return
+
+        start = time.perf_counter()
+        prices, smiles = heston_surface(float(self.s0), float(self.r) / 100, float(self.kappa), float(self.theta),
+                                        float(self.xi), float(self.rho), float(self.v0),
+                                        (strike_range[0] / 100, strike_range[1] / 100), float(max_maturity),
+                                        self.option_type, self.engine)
+        st.caption(f"{GRID_STRIKES} strikes x {GRID_EXPIRIES} expiries priced in "
+                   f"{(time.perf_counter() - start) * 1e3:.1f} ms ({self.engine})")
+
+        st.subheader("Implied volatility smile (%)")
+        st.line_chart(smiles, height=300)
+        st.subheader(f"{CONFIG.OPTION_TYPE[self.option_type]} prices")
+        st.dataframe(prices.style.format("{:.4f}"), height=300)